@@ -1,11 +1,39 @@
-from data_manager import CsvDataSource, CsvCarRepository, SQLiteCarRepository
+"""Application CLI de gestion des voitures: menu interactif, ou commandes non interactives pour les scripts.
+
+    python src/app.py                                      menu interactif
+    python src/app.py list --limit 100                     voitures en JSON lines sur stdout
+    python src/app.py get 12 15 --source csv --output csv
+    python src/app.py add < nouvelles.jsonl                une voiture créée (ou null) par ligne lue
+    python src/app.py update < modifications.csv           lignes avec une colonne id
+    python src/app.py delete 12 15
+    python src/app.py search fuel Diesel
+    python src/app.py search --where year '>=' 2018 --order-by=-selling_price --limit 10
+    python src/app.py import data/car_dataset.csv
+
+Les commandes lisent du JSON lines ou du CSV (avec en-tête) sur stdin, par lots (--batch-size) traités par les
+opérations groupées du dépôt (create_cars, update_cars, delete_cars), et écrivent sur stdout une ligne par résultat
+(JSON lines ou CSV, --output). Les messages du dépôt vont sur stderr. Code de sortie 1 si une ligne a échoué.
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+
+from data_manager import (CAR_COLUMNS, DUPLICATE_KEY, DUPLICATE_POLICIES, QUERY_OPERATORS, CachedCsvDataSource,
+                          CsvCarRepository, SQLiteCarRepository)
+from instrumentation import default_instrumentation
 
 # Initialiser le gestionnaire de données - Sera fait dans main()
 # data_manager = DataManager()
 global data_manager # Déclarer data_manager comme global pour y accéder dans les fonctions si nécessaire
 data_manager = None
 global source_type_label
-source_type_label = "index" # Par défaut à index pour CSV
+source_type_label = "ID" # CSV et SQLite identifient tous deux les voitures par leur colonne id
+
+LISTING_PAGE_SIZE = 20 # Nombre de voitures affichées par page dans le listing
 
 def print_menu():
     """Affiche le menu des options CRUD."""
@@ -78,9 +106,9 @@ def main():
     while True:
         source_choice = input("Choisir la source de données (1: CSV, 2: SQLite, 0: Quitter): ").strip()
         if source_choice == '1':
-            csv_data_source = CsvDataSource()
+            csv_data_source = CachedCsvDataSource()
             data_manager = CsvCarRepository(csv_data_source)
-            source_type_label = "index"
+            source_type_label = "ID"
             print("Source de données sélectionnée: CSV")
             break
         elif source_choice == '2':
@@ -99,45 +127,47 @@ def main():
     while True:
         print_menu()
         # Afficher le nombre actuel de voitures pour aider l'utilisateur
-        all_cars_df = data_manager.get_all_cars()
-        if not all_cars_df.empty:
-            print(f"(Nombre actuel de voitures: {len(all_cars_df)})")
+        car_count = data_manager.count()
+        if car_count:
+            print(f"(Nombre actuel de voitures: {car_count})")
         else:
             print("(Aucune voiture dans la base de données pour le moment)")
         choice = input("Entrez votre choix: ")
 
         if choice == '1': # Lister toutes les voitures
             print("\n--- Liste de toutes les voitures ---")
-            cars = data_manager.get_all_cars()
-            if not cars.empty:
+            # Pagination par clé: seule la page affichée est chargée en mémoire.
+            after_id = None
+            first_page = True
+            while True:
+                cars, after_id = data_manager.get_cars_page(after_id, LISTING_PAGE_SIZE)
+                if cars.empty:
+                    if first_page:
+                        print("Aucune voiture dans la base de données.")
+                    break
                 print(cars.to_string())
-            else:
-                print("Aucune voiture dans la base de données.")
+                first_page = False
+                if after_id is None:
+                    break
+                if input("Entrée: page suivante, q: retour au menu: ").strip().lower() == 'q':
+                    break
 
-        elif choice == '2': # Afficher une voiture par index
-            cars_df = data_manager.get_all_cars()
-            if cars_df.empty:
+        elif choice == '2': # Afficher une voiture par ID
+            car_count = data_manager.count()
+            if car_count == 0:
                 print("Aucune voiture à afficher.")
             else:
                 try:
-                    if source_type_label == "ID":
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à afficher: "))
-                        car = data_manager.get_car_by_id(entity_id)
-                    else: # CSV utilise l'index
-                        index_max = len(cars_df) - 1
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à afficher (0-{index_max}): "))
-                        car = data_manager.get_car_by_id(entity_id)
-                    
+                    entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à afficher: "))
+                    car = data_manager.get_car_by_id(entity_id)
+
                     if car:
                         print("\n--- Détails de la voiture ---")
-                        # Pour SQLite, l'ID est une colonne, pour CSV, c'est l'index du DataFrame
-                        if source_type_label == "ID" and 'id' in car:
+                        if 'id' in car:
                             print(f"ID: {car['id']}")
-                        elif source_type_label == "index":
-                             print(f"Index: {entity_id}") # Afficher l'index utilisé pour la recherche CSV
 
                         for key, value in car.items():
-                            if key == 'id' and source_type_label == "ID": continue # Déjà affiché
+                            if key == 'id': continue # Déjà affiché
                             print(f"{key.replace('_', ' ').capitalize()}: {value}")
                     else:
                         print(f"Aucune voiture trouvée à l'{source_type_label} {entity_id}.")
@@ -154,35 +184,25 @@ def main():
                 print("Données incomplètes. Tous les champs sont requis pour ajouter une voiture.")
 
         elif choice == '4': # Mettre à jour une voiture
-            cars_df = data_manager.get_all_cars()
-            if cars_df.empty:
+            car_count = data_manager.count()
+            if car_count == 0:
                 print("Aucune voiture à mettre à jour.")
             else:
                 try:
-                    if source_type_label == "ID":
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à mettre à jour: "))
-                        car_to_update = data_manager.get_car_by_id(entity_id)
-                    else: # CSV utilise l'index
-                        index_max = len(cars_df) - 1
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à mettre à jour (0-{index_max}): "))
-                        car_to_update = data_manager.get_car_by_id(entity_id)
+                    entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à mettre à jour: "))
+                    car_to_update = data_manager.get_car_by_id(entity_id)
 
                     if car_to_update:
                         print(f"\nMise à jour de la voiture à l'{source_type_label} {entity_id}:")
-                        if source_type_label == "ID" and 'id' in car_to_update:
+                        if 'id' in car_to_update:
                             print(f"ID: {car_to_update['id']}")
-                        elif source_type_label == "index":
-                             print(f"Index: {entity_id}")
                         for key, value in car_to_update.items():
-                            if key == 'id' and source_type_label == "ID": continue
+                            if key == 'id': continue
                             print(f"{key.replace('_', ' ').capitalize()}: {value}")
                         
                         updated_data = get_car_details_from_user(is_update=True)
                         if updated_data: # Si l'utilisateur a fourni des données à mettre à jour
-                            if source_type_label == "ID":
-                                data_manager.update_car(entity_id, updated_data)
-                            else:
-                                data_manager.update_car(entity_id, updated_data) # CSV update_car prend aussi l'index
+                            data_manager.update_car(entity_id, updated_data)
                         else:
                             print("Aucune modification fournie.")
                     else:
@@ -191,19 +211,13 @@ def main():
                     print(f"{source_type_label} invalide. Veuillez entrer un nombre.")
 
         elif choice == '5': # Supprimer une voiture
-            cars_df = data_manager.get_all_cars()
-            if cars_df.empty:
+            car_count = data_manager.count()
+            if car_count == 0:
                 print("Aucune voiture à supprimer.")
             else:
                 try:
-                    if source_type_label == "ID":
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à supprimer: "))
-                        # Pour SQLite, delete_car attend un ID
-                        deleted_car = data_manager.delete_car(entity_id)
-                    else: # CSV utilise l'index
-                        index_max = len(cars_df) - 1
-                        entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à supprimer (0-{index_max}): "))
-                        deleted_car = data_manager.delete_car(entity_id)
+                    entity_id = int(input(f"Entrez l'{source_type_label} de la voiture à supprimer: "))
+                    deleted_car = data_manager.delete_car(entity_id)
 
                     if deleted_car:
                         print(f"Voiture à l'{source_type_label} {entity_id} supprimée.")
@@ -217,17 +231,13 @@ def main():
         elif choice == '6': # Rechercher un véhicule
             print("\n--- Rechercher un véhicule ---")
             # Définir les attributs de recherche possibles
-            # Pour CSV, les colonnes du DataFrame. Pour SQLite, les colonnes de la table.
-            # On peut obtenir les colonnes du DataFrame pour les deux cas après un get_all_cars()
-            # ou définir une liste fixe si on préfère.
-            all_cars_sample = data_manager.get_all_cars()
-            if all_cars_sample.empty:
+            # Pour CSV, les colonnes de l'en-tête. Pour SQLite, les colonnes de la table.
+            # columns() lit uniquement le schéma (en-tête CSV ou PRAGMA table_info), sans charger les données.
+            if data_manager.count() == 0:
                 print("Aucune voiture dans la base de données pour définir les critères de recherche.")
             else:
-                # Exclure 'id' pour CSV car il n'est pas un attribut direct de recherche comme pour SQLite
-                # et source_type_label est déjà utilisé pour l'affichage/MAJ/suppression par ID/index.
-                # Pour SQLite, 'id' est un attribut valide.
-                possible_attributes = [col for col in all_cars_sample.columns if col != 'id' or source_type_label == "ID"]
+                # 'id' est une colonne de recherche valide pour les deux sources.
+                possible_attributes = data_manager.columns()
                 if not possible_attributes:
                     print("Impossible de déterminer les attributs de recherche.")
                 else:
@@ -255,13 +265,293 @@ def main():
                         print("Choix d'attribut invalide. Veuillez entrer un nombre.")
 
         elif choice == '0': # Quitter
+            # Écrit les opérations encore dans le journal CSV / ferme les connexions SQLite.
+            data_manager.close()
             print("Au revoir !")
             break
 
         else:
             print("Choix invalide. Veuillez réessayer.")
 
+# --- Mode non interactif (scripts, traitements par lots) --- #
+
+BATCH_SIZE = 1000 # Éléments lus sur stdin par appel aux opérations groupées du dépôt
+INPUT_FORMATS = ('jsonl', 'csv')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+INTEGER_FIELDS = ('id', 'year', 'selling_price', 'km_driven')
+
+
+def _stderr_sink(event):
+    print(event['message'], file=sys.stderr)
+
+
+def _plain(value):
+    # Valeur JSON: NaN / pd.NA -> None, scalaires numpy -> types Python (dépôt CSV).
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    pd = sys.modules.get('pandas') # Chargé par le dépôt CSV seulement: sinon la valeur ne peut pas en venir.
+    if pd is not None and pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _csv_record(row):
+    # CSV: tout est texte. Un champ vide est absent (non modifié par update); les colonnes entières sont converties.
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        record[key] = int(value) if key in INTEGER_FIELDS else value
+    return record
+
+
+def read_records(stream, input_format=None):
+    """Lit des voitures (dicts) en flux, en JSON lines ou en CSV avec en-tête; None pour un enregistrement illisible.
+
+    input_format None: format deviné sur la première ligne ('{' ou un nombre: JSON lines). En JSON lines,
+    un identifiant seul (get, delete) équivaut à {"id": ...}.
+    """
+    lines = (line for line in stream if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return
+    lines = itertools.chain([first], lines)
+    if input_format is None:
+        input_format = 'jsonl' if first.lstrip()[0] in '{-0123456789' else 'csv'
+    if input_format == 'jsonl':
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Enregistrement {number} ignoré: JSON invalide ({e}).", file=sys.stderr)
+                yield None
+                continue
+            if isinstance(record, int):
+                record = {'id': record}
+            if not isinstance(record, dict):
+                print(f"Enregistrement {number} ignoré: objet JSON attendu.", file=sys.stderr)
+                record = None
+            yield record
+    else:
+        for number, row in enumerate(csv.DictReader(lines), 1):
+            try:
+                yield _csv_record(row)
+            except ValueError as e:
+                print(f"Enregistrement {number} ignoré: {e}.", file=sys.stderr)
+                yield None
+
+
+def _car_id(record):
+    try:
+        return int(record['id'])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _parse_value(text):
+    # Valeurs de --where en JSON si possible (2018, [20000, 40000]), sinon texte brut (First Owner).
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class RecordWriter:
+    """Écrit les résultats sur un flux, une ligne par résultat: JSON lines (None -> null) ou CSV (None -> ligne vide).
+
+    convert: les valeurs peuvent venir de pandas (dépôt CSV) et sont converties en types Python; les dicts du dépôt
+    SQLite en mode 'records' le sont déjà.
+    """
+
+    def __init__(self, stream, output_format='jsonl', convert=True):
+        self.stream = stream
+        self.output_format = output_format
+        self.convert = convert
+        self._csv_writer = None
+
+    def write(self, record):
+        if record is not None and self.convert:
+            record = {key: _plain(value) for key, value in record.items()}
+        if self.output_format == 'jsonl':
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            return
+        if self._csv_writer is None:
+            # En-tête: colonnes des voitures (une création CSV ne retourne que les champs fournis), sinon celles du
+            # premier résultat (statistiques d'import).
+            fields = ['id'] + CAR_COLUMNS
+            if record is not None and not set(record) <= set(fields):
+                fields = list(record)
+            self._csv_writer = csv.DictWriter(self.stream, fieldnames=fields, extrasaction='ignore', lineterminator='\n')
+            self._csv_writer.writeheader()
+        self._csv_writer.writerow(record or {})
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _run_batches(items, operation, writer, batch_size):
+    """Applique une opération groupée du dépôt par lots; écrit un résultat par élément (None: invalide ou en échec)."""
+    ok = True
+    for batch in _batches(items, batch_size):
+        valid = [item for item in batch if item is not None]
+        results = iter(operation(valid) if valid else [])
+        for item in batch:
+            result = next(results) if item is not None else None
+            ok = ok and result is not None
+            writer.write(result)
+        # Résultats du lot disponibles pour le lecteur avant la lecture du lot suivant.
+        writer.flush()
+    return ok
+
+
+def _ids(args):
+    if args.ids:
+        return iter(args.ids)
+    return (_car_id(record) for record in read_records(sys.stdin, args.input_format))
+
+
+def command_list(repository, args, writer):
+    for car in itertools.islice(repository.iter_cars(args.batch_size or BATCH_SIZE, as_frames=False), args.limit):
+        writer.write(car)
+    return True
+
+
+def command_get(repository, args, writer):
+    return _run_batches(_ids(args), lambda car_ids: [repository.get_car_by_id(car_id) for car_id in car_ids],
+                        writer, args.batch_size or BATCH_SIZE)
+
+
+def command_add(repository, args, writer):
+    return _run_batches(read_records(sys.stdin, args.input_format), repository.create_cars, writer, args.batch_size or BATCH_SIZE)
+
+
+def command_update(repository, args, writer):
+    updates = ((_car_id(record), {key: value for key, value in record.items() if key != 'id'})
+               if _car_id(record) is not None else None
+               for record in read_records(sys.stdin, args.input_format))
+    return _run_batches(updates, repository.update_cars, writer, args.batch_size or BATCH_SIZE)
+
+
+def command_delete(repository, args, writer):
+    return _run_batches(_ids(args), repository.delete_cars, writer, args.batch_size or BATCH_SIZE)
+
+
+def command_search(repository, args, writer):
+    if args.attribute is not None:
+        result = repository.search_cars(args.attribute, args.value)
+    else:
+        predicates = [(column, operator, _parse_value(value)) for column, operator, value in args.where or []]
+        result = repository.query_cars(predicates, args.order_by, args.limit, args.offset)
+    # SQLite (result_format='records'): déjà des dicts; CSV: DataFrame converti ligne par ligne.
+    for car in result if isinstance(result, list) else result.to_dict('records'):
+        writer.write(car)
+    return True
+
+
+def command_import(repository, args, writer):
+    from bulk_transfer import IMPORT_CHUNK_SIZE, import_csv # pandas n'est chargé que pour cette commande
+
+    stats = import_csv(sys.stdin if args.csv_path == '-' else args.csv_path, repository, args.batch_size or IMPORT_CHUNK_SIZE)
+    writer.write(stats)
+    return stats['rows_rejected'] == 0 and stats['rows_failed'] == 0
+
+
+COMMANDS = {
+    'list': command_list,
+    'get': command_get,
+    'add': command_add,
+    'update': command_update,
+    'delete': command_delete,
+    'search': command_search,
+    'import': command_import,
+}
+
+
+def open_repository(source='sqlite', path=None, dedup_key=None, on_duplicate='allow'):
+    """Dépôt du mode non interactif; SQLite retourne des dicts (result_format='records'), sans charger pandas."""
+    if source == 'csv':
+        return CsvCarRepository(CachedCsvDataSource(path), dedup_key=dedup_key, on_duplicate=on_duplicate)
+    return SQLiteCarRepository(path, dedup_key=dedup_key, on_duplicate=on_duplicate, result_format='records')
+
+
+def build_parser():
+    # Options communes, acceptées après le nom de la commande (python src/app.py list --source csv).
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--source', choices=['csv', 'sqlite'], default='sqlite')
+    common.add_argument('--path', default=None, help="fichier CSV ou base SQLite (défaut: data/)")
+    common.add_argument('--input-format', choices=INPUT_FORMATS, default=None, help="stdin (défaut: deviné sur la première ligne)")
+    common.add_argument('--output', choices=OUTPUT_FORMATS, default='jsonl')
+    common.add_argument('--batch-size', type=int, default=None, help=f"éléments par opération groupée (défaut: {BATCH_SIZE})")
+    common.add_argument('--quiet', action='store_true', help="n'affiche sur stderr que les erreurs du dépôt")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+
+    list_parser = subparsers.add_parser('list', parents=[common], help="toutes les voitures, en flux")
+    list_parser.add_argument('--limit', type=int, default=None)
+    get_parser = subparsers.add_parser('get', parents=[common], help="voitures par id (arguments, sinon stdin)")
+    get_parser.add_argument('ids', nargs='*', type=int)
+    for command, help_text in (('add', "crée les voitures lues sur stdin"), ('import', "importe un fichier CSV ('-': stdin)")):
+        command_parser = subparsers.add_parser(command, parents=[common], help=help_text)
+        if command == 'import':
+            command_parser.add_argument('csv_path')
+        command_parser.add_argument('--on-duplicate', choices=DUPLICATE_POLICIES, default='allow',
+                                    help="traitement des voitures dont la clé --dedup-key existe déjà")
+        command_parser.add_argument('--dedup-key', nargs='+', default=list(DUPLICATE_KEY), help="colonnes de la clé de doublon")
+    subparsers.add_parser('update', parents=[common], help="met à jour les voitures lues sur stdin (champ id obligatoire)")
+    delete_parser = subparsers.add_parser('delete', parents=[common], help="supprime des voitures par id (arguments, sinon stdin)")
+    delete_parser.add_argument('ids', nargs='*', type=int)
+    search_parser = subparsers.add_parser('search', parents=[common], help="recherche sur un attribut, ou critères --where")
+    search_parser.add_argument('attribute', nargs='?')
+    search_parser.add_argument('value', nargs='?')
+    search_parser.add_argument('--where', nargs=3, action='append', metavar=('COLONNE', 'OPÉRATEUR', 'VALEUR'),
+                               help=f"critère de query_cars, répétable (opérateurs: {' '.join(QUERY_OPERATORS)})")
+    search_parser.add_argument('--order-by', action='append', default=None,
+                               help="colonne de tri, répétable (décroissant: --order-by=-colonne)")
+    search_parser.add_argument('--limit', type=int, default=None)
+    search_parser.add_argument('--offset', type=int, default=0)
+    return parser
+
+
+def cli(argv=None):
+    """Point d'entrée: menu interactif sans commande, sinon mode non interactif. Retourne le code de sortie."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        main()
+        return 0
+    if args.command == 'search' and args.attribute is not None:
+        if args.value is None:
+            parser.error("search: une valeur est attendue après l'attribut")
+        if args.where or args.order_by or args.limit is not None or args.offset:
+            parser.error("search: attribut/valeur et --where/--order-by/--limit/--offset sont exclusifs")
+    on_duplicate = getattr(args, 'on_duplicate', 'allow')
+    # stdout est réservé aux résultats: les messages du dépôt passent sur stderr, y compris ceux émis à sa
+    # construction (migration des ids, report du journal CSV).
+    default_instrumentation.set_sink(_stderr_sink, min_level='error' if args.quiet else 'info')
+    repository = open_repository(args.source, args.path, args.dedup_key if on_duplicate != 'allow' else None, on_duplicate)
+    writer = RecordWriter(sys.stdout, args.output, convert=not isinstance(repository, SQLiteCarRepository))
+    try:
+        ok = COMMANDS[args.command](repository, args, writer)
+        writer.flush()
+    except BrokenPipeError:
+        # Lecteur fermé avant la fin (… | head): les écritures restantes sont redirigées vers /dev/null.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        ok = True
+    finally:
+        repository.close()
+    return 0 if ok else 1
+
+
 if __name__ == '__main__':
-    # S'assurer que le fichier de données existe ou est créé s'il est vide
-    # data_manager.load_data() # Peut être appelé pour initialiser/vérifier le fichier au démarrage
-    main()
\ No newline at end of file
+    sys.exit(cli())
\ No newline at end of file
@@ -0,0 +1,209 @@
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from data_manager import CarRepository
+
+# --- API asynchrone --- #
+# Les appels bloquants (sqlite3, pandas.read_csv…) ne doivent pas s'exécuter dans la boucle asyncio:
+# ExecutorAsyncCarRepository les délègue à un pool de threads borné et garde la boucle réactive.
+
+
+# Interface Segregation Principle (ISP): même contrat que CarRepository, en coroutines.
+class AsyncCarRepository(ABC):
+    @abstractmethod
+    async def create_car(self, new_car_data, on_duplicate=None):
+        pass
+
+    @abstractmethod
+    async def get_all_cars(self):
+        pass
+
+    @abstractmethod
+    def iter_cars(self, chunk_size=1000, as_frames=True):
+        # Générateur asynchrone: async for chunk in repo.iter_cars(...)
+        pass
+
+    @abstractmethod
+    async def get_cars_page(self, after_id=None, limit=20):
+        pass
+
+    @abstractmethod
+    async def get_car_by_id(self, car_id):
+        pass
+
+    @abstractmethod
+    async def count(self):
+        pass
+
+    @abstractmethod
+    async def exists(self, car_id):
+        pass
+
+    @abstractmethod
+    async def columns(self):
+        pass
+
+    @abstractmethod
+    async def update_car(self, car_id, updated_car_data):
+        pass
+
+    @abstractmethod
+    async def delete_car(self, car_id):
+        pass
+
+    @abstractmethod
+    async def search_cars(self, attribute, value):
+        pass
+
+    @abstractmethod
+    async def query_cars(self, predicates=None, order_by=None, limit=None, offset=0):
+        pass
+
+    @abstractmethod
+    async def create_cars(self, cars_data, on_duplicate=None):
+        pass
+
+    @abstractmethod
+    async def update_cars(self, updates):
+        pass
+
+    @abstractmethod
+    async def delete_cars(self, car_ids):
+        pass
+
+    @abstractmethod
+    async def aggregate(self, group_by=None, metrics=None, predicates=None, bands=None):
+        pass
+
+    @abstractmethod
+    async def create_summary(self, name, group_by):
+        pass
+
+    @abstractmethod
+    async def drop_summary(self, name):
+        pass
+
+    @abstractmethod
+    async def summaries(self):
+        pass
+
+    @abstractmethod
+    async def find_duplicates(self, key=None):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+
+# Adapter: expose un CarRepository synchrone (CSV ou SQLite) derrière l'interface asynchrone.
+# - SQLite (supports_concurrent_reads): les lectures s'exécutent en parallèle sur max_workers threads,
+#   chacun avec sa connexion; les écritures passent une à une (un verrou asyncio, sans bloquer les lectures en WAL).
+# - CSV: un seul thread dédié exécute toutes les opérations dans l'ordre d'arrivée (DataFrame de travail partagé).
+class ExecutorAsyncCarRepository(AsyncCarRepository):
+    def __init__(self, repository: CarRepository, max_workers=8):
+        self.repository = repository
+        workers = max_workers if repository.supports_concurrent_reads else 1
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='car-repository')
+        self._write_lock = asyncio.Lock()
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def _read(self, function, *args, **kwargs):
+        return await self._run(function, *args, **kwargs)
+
+    async def _write(self, function, *args, **kwargs):
+        async with self._write_lock:
+            return await self._run(function, *args, **kwargs)
+
+    async def create_car(self, new_car_data, on_duplicate=None):
+        return await self._write(self.repository.create_car, new_car_data, on_duplicate)
+
+    async def get_all_cars(self):
+        return await self._read(self.repository.get_all_cars)
+
+    async def iter_cars(self, chunk_size=1000, as_frames=True):
+        # Parcours par pages (pagination par clé): chaque tranche est une lecture indépendante, sans curseur
+        # partagé entre threads ni ressource retenue pendant que le consommateur traite la tranche.
+        after_id = None
+        while True:
+            page, after_id = await self.get_cars_page(after_id, chunk_size)
+            # Page au format du dépôt: DataFrame, ou liste de dicts (SQLiteCarRepository(result_format='records')).
+            if len(page) > 0:
+                if as_frames:
+                    yield page
+                else:
+                    for car in (page if isinstance(page, list) else page.to_dict('records')):
+                        yield car
+            if after_id is None:
+                return
+
+    async def get_cars_page(self, after_id=None, limit=20):
+        return await self._read(self.repository.get_cars_page, after_id, limit)
+
+    async def get_car_by_id(self, car_id):
+        return await self._read(self.repository.get_car_by_id, car_id)
+
+    async def count(self):
+        return await self._read(self.repository.count)
+
+    async def exists(self, car_id):
+        return await self._read(self.repository.exists, car_id)
+
+    async def columns(self):
+        return await self._read(self.repository.columns)
+
+    async def update_car(self, car_id, updated_car_data):
+        return await self._write(self.repository.update_car, car_id, updated_car_data)
+
+    async def delete_car(self, car_id):
+        return await self._write(self.repository.delete_car, car_id)
+
+    async def search_cars(self, attribute, value):
+        return await self._read(self.repository.search_cars, attribute, value)
+
+    async def query_cars(self, predicates=None, order_by=None, limit=None, offset=0):
+        return await self._read(self.repository.query_cars, predicates, order_by, limit, offset)
+
+    async def create_cars(self, cars_data, on_duplicate=None):
+        return await self._write(self.repository.create_cars, list(cars_data), on_duplicate)
+
+    async def update_cars(self, updates):
+        return await self._write(self.repository.update_cars, updates)
+
+    async def delete_cars(self, car_ids):
+        return await self._write(self.repository.delete_cars, list(car_ids))
+
+    async def aggregate(self, group_by=None, metrics=None, predicates=None, bands=None):
+        return await self._read(self.repository.aggregate, group_by, metrics, predicates, bands)
+
+    async def create_summary(self, name, group_by):
+        return await self._write(self.repository.create_summary, name, group_by)
+
+    async def drop_summary(self, name):
+        return await self._write(self.repository.drop_summary, name)
+
+    async def summaries(self):
+        return await self._read(self.repository.summaries)
+
+    async def find_duplicates(self, key=None):
+        return await self._read(self.repository.find_duplicates, key)
+
+    async def close(self):
+        """Attend la fin des écritures en cours, ferme le dépôt puis arrête le pool de threads."""
+        async with self._write_lock:
+            close = getattr(self.repository, 'close', None)
+            if close is not None:
+                await self._run(close)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,119 @@
+"""Benchmark: requêtes concurrentes sur l'API asynchrone (ExecutorAsyncCarRepository) vs appels bloquants dans la boucle.
+
+Mesure le débit, la latence par requête et le retard maximal de la boucle asyncio (réactivité):
+    python src/bench_async_repository.py --rows 50000 --concurrency 200 --requests 20
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from async_repository import ExecutorAsyncCarRepository
+from benchmark import percentile
+from data_manager import CAR_COLUMNS, CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from synthetic_data import generate_cars
+
+
+class _BlockingAdapter:
+    # Référence: le dépôt synchrone appelé directement depuis les coroutines (ce que l'API asynchrone évite).
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def get_car_by_id(self, car_id):
+        return self.repository.get_car_by_id(car_id)
+
+    async def update_car(self, car_id, updated_car_data):
+        return self.repository.update_car(car_id, updated_car_data)
+
+
+async def _watch_loop_lag(stop, interval=0.001):
+    """Retourne le plus grand retard observé entre l'échéance d'un réveil et son exécution."""
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+
+async def _client(repo, max_id, requests, write_ratio, latencies, rng):
+    for _ in range(requests):
+        car_id = rng.randint(0, max_id)
+        begin = time.perf_counter()
+        if rng.random() < write_ratio:
+            await repo.update_car(car_id, {'selling_price': rng.randint(50000, 2000000)})
+        else:
+            await repo.get_car_by_id(car_id)
+        latencies.append(time.perf_counter() - begin)
+
+
+async def _run(repo, max_id, concurrency, requests, write_ratio):
+    latencies = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(_watch_loop_lag(stop))
+    await asyncio.sleep(0.01)
+    begin = time.perf_counter()
+    await asyncio.gather(*(
+        _client(repo, max_id, requests, write_ratio, latencies, random.Random(seed))
+        for seed in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - begin
+    stop.set()
+    return {
+        'requests_per_s': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'loop_lag_ms': await watcher * 1000,
+    }
+
+
+def _open_repository(backend, tmp_dir):
+    if backend == 'sqlite':
+        return SQLiteCarRepository(os.path.join(tmp_dir, 'bench.db'))
+    return CsvCarRepository(CachedCsvDataSource(os.path.join(tmp_dir, 'bench.csv')))
+
+
+def run_backend(backend, rows, concurrency, requests, write_ratio, workers):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        cars = generate_cars(rows)[CAR_COLUMNS].to_dict('records')
+        repository = _open_repository(backend, tmp_dir)
+        created = repository.create_cars(cars)
+        ids = [car['id'] for car in created if car is not None]
+        min_id, max_id = min(ids), max(ids)
+        # Les ids CSV commencent à 0, ceux de SQLite à 1: les clients tirent dans [0, max_id].
+        assert min_id <= 1
+        results['bloquant'] = asyncio.run(_run(_BlockingAdapter(repository), max_id, concurrency, requests, write_ratio))
+
+        async def run_async():
+            async with ExecutorAsyncCarRepository(repository, max_workers=workers) as async_repo:
+                return await _run(async_repo, max_id, concurrency, requests, write_ratio)
+        results['asynchrone'] = asyncio.run(run_async())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=20, help="requêtes par client")
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--backends', nargs='+', default=['sqlite', 'csv'], choices=['sqlite', 'csv'])
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} clients x {args.requests} requêtes, {args.write_ratio:.0%} d'écritures, {args.rows} lignes")
+    print(f"{'source':<8} {'mode':<11} {'requêtes/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'retard boucle ms':>17}")
+    for backend in args.backends:
+        results = run_backend(backend, args.rows, args.concurrency, args.requests, args.write_ratio, args.workers)
+        for mode, result in results.items():
+            print(f"{backend:<8} {mode:<11} {result['requests_per_s']:>11.0f} {result['p50_ms']:>8.2f} "
+                  f"{result['p99_ms']:>8.2f} {result['loop_lag_ms']:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
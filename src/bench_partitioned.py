@@ -0,0 +1,63 @@
+"""Benchmark: recherche et agrégation sur un CSV partitionné (PartitionedCsvDataSource) selon le nombre de processus.
+
+Compare au dépôt CSV à fichier unique (filtrage pandas sur un seul cœur), partitions déjà en mémoire dans les deux cas:
+    python src/bench_partitioned.py --rows 5000000 --workers 1 2 4 8 --column year
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from data_manager import CachedCsvDataSource, CsvCarRepository
+from partitioned import PartitionedCsvDataSource
+from synthetic_data import generate_cars
+
+QUERIES = {
+    'search_cars': lambda repo: repo.search_cars('transmission', 'Automatic'),
+    'query_cars': lambda repo: repo.query_cars([('km_driven', 'between', (20000, 40000)), ('owner', '=', 'First Owner')]),
+    'aggregate': lambda repo: repo.aggregate(['owner', 'fuel'], {'n': ('count', '*'), 'prix': ('mean', 'selling_price')}),
+    'aggregate_pruned': lambda repo: repo.aggregate('owner', {'n': ('count', '*')}, predicates=[('year', '>=', 2018)]),
+}
+
+
+def _measure(repository, repeat):
+    results = {}
+    for name, query in QUERIES.items():
+        query(repository)  # mise en route: chargement des partitions par leurs processus
+        begin = time.perf_counter()
+        for _ in range(repeat):
+            query(repository)
+        results[name] = (time.perf_counter() - begin) / repeat
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--column', default='year', help="colonne de partition")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        cars = generate_cars(args.rows)
+        cars.insert(0, 'id', range(len(cars)))
+        csv_path = os.path.join(tmp_dir, 'cars.csv')
+        cars.to_csv(csv_path, index=False)
+        PartitionedCsvDataSource(os.path.join(tmp_dir, 'partitions'), args.column, workers=1).save_data(cars)
+        del cars
+        timings = {'fichier unique': _measure(CsvCarRepository(CachedCsvDataSource(csv_path)), args.repeat)}
+        for workers in sorted(set(args.workers)):
+            with PartitionedCsvDataSource(os.path.join(tmp_dir, 'partitions'), args.column, workers=workers) as source:
+                timings[f"{workers} processus"] = _measure(CsvCarRepository(source), args.repeat)
+
+    print(f"{args.rows} lignes, partitions par '{args.column}', {os.cpu_count()} cœurs (ms par requête)")
+    print(f"{'source':<16}" + ''.join(f"{name:>18}" for name in QUERIES))
+    for label, results in timings.items():
+        print(f"{label:<16}" + ''.join(f"{results[name] * 1000:>18.1f}" for name in QUERIES))
+
+
+if __name__ == '__main__':
+    main()
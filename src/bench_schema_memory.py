@@ -0,0 +1,46 @@
+"""Benchmark: mémoire du DataFrame des voitures selon le schéma (objets str/int64 vs schéma compact).
+
+    python src/bench_schema_memory.py --rows 1000000
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+from data_manager import CsvDataSource
+from synthetic_data import write_synthetic_csv
+
+
+def _measure(file_path, **source_options):
+    begin = time.perf_counter()
+    df = CsvDataSource(file_path, **source_options).load_data()
+    elapsed = time.perf_counter() - begin
+    return df.memory_usage(deep=True).sum(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    variants = [
+        ('non typé (object/int64)', {'typed_schema': False}),
+        ('schéma compact', {'typed_schema': True}),
+    ]
+    if importlib.util.find_spec('pyarrow') is not None:
+        variants.append(('schéma compact + noms Arrow', {'typed_schema': True, 'string_storage': 'pyarrow'}))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = write_synthetic_csv(os.path.join(tmp_dir, 'cars.csv'), args.rows)
+        baseline = None
+        print(f"{args.rows} lignes synthétiques")
+        print(f"{'variante':<30} {'mémoire (Mo)':>13} {'réduction':>10} {'chargement (s)':>15}")
+        for label, options in variants:
+            memory, elapsed = _measure(file_path, **options)
+            baseline = baseline or memory
+            print(f"{label:<30} {memory / 1e6:>13.1f} {1 - memory / baseline:>10.0%} {elapsed:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
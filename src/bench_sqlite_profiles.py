@@ -0,0 +1,105 @@
+"""Benchmark: lecteurs concurrents (plusieurs processus) pendant qu'un écrivain valide des transactions.
+
+Compare les profils de SQLITE_PROFILES sur une base temporaire:
+    python src/bench_sqlite_profiles.py --rows 50000 --readers 4 --duration 3
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmark import percentile
+from data_manager import CAR_COLUMNS, SQLITE_PROFILES, CsvDataSource, SQLiteCarRepository
+
+
+def _populate(db_file_path, profile, rows):
+    source_df = CsvDataSource().load_data()
+    records = source_df[CAR_COLUMNS].to_dict('records')
+    cars = [records[i % len(records)] for i in range(rows)]
+    with SQLiteCarRepository(db_file_path, profile=profile) as repo:
+        repo.create_cars(cars)
+
+
+def _reader(db_file_path, profile, max_id, start_at, stop_at, results):
+    with SQLiteCarRepository(db_file_path, profile=profile, timeout=30.0) as repo:
+        latencies = []
+        while time.time() < start_at:
+            time.sleep(0.001)
+        while time.time() < stop_at:
+            begin = time.perf_counter()
+            repo.get_car_by_id(random.randint(1, max_id))
+            latencies.append(time.perf_counter() - begin)
+    results.put(latencies)
+
+
+def _writer(db_file_path, profile, max_id, start_at, stop_at, results):
+    conn = sqlite3.connect(db_file_path, timeout=30.0)
+    for pragma, value in SQLITE_PROFILES[profile].items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    commits = 0
+    while time.time() < start_at:
+        time.sleep(0.001)
+    while time.time() < stop_at:
+        # Transaction d'écriture volontairement large pour rendre la fenêtre de validation visible.
+        conn.execute("BEGIN IMMEDIATE")
+        for car_id in random.sample(range(1, max_id + 1), 200):
+            conn.execute("UPDATE cars SET selling_price = selling_price + 1 WHERE id = ?", (car_id,))
+        conn.commit()
+        commits += 1
+    conn.close()
+    results.put(commits)
+
+
+def run_profile(profile, rows, readers, duration):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file_path = os.path.join(tmp_dir, 'bench.db')
+        _populate(db_file_path, profile, rows)
+        read_results = multiprocessing.Queue()
+        write_results = multiprocessing.Queue()
+        start_at = time.time() + 0.5
+        stop_at = start_at + duration
+        processes = [
+            multiprocessing.Process(target=_reader, args=(db_file_path, profile, rows, start_at, stop_at, read_results))
+            for _ in range(readers)
+        ]
+        processes.append(
+            multiprocessing.Process(target=_writer, args=(db_file_path, profile, rows, start_at, stop_at, write_results))
+        )
+        for process in processes:
+            process.start()
+        latencies = []
+        for _ in range(readers):
+            latencies.extend(read_results.get())
+        commits = write_results.get()
+        for process in processes:
+            process.join()
+    return {
+        'profile': profile,
+        'reads_per_s': len(latencies) / duration,
+        'read_p50_ms': percentile(latencies, 0.50) * 1000,
+        'read_p99_ms': percentile(latencies, 0.99) * 1000,
+        'read_max_ms': max(latencies, default=0.0) * 1000,
+        'commits_per_s': commits / duration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profil':<10} {'lectures/s':>12} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'commits/s':>10}")
+    for profile in args.profiles:
+        result = run_profile(profile, args.rows, args.readers, args.duration)
+        print(f"{result['profile']:<10} {result['reads_per_s']:>12.0f} {result['read_p50_ms']:>8.3f} "
+              f"{result['read_p99_ms']:>8.3f} {result['read_max_ms']:>8.1f} {result['commits_per_s']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: temps de démarrage à froid des commandes courtes (app.py, opérations ponctuelles SQLite).
+
+Chaque mesure est un nouveau processus Python (médiane de --repeat lancements):
+    python src/bench_startup.py --repeat 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+POINT_OPERATION = (
+    "from data_manager import SQLiteCarRepository\n"
+    "repository = SQLiteCarRepository({db!r}, result_format='records')\n"
+    "repository.get_car_by_id(1)\n"
+    "repository.close()\n"
+    "import sys; assert 'pandas' not in sys.modules\n"
+)
+
+
+def _run(args, stdin=''):
+    begin = time.perf_counter()
+    subprocess.run([sys.executable] + args, input=stdin, text=True, cwd=SRC_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    return time.perf_counter() - begin
+
+
+def _median_ms(args, repeat, stdin=''):
+    _run(args, stdin)  # mise en route: cache disque du système et fichiers .pyc
+    return statistics.median(_run(args, stdin) for _ in range(repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'cars.db')
+        commands = {
+            'python (interpréteur seul)': (['-c', 'pass'], ''),
+            'import pandas': (['-c', 'import pandas'], ''),
+            'import data_manager': (['-c', 'import data_manager'], ''),
+            'app.py (quitter)': (['app.py'], '0\n'),
+            # La première exécution crée le schéma (PRAGMA user_version); les suivantes ne font que le vérifier.
+            'get_car_by_id SQLite': (['-c', POINT_OPERATION.format(db=db_path)], ''),
+        }
+        timings = {label: _median_ms(command, args.repeat, stdin) for label, (command, stdin) in commands.items()}
+
+    print(f"Démarrage à froid, médiane de {args.repeat} processus (ms)")
+    for label, milliseconds in timings.items():
+        print(f"{label:<28}{milliseconds:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
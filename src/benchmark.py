@@ -0,0 +1,184 @@
+"""Benchmark des dépôts CsvCarRepository et SQLiteCarRepository sur des jeux de données synthétiques.
+
+Mesure latences (p50/p90/p99) et débit de create, get_by_id, update, delete, search, full_scan et close (flush du journal CSV),
+et écrit les résultats en JSON pour suivre les régressions d'une version à l'autre:
+    python src/benchmark.py --sizes 10000 100000 1000000 --output bench.json
+    python src/benchmark.py --sizes 10000 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_manager import CAR_COLUMNS, CachedCsvDataSource, CsvCarRepository, CsvDataSource, SQLiteCarRepository
+from synthetic_data import generate_cars
+
+# close: écriture du journal CSV en attente (flush) / fermeture des connexions SQLite.
+OPERATIONS = ('create', 'get_by_id', 'update', 'delete', 'search', 'full_scan', 'close')
+BACKENDS = ('csv', 'sqlite')
+# Écart relatif de p50 ou de débit au-delà duquel --compare signale une régression.
+REGRESSION_THRESHOLD = 0.20
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies, elapsed=None):
+    """Statistiques d'une série de latences (secondes) : percentiles en ms et opérations/s."""
+    elapsed = sum(latencies) if elapsed is None else elapsed
+    return {
+        'count': len(latencies),
+        'ops_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p90_ms': percentile(latencies, 0.90) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': max(latencies, default=0.0) * 1000,
+    }
+
+
+def _timed(function, arguments):
+    latencies = []
+    for args in arguments:
+        begin = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - begin)
+    return latencies
+
+
+def _open_repository(backend, tmp_dir, cars):
+    """Crée le dépôt et le remplit; retourne (dépôt, ids existants, durée du chargement initial)."""
+    begin = time.perf_counter()
+    if backend == 'csv':
+        file_path = os.path.join(tmp_dir, 'cars.csv')
+        cars.insert(0, 'id', np.arange(len(cars), dtype='int64'))
+        cars.to_csv(file_path, index=False)
+        repository = CsvCarRepository(CachedCsvDataSource(file_path))
+        ids = cars['id'].tolist()
+        repository.count() # premier chargement du fichier (et de l'index des ids)
+    else:
+        repository = SQLiteCarRepository(os.path.join(tmp_dir, 'cars.db'))
+        created = repository.create_cars(cars[CAR_COLUMNS].to_dict('records'))
+        ids = [car['id'] for car in created if car is not None]
+    return repository, ids, time.perf_counter() - begin
+
+
+def run_backend(backend, rows, ops, seed=0, source_df=None):
+    """Exécute toutes les opérations sur un dépôt de `rows` voitures; retourne une liste de résultats."""
+    rng = random.Random(seed)
+    cars = generate_cars(rows, seed=seed, source_df=source_df)
+    new_cars = generate_cars(ops, seed=seed + 1, source_df=source_df)[CAR_COLUMNS].to_dict('records')
+    name_tokens = sorted({name.split()[0] for name in cars['name'].head(1000)})
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        repository, ids, load_s = _open_repository(backend, tmp_dir, cars)
+        try:
+            # Chaque opération est précédée d'un appel de mise en route non mesuré (caches, index paresseux).
+            repository.get_car_by_id(ids[0])
+            measured = {
+                'create': _timed(repository.create_car, [(car,) for car in new_cars]),
+                'get_by_id': _timed(repository.get_car_by_id, [(rng.choice(ids),) for _ in range(ops)]),
+                'update': _timed(repository.update_car, [
+                    (rng.choice(ids), {'selling_price': rng.randint(50000, 2000000)}) for _ in range(ops)]),
+                'delete': _timed(repository.delete_car, [(car_id,) for car_id in rng.sample(ids, min(ops, len(ids)))]),
+                'search': _timed(repository.search_cars, [
+                    ('name', rng.choice(name_tokens)) if i % 2 else ('fuel', 'Diesel') for i in range(max(1, ops // 10))]),
+                'full_scan': _timed(repository.get_all_cars, [() for _ in range(max(1, ops // 50))]),
+            }
+            measured['close'] = _timed(repository.close, [()])
+        finally:
+            repository.close()
+    for operation in OPERATIONS:
+        results.append({'backend': backend, 'rows': rows, 'operation': operation, **summarize(measured[operation])})
+    results.append({'backend': backend, 'rows': rows, 'operation': 'initial_load', **summarize([load_s])})
+    return results
+
+
+def _metadata(ops, seed):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'ops': ops,
+        'seed': seed,
+    }
+
+
+def compare(results, baseline):
+    """Compare deux séries de résultats; retourne les lignes (clé, p50 avant/après, débit avant/après, régression)."""
+    previous = {(r['backend'], r['rows'], r['operation']): r for r in baseline}
+    rows = []
+    for result in results:
+        key = (result['backend'], result['rows'], result['operation'])
+        if key not in previous:
+            continue
+        before = previous[key]
+        regression = (result['p50_ms'] > before['p50_ms'] * (1 + REGRESSION_THRESHOLD)
+                      or result['ops_per_s'] < before['ops_per_s'] * (1 - REGRESSION_THRESHOLD))
+        rows.append((key, before['p50_ms'], result['p50_ms'], before['ops_per_s'], result['ops_per_s'], regression))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--ops', type=int, default=200, help="opérations mesurées par type (search: ops/10, full_scan: ops/50)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="fichier JSON des résultats (défaut: sortie standard)")
+    parser.add_argument('--compare', help="fichier JSON d'une exécution précédente à comparer")
+    args = parser.parse_args()
+
+    source_df = CsvDataSource(typed_schema=False).load_data()
+    results = []
+    for rows in args.sizes:
+        for backend in args.backends:
+            print(f"{backend} - {rows} lignes...", file=sys.stderr)
+            results.extend(run_backend(backend, rows, args.ops, args.seed, source_df))
+
+    report = {'metadata': _metadata(args.ops, args.seed), 'results': results}
+    print(f"{'source':<7} {'lignes':>8} {'opération':<13} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9}", file=sys.stderr)
+    for r in results:
+        print(f"{r['backend']:<7} {r['rows']:>8} {r['operation']:<13} {r['ops_per_s']:>10.1f} "
+              f"{r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        print(f"\nComparaison avec {args.compare} (régression: p50 ou débit à plus de {REGRESSION_THRESHOLD:.0%})", file=sys.stderr)
+        for key, p50_before, p50_after, ops_before, ops_after, regression in compare(results, baseline):
+            flag = '  <-- régression' if regression else ''
+            print(f"{key[0]:<7} {key[1]:>8} {key[2]:<13} p50 {p50_before:.3f} -> {p50_after:.3f} ms, "
+                  f"{ops_before:.1f} -> {ops_after:.1f} ops/s{flag}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Import/export en masse entre le CSV des voitures et la base SQLite, en flux (par tranches).
+
+    python src/bulk_transfer.py import data/car_dataset.csv data/cars.db
+    python src/bulk_transfer.py export data/cars.db export/cars.parquet
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_manager import CAR_COLUMNS, DUPLICATE_KEY, DUPLICATE_POLICIES, SQLiteCarRepository, atomic_replace, file_lock
+
+IMPORT_CHUNK_SIZE = 50000
+EXPORT_FORMATS = ('csv', 'parquet')
+
+INTEGER_COLUMNS = ('year', 'selling_price', 'km_driven')
+TEXT_COLUMNS = ('name', 'fuel', 'seller_type', 'transmission', 'owner')
+# Bornes de validation des colonnes entières (incluses); None: pas de borne.
+INTEGER_BOUNDS = {
+    'year': (1886, time.localtime().tm_year + 1),
+    'selling_price': (0, None),
+    'km_driven': (0, None),
+}
+
+
+def coerce_cars_chunk(chunk):
+    """Valide et convertit une tranche lue en texte; retourne (lignes pour SQLite, nombre de lignes rejetées).
+
+    Une ligne est rejetée si le nom est absent, ou si une valeur entière est illisible, non entière ou hors bornes.
+    Les colonnes absentes du fichier valent NULL; les colonnes inconnues (dont 'id') sont ignorées.
+    """
+    valid = pd.Series(True, index=chunk.index)
+    columns = {}
+    for column in TEXT_COLUMNS:
+        if column not in chunk.columns:
+            columns[column] = pd.Series(None, index=chunk.index, dtype=object)
+            continue
+        # Nettoyage des valeurs distinctes seulement (noms, carburants… se répètent beaucoup), puis report par code.
+        codes, uniques = pd.factorize(chunk[column])
+        uniques = pd.Series(uniques, dtype=object).str.strip()
+        # Le code -1 (valeur manquante) désigne le None ajouté en dernière position.
+        uniques = np.append(uniques.where(uniques != '', None).to_numpy(dtype=object), None)
+        columns[column] = pd.Series(uniques.take(codes), index=chunk.index, dtype=object)
+    valid &= columns['name'].notna()
+    for column in INTEGER_COLUMNS:
+        if column not in chunk.columns:
+            columns[column] = pd.Series(pd.NA, index=chunk.index, dtype='Int64')
+            continue
+        try:
+            # Conversion directe (rapide) si toute la tranche est lisible; sinon analyse valeur par valeur.
+            numbers = chunk[column].astype('float64')
+        except (ValueError, TypeError):
+            numbers = pd.to_numeric(chunk[column], errors='coerce')
+        low, high = INTEGER_BOUNDS[column]
+        bad = numbers.notna() & (numbers != numbers.round())
+        if low is not None:
+            bad |= numbers < low
+        if high is not None:
+            bad |= numbers > high
+        # Une valeur présente mais illisible n'est pas remplacée par NULL: la ligne est rejetée.
+        valid &= ~bad & ~(numbers.isna() & chunk[column].notna())
+        columns[column] = numbers.where(~bad).astype('Int64')
+    # Int64 -> object: des int Python (sqlite3 ne lie pas les entiers numpy) et None pour les valeurs manquantes.
+    values = [columns[column][valid].to_numpy(dtype=object, na_value=None).tolist() for column in CAR_COLUMNS]
+    return list(zip(*values)), int((~valid).sum())
+
+
+def import_csv(csv_path, repository, chunk_size=IMPORT_CHUNK_SIZE, defer_indexes=True, on_duplicate=None):
+    """Importe un CSV (chemin ou fichier ouvert) dans un dépôt sans le charger en entier; retourne les statistiques.
+
+    SQLiteCarRepository: bulk_insert; autres dépôts (CSV): un create_cars par tranche.
+    on_duplicate: traitement des doublons de la clé du dépôt (voir DUPLICATE_POLICIES; None: celui du dépôt).
+    """
+    stats = {'rows_read': 0, 'rows_imported': 0, 'rows_rejected': 0}
+
+    def chunks():
+        # Lecture en texte: les types sont validés et convertis par coerce_cars_chunk, pas devinés par pandas.
+        with pd.read_csv(csv_path, chunksize=chunk_size, dtype=str, keep_default_na=False, na_values=['']) as reader:
+            for chunk in reader:
+                rows, rejected = coerce_cars_chunk(chunk)
+                stats['rows_read'] += len(chunk)
+                stats['rows_rejected'] += rejected
+                if rows:
+                    yield rows
+
+    begin = time.perf_counter()
+    duplicates_before = repository.duplicate_count
+    if hasattr(repository, 'bulk_insert'):
+        stats['rows_imported'] = repository.bulk_insert(chunks(), defer_indexes=defer_indexes, on_duplicate=on_duplicate)
+    else:
+        # create_cars retourne aussi la voiture existante d'un doublon ignoré: les insertions sont comptées par count().
+        count_before = repository.count()
+        for rows in chunks():
+            repository.create_cars([dict(zip(CAR_COLUMNS, row)) for row in rows], on_duplicate)
+        stats['rows_imported'] = repository.count() - count_before
+    stats['rows_duplicate'] = repository.duplicate_count - duplicates_before
+    # Lignes valides ni importées ni reconnues comme doublons: tranche annulée par une erreur SQLite (bulk_insert)
+    # ou lot non journalisé (create_cars).
+    stats['rows_failed'] = stats['rows_read'] - stats['rows_rejected'] - stats['rows_imported'] - stats['rows_duplicate']
+    stats['seconds'] = time.perf_counter() - begin
+    stats['rows_per_s'] = stats['rows_imported'] / stats['seconds'] if stats['seconds'] else 0.0
+    event = repository.instrumentation.warning if stats['rows_failed'] else repository.instrumentation.info
+    event(
+        'bulk.import',
+        f"{stats['rows_imported']} voitures importées de {getattr(csv_path, 'name', csv_path)} ({stats['rows_rejected']} rejetées, "
+        f"{stats['rows_duplicate']} doublons, {stats['rows_failed']} en échec) "
+        f"en {stats['seconds']:.2f} s, soit {stats['rows_per_s']:.0f} lignes/s.",
+        **stats)
+    return stats
+
+
+def _plain_chunk(chunk):
+    # Le schéma compact dépend des valeurs de chaque tranche (dictionnaire des catégories, int16/int32…):
+    # catégories -> objets et entiers -> Int64 donnent le même schéma Parquet pour toutes les tranches.
+    dtypes = {}
+    for column in chunk.columns:
+        if isinstance(chunk[column].dtype, pd.CategoricalDtype):
+            dtypes[column] = object
+        elif pd.api.types.is_integer_dtype(chunk[column]):
+            dtypes[column] = 'Int64'
+    return chunk.astype(dtypes) if dtypes else chunk
+
+
+def _write_csv_chunks(chunks, path):
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def _write_parquet_chunks(chunks, path):
+    from columnar_sources import _require_pyarrow
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(_plain_chunk(chunk), preserve_index=False)
+            if writer is None:
+                # Le schéma est fixé par la première tranche; les suivantes y sont converties (une row group par tranche).
+                # Une colonne entièrement vide dans la première tranche est typée null: elle reçoit son type attendu.
+                schema = pa.schema([
+                    field.with_type(pa.int64() if field.name in INTEGER_COLUMNS else pa.string())
+                    if pa.types.is_null(field.type) else field
+                    for field in table.schema])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pq.write_table(pa.table({column: pa.array([], pa.string()) for column in ['id'] + CAR_COLUMNS}), path)
+    return rows
+
+
+def export_cars(repository, dest_path, fmt=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """Exporte les voitures d'un dépôt en CSV ou Parquet par tranches (iter_cars); retourne les statistiques.
+
+    Seule une tranche de chunk_size lignes est en mémoire; le fichier est remplacé atomiquement à la fin.
+    """
+    fmt = fmt or os.path.splitext(dest_path)[1].lstrip('.').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: '{fmt}'. Formats disponibles: {', '.join(EXPORT_FORMATS)}")
+    write = _write_csv_chunks if fmt == 'csv' else _write_parquet_chunks
+    directory = os.path.dirname(os.path.abspath(dest_path))
+    os.makedirs(directory, exist_ok=True)
+    stats = {}
+    begin = time.perf_counter()
+    with file_lock(dest_path):
+        atomic_replace(dest_path, lambda temp_path: stats.update(rows_exported=write(repository.iter_cars(chunk_size), temp_path)))
+    stats['seconds'] = time.perf_counter() - begin
+    stats['rows_per_s'] = stats['rows_exported'] / stats['seconds'] if stats['seconds'] else 0.0
+    repository.instrumentation.info(
+        'bulk.export',
+        f"{stats['rows_exported']} voitures exportées vers {dest_path} en {stats['seconds']:.2f} s, "
+        f"soit {stats['rows_per_s']:.0f} lignes/s.",
+        **stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="CSV -> SQLite")
+    import_parser.add_argument('csv_path')
+    import_parser.add_argument('db_path')
+    import_parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+    import_parser.add_argument('--keep-indexes', action='store_true',
+                               help="maintient les index pendant l'import (plus lent, index disponibles pour les lecteurs)")
+    import_parser.add_argument('--profile', default='balanced', help="profil SQLite (voir SQLITE_PROFILES)")
+    import_parser.add_argument('--on-duplicate', choices=DUPLICATE_POLICIES, default='allow',
+                               help="traitement des lignes dont la clé --dedup-key existe déjà")
+    import_parser.add_argument('--dedup-key', nargs='+', default=list(DUPLICATE_KEY), help="colonnes de la clé de doublon")
+    export_parser = subparsers.add_parser('export', help="SQLite -> CSV ou Parquet")
+    export_parser.add_argument('db_path')
+    export_parser.add_argument('dest_path')
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, default=None, help="défaut: extension du fichier")
+    export_parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        dedup_key = args.dedup_key if args.on_duplicate != 'allow' else None
+        with SQLiteCarRepository(args.db_path, profile=args.profile, dedup_key=dedup_key, on_duplicate=args.on_duplicate) as repository:
+            import_csv(args.csv_path, repository, args.chunk_size, defer_indexes=not args.keep_indexes)
+    else:
+        fmt = args.format or os.path.splitext(args.dest_path)[1].lstrip('.').lower()
+        if fmt not in EXPORT_FORMATS:
+            parser.error(f"format d'export inconnu: '{fmt}' (utiliser --format {' ou '.join(EXPORT_FORMATS)})")
+        with SQLiteCarRepository(args.db_path) as repository:
+            export_cars(repository, args.dest_path, fmt, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import importlib.util
+import os
+import sys
+
+import pandas as pd
+
+from data_manager import DataSource, CsvDataSource, atomic_replace, file_lock
+
+# --- Sources de données colonnaires (Parquet / Feather) --- #
+# Dépendance optionnelle: pyarrow (pip install pyarrow). Les sources se branchent telles quelles
+# sur CsvCarRepository (Liskov Substitution Principle) et ajoutent la projection (columns=...) et
+# le filtrage à la lecture (filters=...) utilisés par search_cars et query_cars.
+
+
+def _require_pyarrow():
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError("Les sources Parquet/Feather nécessitent pyarrow: pip install pyarrow")
+
+
+def predicates_to_expression(predicates):
+    """Traduit des critères (colonne, opérateur, valeur) au format de query_cars en expression pyarrow."""
+    import pyarrow.compute as pc
+
+    expression = None
+    for column, operator, value in predicates:
+        field = pc.field(column)
+        if operator in ('=', '=='):
+            condition = field == value
+        elif operator == '!=':
+            condition = field != value
+        elif operator == '<':
+            condition = field < value
+        elif operator == '<=':
+            condition = field <= value
+        elif operator == '>':
+            condition = field > value
+        elif operator == '>=':
+            condition = field >= value
+        elif operator == 'in':
+            condition = field.isin(list(value))
+        elif operator == 'between':
+            low, high = value
+            condition = (field >= low) & (field <= high)
+        elif operator == 'contains':
+            condition = pc.match_substring(field.cast('string'), str(value), ignore_case=True)
+        else:
+            raise ValueError(f"Opérateur '{operator}' non supporté pour le filtrage colonnaire.")
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+# Template Method: la lecture/écriture du format est laissée aux sous-classes.
+class ColumnarDataSource(DataSource):
+    supports_filters = True
+    format_name = None
+    default_file_name = None
+
+    def __init__(self, file_path=None, columns=None, instrumentation=None):
+        _require_pyarrow()
+        if file_path is None:
+            self.file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', self.default_file_name))
+        else:
+            self.file_path = file_path
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        # Projection par défaut: None charge toutes les colonnes.
+        self.columns_to_load = columns
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+
+    def _read_table(self, columns, expression):
+        raise NotImplementedError
+
+    def _write_table(self, table, path):
+        raise NotImplementedError
+
+    def write_table(self, table):
+        """Écrit une table pyarrow dans un fichier temporaire puis le renomme à la place du fichier cible.
+
+        Indispensable avec memory_map: réécrire le fichier en place invaliderait les pages encore
+        référencées par des DataFrames déjà chargés (SIGBUS). Le renommage laisse l'ancien inode intact.
+        """
+        with file_lock(self.file_path):
+            atomic_replace(self.file_path, lambda temp_path: self._write_table(table, temp_path))
+
+    def _schema(self):
+        raise NotImplementedError
+
+    def load_data(self, columns=None, filters=None):
+        columns = columns if columns is not None else self.columns_to_load
+        try:
+            expression = predicates_to_expression(filters) if filters else None
+            return self._read_table(columns, expression).to_pandas()
+        except FileNotFoundError:
+            self.instrumentation.error(f"{self.format_name.lower()}.load_data", f"Erreur: Le fichier {self.file_path} n'a pas été trouvé.")
+            return pd.DataFrame()
+        except Exception as e:
+            self.instrumentation.error(f"{self.format_name.lower()}.load_data", f"Erreur lors du chargement des données {self.format_name}: {e}")
+            return pd.DataFrame()
+
+    def save_data(self, df):
+        import pyarrow as pa
+
+        try:
+            self.write_table(pa.Table.from_pandas(df, preserve_index=False))
+            self.instrumentation.info(f"{self.format_name.lower()}.save_data", f"Données {self.format_name} sauvegardées avec succès.",
+                                      path=self.file_path, rows=len(df))
+            return True
+        except Exception as e:
+            self.instrumentation.error(f"{self.format_name.lower()}.save_data", f"Erreur lors de la sauvegarde des données {self.format_name}: {e}")
+            return False
+
+    def columns(self):
+        try:
+            return list(self._schema().names)
+        except (FileNotFoundError, OSError):
+            return []
+
+    def is_numeric_column(self, column):
+        import pyarrow.types as pa_types
+
+        field_type = self._schema().field(column).type
+        return pa_types.is_integer(field_type) or pa_types.is_floating(field_type)
+
+    def data_version(self):
+        # Le fichier n'est modifié que par réécriture complète: sa signature suffit à détecter un changement.
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+class ParquetDataSource(ColumnarDataSource):
+    format_name = 'Parquet'
+    default_file_name = 'car_dataset.parquet'
+
+    def _read_table(self, columns, expression):
+        import pyarrow.parquet as pq
+
+        # Les statistiques min/max des row groups permettent d'écarter des blocs entiers sans les décoder.
+        return pq.read_table(self.file_path, columns=columns, filters=expression)
+
+    def _write_table(self, table, path):
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, compression='zstd')
+
+    def _schema(self):
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(self.file_path)
+
+    def row_count(self):
+        import pyarrow.parquet as pq
+
+        # Lu dans les métadonnées du fichier, sans décoder les données.
+        try:
+            return pq.ParquetFile(self.file_path).metadata.num_rows
+        except (FileNotFoundError, OSError):
+            return 0
+
+
+class FeatherDataSource(ColumnarDataSource):
+    format_name = 'Feather'
+    default_file_name = 'car_dataset.feather'
+
+    def _read_table(self, columns, expression):
+        import pyarrow.feather as feather
+
+        # Fichier non compressé + memory_map: les colonnes sont lues directement depuis le cache de pages de l'OS.
+        table = feather.read_table(self.file_path, columns=columns, memory_map=True)
+        return table.filter(expression) if expression is not None else table
+
+    def _write_table(self, table, path):
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path, compression='uncompressed')
+
+    def _schema(self):
+        import pyarrow as pa
+
+        with pa.memory_map(self.file_path) as source:
+            return pa.ipc.open_file(source).schema
+
+    def row_count(self):
+        import pyarrow.feather as feather
+
+        try:
+            return feather.read_table(self.file_path, columns=[], memory_map=True).num_rows
+        except (FileNotFoundError, OSError):
+            return 0
+
+
+COLUMNAR_FORMATS = {
+    'parquet': ParquetDataSource,
+    'feather': FeatherDataSource,
+}
+
+
+def convert_csv(csv_path=None, dest_path=None, fmt='parquet'):
+    """Convertit le CSV des voitures en Parquet ou Feather et retourne la source de destination."""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Format inconnu: '{fmt}'. Formats disponibles: {', '.join(COLUMNAR_FORMATS)}")
+    _require_pyarrow()
+    import pyarrow.csv as pa_csv
+
+    csv_source = CsvDataSource(csv_path)
+    destination = COLUMNAR_FORMATS[fmt](dest_path)
+    # Lecteur CSV multi-thread de pyarrow: pas de passage par un DataFrame intermédiaire.
+    table = pa_csv.read_csv(csv_source.file_path)
+    destination.write_table(table)
+    destination.instrumentation.info(f"{fmt}.convert_csv", f"{table.num_rows} voitures converties de {csv_source.file_path} vers {destination.file_path}.",
+                                     source=csv_source.file_path, path=destination.file_path, rows=table.num_rows)
+    return destination
+
+
+if __name__ == '__main__':
+    # Usage: python columnar_sources.py [parquet|feather] [chemin_csv] [chemin_destination]
+    arguments = sys.argv[1:]
+    convert_csv(
+        csv_path=arguments[1] if len(arguments) > 1 else None,
+        dest_path=arguments[2] if len(arguments) > 2 else None,
+        fmt=arguments[0] if arguments else 'parquet',
+    )
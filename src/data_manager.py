@@ -1,13 +1,61 @@
-import pandas as pd
+import bisect
+import csv
+import importlib
+import json
 import os
+import re
+import shutil
 import sqlite3
+import threading
+import time
+import unicodedata
 from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+
+from instrumentation import default_instrumentation, instrumented
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _LazyModule:
+    """Module importé au premier accès à l'un de ses attributs, puis substitué à ce proxy dans `namespace`.
+
+    pandas et numpy coûtent plusieurs centaines de millisecondes à importer: les commandes courtes et les
+    opérations ponctuelles SQLite (get_car_by_id, create_car…) n'en paient le prix que si un DataFrame est construit.
+    """
+
+    def __init__(self, name, namespace, alias):
+        self._name = name
+        self._namespace = namespace
+        self._alias = alias
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self._name)
+        # Les accès suivants vont directement au module, sans passer par le proxy.
+        self._namespace[self._alias] = module
+        return getattr(module, attribute)
+
+
+pd = _LazyModule('pandas', globals(), 'pd')
+np = _LazyModule('numpy', globals(), 'np')
 
 # --- Principles SOLID --- #
 
 # Interface Segregation Principle (ISP) & Single Responsibility Principle (SRP)
 # DataSource: Responsable uniquement du chargement et de la sauvegarde des données brutes.
 class DataSource(ABC):
+    # Vrai si load_data accepte filters=[(colonne, opérateur, valeur)] et filtre à la lecture (push-down).
+    supports_filters = False
+    # Vrai si la source calcule elle-même aggregate(group_by, metrics, predicates, bands) (arguments normalisés).
+    supports_aggregate = False
+    # Événements et métriques (voir instrumentation.py); remplaçable par instance.
+    instrumentation = default_instrumentation
+
     @abstractmethod
     def load_data(self):
         """Charge les données depuis la source."""
@@ -18,19 +66,78 @@ class DataSource(ABC):
         """Sauvegarde les données dans la source."""
         pass
 
+    def peek_data(self):
+        """Retourne les données pour une lecture seule (sans copie défensive si possible)."""
+        return self.load_data()
+
+    def row_count(self):
+        """Retourne le nombre de lignes de la source."""
+        return len(self.peek_data())
+
+    def columns(self):
+        """Retourne la liste des colonnes de la source."""
+        return list(self.peek_data().columns)
+
+    def iter_chunks(self, chunk_size):
+        """Parcourt les données par tranches de chunk_size lignes."""
+        df = self.peek_data()
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+    def data_version(self):
+        """Retourne un jeton qui change à chaque modification des données (None si inconnu).
+
+        Permet aux dépôts de conserver des index dérivés tant que les données n'ont pas changé.
+        """
+        return None
+
 # CarRepository: Responsable des opérations CRUD spécifiques aux voitures.
 class CarRepository(ABC):
+    # Vrai si plusieurs threads peuvent lire en même temps (les écritures restent à sérialiser par l'appelant).
+    supports_concurrent_reads = False
+    instrumentation = default_instrumentation
+    # Préfixe des métriques des opérations ('csv.search_cars.ms'…).
+    metrics_prefix = 'repository'
+    # Clé de doublon (colonnes) et traitement par défaut des doublons à la création (voir DUPLICATE_POLICIES).
+    dedup_key = None
+    on_duplicate = 'allow'
+    # Doublons détectés à la création depuis l'ouverture du dépôt (ignorés, fusionnés ou signalés), lus par import_csv.
+    duplicate_count = 0
+
     @abstractmethod
-    def create_car(self, new_car_data):
+    def create_car(self, new_car_data, on_duplicate=None):
         pass
 
     @abstractmethod
     def get_all_cars(self):
         pass
 
+    @abstractmethod
+    def iter_cars(self, chunk_size=1000, as_frames=True):
+        # Parcours en flux: DataFrames d'au plus chunk_size lignes, ou dicts ligne par ligne si as_frames=False.
+        pass
+
+    @abstractmethod
+    def get_cars_page(self, after_id=None, limit=20):
+        # Pagination par clé: retourne (DataFrame, after_id de la page suivante ou None s'il n'y en a plus).
+        pass
+
     @abstractmethod
     def get_car_by_id(self, car_id):
-        # Pour CSV, l'ID sera l'index. Pour SQLite, ce sera la clé primaire.
+        # Pour CSV comme pour SQLite, l'ID est la colonne 'id' (clé primaire pour SQLite).
+        pass
+
+    # Métadonnées peu coûteuses: évitent de charger tout le jeu de données pour un simple compte.
+    @abstractmethod
+    def count(self):
+        pass
+
+    @abstractmethod
+    def exists(self, car_id):
+        pass
+
+    @abstractmethod
+    def columns(self):
         pass
 
     @abstractmethod
@@ -45,138 +152,1774 @@ class CarRepository(ABC):
     def search_cars(self, attribute, value):
         pass
 
+    @abstractmethod
+    def query_cars(self, predicates=None, order_by=None, limit=None, offset=0):
+        # predicates: liste de (colonne, opérateur, valeur), combinés par ET (voir QUERY_OPERATORS).
+        # order_by: colonne ou liste de colonnes, préfixe '-' pour un tri décroissant.
+        pass
+
+    # Opérations par lots: un seul chargement/une seule transaction pour tout le lot.
+    # Chaque méthode retourne une liste de résultats alignée sur l'entrée (None pour une ligne en échec).
+    @abstractmethod
+    def create_cars(self, cars_data, on_duplicate=None):
+        # on_duplicate: traitement des doublons de dedup_key (None: celui du dépôt). Un doublon ignoré ('skip')
+        # ou fusionné ('merge') a pour résultat la voiture existante, un doublon signalé ('report') None.
+        pass
+
+    @abstractmethod
+    def update_cars(self, updates):
+        # updates: dict {id: données} ou itérable de paires (id, données).
+        pass
+
+    @abstractmethod
+    def delete_cars(self, car_ids):
+        pass
+
+    # Agrégations calculées par la source (GROUP BY SQL, groupby pandas), sans passer par get_all_cars.
+    @abstractmethod
+    def aggregate(self, group_by=None, metrics=None, predicates=None, bands=None):
+        # group_by: colonne(s) de regroupement; metrics: {nom: (fonction, colonne)} (voir AGGREGATE_FUNCTIONS);
+        # predicates: comme query_cars; bands: {colonne: bornes} pour regrouper par tranches ('<colonne>_band').
+        pass
+
+    # Tables de synthèse maintenues à chaque écriture: count/sum/mean par groupe servis en O(groupes).
+    @abstractmethod
+    def create_summary(self, name, group_by):
+        pass
+
+    @abstractmethod
+    def drop_summary(self, name):
+        pass
+
+    @abstractmethod
+    def summaries(self):
+        # Retourne {nom: colonnes de regroupement}.
+        pass
+
+    @abstractmethod
+    def find_duplicates(self, key=None):
+        # Voitures dont la clé (défaut: dedup_key, sinon DUPLICATE_KEY) est partagée par une autre,
+        # avec la colonne 'duplicate_of' (plus petit id du groupe).
+        pass
+
+    def _duplicate_policy(self, on_duplicate):
+        policy = self.on_duplicate if on_duplicate is None else check_duplicate_policy(on_duplicate)
+        if policy != 'allow' and self.dedup_key is None:
+            raise ValueError(f"Traitement des doublons '{policy}' impossible: aucune clé de doublon (dedup_key) configurée.")
+        return policy
+
+    def data_version(self):
+        """Retourne un jeton qui change à chaque modification des voitures (None si inconnu).
+
+        Permet aux appelants (cache de réponses HTTP, ETag…) de savoir si leurs copies sont encore à jour.
+        """
+        return None
+
+
+# Opérateurs acceptés par query_cars. 'in' attend une liste, 'between' un couple (min, max) inclusif,
+# 'contains' une sous-chaîne (ou des préfixes de jetons pour 'name').
+QUERY_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'in', 'between', 'contains')
+
+
+def normalize_query(predicates, order_by, limit, offset, valid_columns):
+    """Valide les critères de query_cars et les retourne normalisés; lève ValueError si invalides."""
+    normalized_predicates = []
+    for predicate in predicates or ():
+        try:
+            column, operator, value = predicate
+        except (TypeError, ValueError):
+            raise ValueError(f"Critère invalide: {predicate!r} (attendu: (colonne, opérateur, valeur)).")
+        operator = '=' if operator == '==' else str(operator).lower()
+        if column not in valid_columns:
+            raise ValueError(f"La colonne '{column}' n'existe pas.")
+        if operator not in QUERY_OPERATORS:
+            raise ValueError(f"Opérateur '{operator}' non supporté. Opérateurs: {', '.join(QUERY_OPERATORS)}")
+        if operator == 'in':
+            if isinstance(value, (str, bytes)):
+                raise ValueError(f"L'opérateur 'in' attend une liste de valeurs pour '{column}'.")
+            value = list(value)
+        elif operator == 'between':
+            try:
+                low, high = value
+            except (TypeError, ValueError):
+                raise ValueError(f"L'opérateur 'between' attend un couple (min, max) pour '{column}'.")
+            value = (low, high)
+        normalized_predicates.append((column, operator, value))
+
+    if isinstance(order_by, str):
+        order_by = [order_by]
+    normalized_order = []
+    for key in order_by or ():
+        column = key[1:] if key.startswith('-') else key
+        if column not in valid_columns:
+            raise ValueError(f"Impossible de trier sur la colonne inconnue '{column}'.")
+        normalized_order.append((column, key.startswith('-')))
+
+    if limit is not None and (not isinstance(limit, int) or limit < 0):
+        raise ValueError(f"limit doit être un entier positif ou nul: {limit!r}")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"offset doit être un entier positif ou nul: {offset!r}")
+    return normalized_predicates, normalized_order
+
+
+def predicate_mask(series, operator, value):
+    """Masque booléen (numpy) d'un critère normalisé (opérateur, valeur) appliqué à une colonne.
+
+    Une valeur manquante ne satisfait aucun critère, comme NULL en SQL. Cela vaut aussi pour les entiers
+    nullables (Int16, Int32), dont les comparaisons retournent pd.NA.
+    """
+    if operator == '=':
+        matches = series == value
+    elif operator == '!=':
+        matches = (series != value) & series.notna()
+    elif operator == '<':
+        matches = series < value
+    elif operator == '<=':
+        matches = series <= value
+    elif operator == '>':
+        matches = series > value
+    elif operator == '>=':
+        matches = series >= value
+    elif operator == 'in':
+        matches = series.isin(value)
+    elif operator == 'between':
+        matches = series.between(*value)
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        # Le motif est évalué une fois par catégorie, puis les lignes sont filtrées sur leurs codes.
+        categories = series.cat.categories
+        matches = series.isin(categories[categories.astype(str).str.contains(str(value), case=False, regex=False, na=False)])
+    else:
+        # astype(str) écrirait 'nan' / '<NA>' pour une valeur manquante: exclue explicitement.
+        matches = series.astype(str).str.contains(str(value), case=False, regex=False, na=False) & series.notna()
+    return matches.to_numpy(dtype=bool, na_value=False)
+
+
+def _update_items(updates):
+    """Normalise un lot de mises à jour en liste de paires (id, données)."""
+    if isinstance(updates, dict):
+        return list(updates.items())
+    return list(updates)
+
+
+# --- Agrégations --- #
+
+# Fonctions d'agrégation de CarRepository.aggregate; ('count', '*') compte les lignes, ('count', colonne) les valeurs non nulles.
+AGGREGATE_FUNCTIONS = ('count', 'sum', 'mean', 'min', 'max', 'median')
+# Colonnes dérivées utilisables dans les métriques et les tranches: expression SQL et calcul vectorisé équivalents.
+AGGREGATE_VIRTUAL_COLUMNS = {
+    'price_per_km': (
+        "CAST(selling_price AS REAL) / NULLIF(km_driven, 0)",
+        lambda df: pd.to_numeric(df['selling_price'], errors='coerce').astype('float64')
+        / pd.to_numeric(df['km_driven'], errors='coerce').astype('float64').replace(0, np.nan),
+    ),
+}
+# Colonnes cumulées par les tables de synthèse (nombre de valeurs non nulles et somme): count, sum et mean en O(groupes).
+SUMMARY_COLUMNS = ('selling_price', 'km_driven', 'year')
+SUMMARY_FUNCTIONS = ('count', 'sum', 'mean')
+
+
+def normalize_aggregate(group_by, metrics, predicates, bands, valid_columns):
+    """Valide les arguments de aggregate; retourne (group_by, [(nom, fonction, colonne)], critères, tranches).
+
+    bands: {colonne: bornes croissantes}; ajoute la colonne de regroupement '<colonne>_band' qui vaut
+    la plus grande borne inférieure ou égale à la valeur (NULL sous la première borne).
+    """
+    valid_columns = list(valid_columns)
+    value_columns = valid_columns + list(AGGREGATE_VIRTUAL_COLUMNS)
+    normalized_bands = {}
+    for column, edges in (bands or {}).items():
+        if column not in value_columns:
+            raise ValueError(f"Impossible de découper en tranches la colonne inconnue '{column}'.")
+        edges = sorted(float(edge) for edge in edges)
+        if not edges:
+            raise ValueError(f"Les tranches de '{column}' doivent avoir au moins une borne.")
+        normalized_bands[f"{column}_band"] = (column, edges)
+
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    group_by = list(group_by or ())
+    for column in group_by:
+        if column not in valid_columns and column not in normalized_bands:
+            raise ValueError(f"Impossible de regrouper sur la colonne inconnue '{column}'.")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("Une colonne de regroupement est répétée.")
+
+    normalized_metrics = []
+    for name, metric in (metrics or {'count': ('count', '*')}).items():
+        try:
+            function, column = metric
+        except (TypeError, ValueError):
+            raise ValueError(f"Métrique invalide: {metric!r} (attendu: (fonction, colonne)).")
+        function = 'mean' if function == 'avg' else function
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Fonction d'agrégation '{function}' non supportée. Fonctions: {', '.join(AGGREGATE_FUNCTIONS)}")
+        if column == '*' and function != 'count':
+            raise ValueError(f"La colonne '*' n'est acceptée que par 'count'.")
+        if column != '*' and column not in value_columns:
+            raise ValueError(f"La colonne '{column}' n'existe pas.")
+        if name in group_by:
+            raise ValueError(f"La métrique '{name}' porte le nom d'une colonne de regroupement.")
+        normalized_metrics.append((name, function, column))
+
+    normalized_predicates, _ = normalize_query(predicates, None, None, 0, valid_columns)
+    return group_by, normalized_metrics, normalized_predicates, normalized_bands
+
+
+def summary_supports(metrics):
+    """Vrai si toutes les métriques peuvent être servies par une table de synthèse."""
+    return all(function in SUMMARY_FUNCTIONS and (column in SUMMARY_COLUMNS or (function == 'count' and column == '*'))
+               for _, function, column in metrics)
+
+
+def _key_value(value):
+    # Clé de groupe (ou de doublon) comparable entre le DataFrame (numpy, NaN) et les dicts de voitures (Python, None).
+    # Types Python natifs d'abord: une voiture reçue en dict n'a pas besoin de pandas (import paresseux).
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return None if value != value else int(value) if value.is_integer() else value
+    if isinstance(value, int):
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+# Table de synthèse en mémoire (dépôt CSV): {groupe: [lignes, somme et nombre de valeurs de chaque SUMMARY_COLUMNS]}.
+# Chaque création/mise à jour/suppression la corrige en O(1); un tableau de bord la lit en O(groupes).
+class SummaryTable:
+    def __init__(self, group_by):
+        self.group_by = tuple(group_by)
+        self.groups = {}
+
+    def build(self, df):
+        self.groups = {}
+        if df.empty:
+            return
+        grouped = df.groupby(list(self.group_by), dropna=False, observed=True, sort=False)
+        columns = [grouped.size()]
+        for column in SUMMARY_COLUMNS:
+            if column in df.columns:
+                values = grouped[column]
+                columns.extend([values.sum(min_count=0), values.count()])
+            else:
+                columns.extend([pd.Series(0, index=columns[0].index)] * 2)
+        for key, row in zip(columns[0].index, zip(*(column.tolist() for column in columns))):
+            key = key if isinstance(key, tuple) else (key,)
+            self.groups[tuple(_key_value(value) for value in key)] = [
+                value if isinstance(value, int) else float(value) for value in row]
+
+    def add(self, car, sign=1):
+        """Ajoute (sign=1) ou retire (sign=-1) une voiture de son groupe."""
+        if car is None:
+            return
+        key = tuple(_key_value(car.get(column)) for column in self.group_by)
+        totals = self.groups.setdefault(key, [0] * (1 + 2 * len(SUMMARY_COLUMNS)))
+        totals[0] += sign
+        for position, column in enumerate(SUMMARY_COLUMNS):
+            value = _key_value(car.get(column))
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[1 + 2 * position] += sign * value
+                totals[2 + 2 * position] += sign
+        if totals[0] <= 0:
+            del self.groups[key]
+
+    def to_frame(self, group_by, metrics):
+        records = []
+        for key, totals in self.groups.items():
+            record = dict(zip(self.group_by, key))
+            for name, function, column in metrics:
+                if column == '*':
+                    record[name] = totals[0]
+                    continue
+                position = SUMMARY_COLUMNS.index(column)
+                total, count = totals[1 + 2 * position], totals[2 + 2 * position]
+                record[name] = {'count': count, 'sum': total if count else np.nan, 'mean': total / count if count else np.nan}[function]
+            records.append(record)
+        df = pd.DataFrame.from_records(records, columns=list(group_by) + [name for name, _, _ in metrics])
+        return df.sort_values(list(group_by), na_position='first', kind='stable').reset_index(drop=True) if group_by else df
+
+
+def find_summary(summaries, group_by, metrics, predicates, bands):
+    """Retourne le nom d'une table de synthèse qui répond à l'agrégation (None si aucune)."""
+    if predicates or bands or not group_by or not summary_supports(metrics):
+        return None
+    for name, summary_group_by in summaries.items():
+        if set(summary_group_by) == set(group_by):
+            return name
+    return None
+
+
+def _aggregate_values(df, column):
+    if column in AGGREGATE_VIRTUAL_COLUMNS:
+        return AGGREGATE_VIRTUAL_COLUMNS[column][1](df)
+    return df[column]
+
+
+def aggregate_frame(df, group_by, metrics, bands):
+    """Agrégation vectorisée d'un DataFrame de voitures (arguments normalisés par normalize_aggregate).
+
+    Groupes triés par valeur, valeurs manquantes en premier (comme ORDER BY en SQLite).
+    """
+    work = {}
+    for column in group_by:
+        if column in bands:
+            source, edges = bands[column]
+            values = pd.to_numeric(_aggregate_values(df, source), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            positions = np.searchsorted(edges, values, side='right') - 1
+            work[column] = np.where((positions >= 0) & ~np.isnan(values), np.asarray(edges)[positions.clip(0)], np.nan)
+        elif isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Ordre des groupes: celui des valeurs, pas celui des catégories.
+            work[column] = df[column].astype(object)
+        else:
+            work[column] = df[column]
+    for name, function, column in metrics:
+        if column != '*':
+            values = _aggregate_values(df, column)
+            if pd.api.types.is_integer_dtype(values.dtype):
+                # Entiers compacts (int16/int32) élargis: une somme dépasserait leur capacité.
+                values = values.astype('Int64' if values.hasnans else 'int64')
+            work[f"__{name}"] = values
+    frame = pd.DataFrame(work, index=df.index)
+
+    def compute(values, function, column, name):
+        if column == '*':
+            return values.size() if group_by else len(values)
+        if function == 'sum':
+            # Somme d'aucune valeur: nulle (NULL), comme SUM en SQL.
+            result = values[f"__{name}"].sum(min_count=1)
+        else:
+            result = getattr(values[f"__{name}"], function)()
+        if isinstance(result, pd.Series) and pd.api.types.is_extension_array_dtype(result.dtype):
+            # Int64/Float64 nullables -> types numpy (NaN pour les groupes sans valeur).
+            result = result.astype('float64') if result.hasnans or function in ('mean', 'median') else result.astype(result.dtype.numpy_dtype)
+        return result
+
+    names = [name for name, _, _ in metrics]
+    if not group_by:
+        return pd.DataFrame([{name: compute(frame, function, column, name) for name, function, column in metrics}], columns=names)
+    if frame.empty:
+        return pd.DataFrame(columns=list(group_by) + names)
+    grouped = frame.groupby(list(group_by), dropna=False, observed=True, sort=False)
+    result = pd.DataFrame({name: compute(grouped, function, column, name) for name, function, column in metrics}).reset_index()
+    return result.sort_values(list(group_by), na_position='first', kind='stable').reset_index(drop=True)
+
+
+# --- Doublons --- #
+
+# Annonces quasi identiques du jeu de données: même nom, année, kilométrage et prix.
+DUPLICATE_KEY = ('name', 'year', 'km_driven', 'selling_price')
+# Création d'une voiture dont la clé existe déjà: 'allow' (créée quand même), 'skip' (non créée),
+# 'merge' (valeurs non nulles reportées sur la voiture existante), 'report' (non créée, signalée).
+DUPLICATE_POLICIES = ('allow', 'skip', 'merge', 'report')
+DUPLICATE_ACTIONS = {'skip': 'ignorés', 'merge': 'fusionnés avec la voiture existante', 'report': 'refusés'}
+
+
+def normalize_duplicate_key(key):
+    key = (key,) if isinstance(key, str) else tuple(key)
+    if not key or len(set(key)) != len(key) or any(column not in CAR_COLUMNS for column in key):
+        raise ValueError(f"Clé de doublon invalide: {key}. Colonnes disponibles: {', '.join(CAR_COLUMNS)}")
+    return key
+
+
+def check_duplicate_policy(policy):
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Traitement des doublons inconnu: '{policy}'. Traitements disponibles: {', '.join(DUPLICATE_POLICIES)}")
+    return policy
+
+
+def merge_data(car_data):
+    """Valeurs d'une voiture reportées sur son doublon existant ('merge'): les valeurs non nulles, hors id."""
+    return {key: value for key, value in car_data.items() if key != 'id' and _key_value(value) is not None}
+
+
+def duplicate_groups(df, key):
+    """Voitures de df dont la clé est partagée par une autre, avec 'duplicate_of', triées par groupe puis par id."""
+    key = list(key)
+    df = df[df.duplicated(key, keep=False)]
+    duplicate_of = df.groupby(key, dropna=False, observed=True)['id'].transform('min') if not df.empty else pd.Series(dtype='int64')
+    return df.assign(duplicate_of=duplicate_of).sort_values(['duplicate_of', 'id'], kind='stable').reset_index(drop=True)
+
+
+# Index des clés de doublon en mémoire (dépôt CSV): {clé: plus petit id}, les autres ids de même clé à part.
+# Recherche, ajout et retrait en O(1) par voiture, au lieu d'un parcours du DataFrame à chaque création.
+class DuplicateIndex:
+    def __init__(self, key):
+        self.key = tuple(key)
+        self.first = {}
+        self.others = {}
+
+    def key_of(self, car):
+        return tuple(_key_value(car.get(column)) for column in self.key)
+
+    def build(self, df):
+        self.first, self.others = {}, {}
+        if df.empty:
+            return
+        # Colonnes converties en une fois: NaN/pd.NA -> None (NaN n'est égal à rien, pas même à lui-même).
+        columns = [df[column].astype(object).where(df[column].notna(), None).tolist() if column in df.columns
+                   else [None] * len(df) for column in self.key]
+        for car_id, key in zip(df['id'].tolist(), zip(*columns)):
+            self._add(key, car_id)
+
+    def _add(self, key, car_id):
+        first = self.first.setdefault(key, car_id)
+        if first != car_id:
+            # Le plus petit id représente le groupe, comme duplicate_of (find_duplicates) et SQLite (ORDER BY id).
+            if car_id < first:
+                self.first[key], car_id = car_id, first
+            self.others.setdefault(key, []).append(car_id)
+
+    def add(self, car, sign=1):
+        """Ajoute (sign=1) ou retire (sign=-1) une voiture de l'index."""
+        if car is None:
+            return
+        key, car_id = self.key_of(car), car['id']
+        if sign > 0:
+            self._add(key, car_id)
+            return
+        others = self.others.get(key)
+        if self.first.get(key) == car_id:
+            if others:
+                self.first[key] = min(others)
+                others.remove(self.first[key])
+            else:
+                del self.first[key]
+        elif others and car_id in others:
+            others.remove(car_id)
+        if others is not None and not others:
+            del self.others[key]
+
+    def find(self, car):
+        """Plus petit id des voitures de même clé (None si aucune)."""
+        return self.first.get(self.key_of(car))
+
+
+def _collapse_duplicates(rows, key_positions, merge):
+    # Doublons internes à une tranche de lignes (tuples): seule la première est gardée; avec merge,
+    # les valeurs non nulles des suivantes y sont reportées.
+    kept = {}
+    for row in rows:
+        key = tuple(row[position] for position in key_positions)
+        first = kept.get(key)
+        if first is None:
+            kept[key] = row
+        elif merge:
+            kept[key] = tuple(first_value if value is None else value for first_value, value in zip(first, row))
+    return list(kept.values())
+
+
+# --- Schéma typé --- #
+
+# Types compacts du jeu de données: catégories pour les colonnes à faible cardinalité (une valeur
+# par ligne devient un code entier), entiers réduits pour l'année, le prix et le kilométrage.
+CAR_CATEGORICAL_COLUMNS = ('fuel', 'seller_type', 'transmission', 'owner')
+CAR_INTEGER_COLUMNS = {'year': 'int16', 'selling_price': 'int32', 'km_driven': 'int32'}
+
+
+def _integer_target_dtype(series, dtype):
+    """Retourne le type entier cible d'une colonne (nullable si elle contient des NaN), ou None si ses valeurs n'y tiennent pas."""
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return None
+    values = series.dropna()
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max or not (values % 1 == 0).all()):
+        return None
+    return dtype if len(values) == len(series) else dtype.capitalize()
+
+
+def apply_car_schema(df, string_storage=None):
+    """Convertit un DataFrame de voitures vers le schéma compact.
+
+    Les colonnes absentes sont ignorées et une colonne dont les valeurs ne tiennent pas dans le type
+    cible est laissée telle quelle. string_storage='pyarrow' stocke aussi les noms en chaînes Arrow.
+    """
+    conversions = {}
+    for column in CAR_CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            conversions[column] = 'category'
+    for column, dtype in CAR_INTEGER_COLUMNS.items():
+        if column in df.columns:
+            target = _integer_target_dtype(df[column], dtype)
+            if target is not None and str(df[column].dtype) != target:
+                conversions[column] = target
+    if string_storage and 'name' in df.columns:
+        conversions['name'] = f'string[{string_storage}]'
+    return df.astype(conversions) if conversions else df
+
+
+def set_car_value(df, index, column, value):
+    """Affecte df.loc[index, column] en élargissant le type de la colonne si le schéma compact ne peut pas contenir la valeur."""
+    series = df[column]
+    is_missing = value is None or (isinstance(value, float) and np.isnan(value))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if not is_missing and value not in series.cat.categories:
+            df[column] = series.cat.add_categories([value])
+    elif pd.api.types.is_integer_dtype(series.dtype):
+        # Les entiers nullables (Int16…) exposent leur type numpy via numpy_dtype.
+        info = np.iinfo(getattr(series.dtype, 'numpy_dtype', series.dtype))
+        if is_missing:
+            df[column] = series.astype(f"Int{info.bits}")
+        elif isinstance(value, float):
+            df[column] = series.astype('float64')
+        elif not isinstance(value, (int, np.integer)) or isinstance(value, bool):
+            df[column] = series.astype(object)
+        elif not info.min <= value <= info.max:
+            df[column] = series.astype('Int64' if series.hasnans else 'int64')
+    df.loc[index, column] = value
+
+
+def concat_car_rows(df, rows_df):
+    """Concatène des lignes à un DataFrame de voitures en conservant les types de ses colonnes (catégories, entiers compacts)."""
+    # Les colonnes entièrement vides sont complétées par concat (évite d'en déduire un type).
+    rows_df = rows_df.dropna(axis=1, how='all')
+    if df.empty:
+        # Aucun bloc vide passé à concat (FutureWarning de pandas): les lignes seules, dans l'ordre des colonnes de df.
+        columns = list(df.columns) + [column for column in rows_df.columns if column not in df.columns]
+        combined = rows_df.reindex(columns=columns).reset_index(drop=True)
+    else:
+        combined = pd.concat([df, rows_df], ignore_index=True)
+    conversions = {}
+    for column, dtype in df.dtypes.items():
+        if combined[column].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            conversions[column] = 'category'
+        elif pd.api.types.is_integer_dtype(dtype):
+            target = _integer_target_dtype(combined[column], str(dtype).lower())
+            if target is not None:
+                conversions[column] = target
+    return combined.astype(conversions) if conversions else combined
+
+
+# --- Écritures atomiques et verrou inter-processus --- #
+
+@contextmanager
+def file_lock(path):
+    """Verrou consultatif exclusif sur '<path>.lock', partagé par tous les processus qui écrivent path."""
+    with open(f"{path}.lock", 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError: # LK_LOCK abandonne après 10 tentatives: on attend encore
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _fsync_path(path, directory=False):
+    if directory and os.name != 'posix':
+        return # Pas de fsync de dossier sous Windows: le renommage y est journalisé par NTFS.
+    fd = os.open(path, os.O_RDONLY if directory else os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_replace(path, write):
+    """Remplace path par le fichier que write(temp_path) écrit à côté: fsync, os.replace, puis fsync du dossier.
+
+    Un lecteur voit toujours soit l'ancien fichier complet, soit le nouveau; après un arrêt brutal
+    il ne reste au pire qu'un fichier temporaire orphelin.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(temp_path)
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        _fsync_path(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_path(os.path.dirname(os.path.abspath(path)), directory=True)
+
 
 # --- CSV Implementation --- #
 
 # Single Responsibility Principle (SRP)
 # CsvDataSource: Gère spécifiquement la lecture/écriture des fichiers CSV.
 class CsvDataSource(DataSource):
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, typed_schema=True, string_storage=None, instrumentation=None):
         if file_path is None:
             self.file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'car_dataset.csv'))
         else:
             self.file_path = file_path
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        # typed_schema: applique le schéma compact (voir apply_car_schema) à chaque chargement.
+        self.typed_schema = typed_schema
+        self.string_storage = string_storage
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+
+    @contextmanager
+    def locked(self):
+        """Sérialise les écrivains du fichier: threads de ce processus puis autres processus (réentrant)."""
+        with self._thread_lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1:
+                    with file_lock(self.file_path):
+                        yield
+                else:
+                    yield
+            finally:
+                self._lock_depth -= 1
+
+    def _read_csv(self):
+        if not self.typed_schema:
+            return pd.read_csv(self.file_path)
+        # Les catégories sont construites pendant l'analyse, sans passer par des colonnes d'objets str.
+        header = self.read_header()
+        dtypes = {column: 'category' for column in CAR_CATEGORICAL_COLUMNS if column in header}
+        return self._apply_schema(pd.read_csv(self.file_path, dtype=dtypes))
+
+    def _apply_schema(self, df):
+        return apply_car_schema(df, self.string_storage) if self.typed_schema else df
+
+    def _count_io(self, operation, rows, size):
+        self.instrumentation.count(f"csv.{operation}.rows", rows)
+        self.instrumentation.count(f"csv.{operation}.bytes", size)
+
+    def _file_size(self):
+        try:
+            return os.path.getsize(self.file_path)
+        except OSError:
+            return 0
 
     def load_data(self):
         try:
-            return pd.read_csv(self.file_path)
+            with self.instrumentation.timer('csv.parse'):
+                df = self._read_csv()
+            if self.instrumentation.enabled:
+                self._count_io('read', len(df), self._file_size())
+            return df
         except FileNotFoundError:
-            print(f"Erreur: Le fichier {self.file_path} n'a pas été trouvé.")
+            self.instrumentation.error('csv.load_data', f"Erreur: Le fichier {self.file_path} n'a pas été trouvé.")
             return pd.DataFrame()
         except Exception as e:
-            print(f"Erreur lors du chargement des données CSV: {e}")
+            self.instrumentation.error('csv.load_data', f"Erreur lors du chargement des données CSV: {e}")
             return pd.DataFrame()
 
     def save_data(self, df):
         try:
-            df.to_csv(self.file_path, index=False)
-            print("Données CSV sauvegardées avec succès.")
+            # Fichier temporaire puis renommage: un lecteur ne voit jamais un CSV à moitié écrit.
+            with self.locked(), self.instrumentation.timer('csv.write'):
+                atomic_replace(self.file_path, lambda temp_path: df.to_csv(temp_path, index=False))
+            if self.instrumentation.enabled:
+                self._count_io('write', len(df), self._file_size())
+            self.instrumentation.info('csv.save_data', "Données CSV sauvegardées avec succès.", path=self.file_path, rows=len(df))
+            return True
         except Exception as e:
-            print(f"Erreur lors de la sauvegarde des données CSV: {e}")
+            self.instrumentation.error('csv.save_data', f"Erreur lors de la sauvegarde des données CSV: {e}")
+            return False
+
+    def iter_chunks(self, chunk_size):
+        # read_csv(chunksize=…) ne garde qu'une tranche en mémoire; l'index reste continu d'une tranche à l'autre.
+        try:
+            with pd.read_csv(self.file_path, chunksize=chunk_size) as reader:
+                for chunk in reader:
+                    self.instrumentation.count('csv.read.rows', len(chunk))
+                    yield self._apply_schema(chunk)
+        except FileNotFoundError:
+            self.instrumentation.error('csv.iter_chunks', f"Erreur: Le fichier {self.file_path} n'a pas été trouvé.")
+
+    def row_count(self):
+        # Seule la première colonne est analysée: bien moins coûteux qu'un chargement complet.
+        try:
+            with pd.read_csv(self.file_path, usecols=[0], chunksize=100000) as reader:
+                return sum(len(chunk) for chunk in reader)
+        except (FileNotFoundError, ValueError, pd.errors.EmptyDataError):
+            return 0
+
+    def columns(self):
+        return self.read_header()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def data_version(self):
+        # Toute écriture du fichier change sa signature (mtime, taille).
+        return self._file_signature()
+
+    def read_header(self):
+        """Lit uniquement l'en-tête du fichier CSV (liste vide si le fichier est absent ou vide)."""
+        try:
+            with open(self.file_path, newline='') as f:
+                return next(csv.reader(f), [])
+        except FileNotFoundError:
+            return []
+
+# Open/Closed Principle (OCP)
+# CachedCsvDataSource: Étend CsvDataSource avec un cache mémoire du DataFrame.
+# Le fichier n'est relu que si sa signature (mtime, taille) a changé depuis le dernier chargement.
+class CachedCsvDataSource(CsvDataSource):
+    def __init__(self, file_path=None, typed_schema=True, string_storage=None, instrumentation=None):
+        super().__init__(file_path, typed_schema, string_storage, instrumentation)
+        self._cache = None
+        self._signature = None
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+
+    def _get_frame(self):
+        signature = self._file_signature()
+        if self._cache is not None and signature is not None and signature == self._signature:
+            self.hits += 1
+            self.instrumentation.count('csv.cache.hits')
+            return self._cache
+        self.misses += 1
+        self.instrumentation.count('csv.cache.misses')
+        self.version += 1
+        df = super().load_data()
+        # Une lecture en échec (fichier absent ou illisible) n'est pas mise en cache.
+        if signature is not None and signature == self._file_signature():
+            self._cache = df
+            self._signature = signature
+        else:
+            self.invalidate()
+        return df
+
+    def load_data(self):
+        # Copie défensive: l'appelant peut modifier le DataFrame sans corrompre le cache.
+        return self._get_frame().copy()
+
+    def peek_data(self):
+        return self._get_frame()
+
+    def row_count(self):
+        # Nombre de lignes mis en cache avec le DataFrame: O(1) tant que le fichier n'a pas changé.
+        return len(self._get_frame())
+
+    def iter_chunks(self, chunk_size):
+        if self._cache is not None and self._file_signature() == self._signature:
+            # Tranches du DataFrame en cache (peek_data compte le succès).
+            yield from DataSource.iter_chunks(self, chunk_size)
+        else:
+            # Cache froid: lecture en flux sans charger tout le fichier (le cache n'est pas alimenté).
+            yield from super().iter_chunks(chunk_size)
+
+    def save_data(self, df):
+        # La signature est relue sous le verrou: aucun autre écrivain ne peut s'intercaler avant la mise en cache.
+        with self.locked():
+            saved = super().save_data(df)
+            signature = self._file_signature()
+        if not saved or signature is None:
+            self.invalidate()
+            return saved
+        # Écriture traversante: le cache reflète ce qui vient d'être écrit, sans relecture.
+        self._cache = df.copy()
+        self._signature = signature
+        self.version += 1
+        return saved
+
+    def invalidate(self):
+        """Vide le cache; le prochain accès relira le fichier."""
+        self._cache = None
+        self._signature = None
+        self.version += 1
+
+    def data_version(self):
+        return self.version
+
+    def cache_stats(self):
+        """Retourne les compteurs de succès/échecs du cache."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+def tokenize_name(text):
+    """Découpe un nom en jetons minuscules sans accents (même découpage que le tokenizer FTS5 unicode61)."""
+    normalized = unicodedata.normalize('NFKD', str(text).lower())
+    normalized = ''.join(char for char in normalized if not unicodedata.combining(char))
+    return re.findall(r'\w+', normalized)
+
+
+# Single Responsibility Principle (SRP)
+# NameTokenIndex: Index inversé en mémoire (jeton -> positions des lignes) pour la recherche par nom.
+class NameTokenIndex:
+    def __init__(self, names):
+        self.postings = {}
+        self.token_counts = []
+        for position, name in enumerate(names):
+            tokens = tokenize_name(name) if isinstance(name, str) else []
+            self.token_counts.append(len(tokens))
+            for token in set(tokens):
+                self.postings.setdefault(token, []).append(position)
+        self.sorted_tokens = sorted(self.postings)
+
+    def _prefix_matches(self, prefix):
+        """Retourne les positions des lignes contenant un jeton commençant par prefix."""
+        positions = set()
+        start = bisect.bisect_left(self.sorted_tokens, prefix)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            positions.update(self.postings[token])
+        return positions
+
+    def search(self, query):
+        """Retourne les positions des lignes contenant tous les jetons de query (en préfixe), triées par pertinence.
+
+        Retourne None si la requête ne contient aucun jeton.
+        """
+        tokens = tokenize_name(query)
+        if not tokens:
+            return None
+        matches = None
+        for token in tokens:
+            token_matches = self._prefix_matches(token)
+            matches = token_matches if matches is None else matches & token_matches
+            if not matches:
+                return []
+        exact_tokens = [set(self.postings.get(token, ())) for token in tokens]
+
+        # Pertinence: correspondances exactes d'abord, puis les noms les plus courts (les plus spécifiques).
+        def relevance(position):
+            exact = sum(1 for postings in exact_tokens if position in postings)
+            return (-exact, self.token_counts[position], position)
+        return sorted(matches, key=relevance)
+
+
+def _json_value(value):
+    # Valeurs numpy (np.int64…) issues des DataFrames: converties en types Python pour json.dumps.
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Valeur non sérialisable dans le journal: {value!r}")
+
 
 # Liskov Substitution Principle (LSP) & Dependency Inversion Principle (DIP)
 # CsvCarRepository dépend de l'abstraction DataSource, pas d'une implémentation concrète.
 class CsvCarRepository(CarRepository):
-    def __init__(self, data_source: DataSource):
+    metrics_prefix = 'csv'
+
+    # Les voitures CSV portent un id persistant (colonne 'id'); un index en mémoire id → position donne
+    # get/update/delete en O(1). Les créations, mises à jour et suppressions sont ajoutées à un journal
+    # ('<csv>.journal', une opération JSON par ligne) et appliquées au DataFrame en mémoire; le CSV n'est
+    # réécrit qu'au flush, après flush_threshold opérations ou flush_interval secondes. Au démarrage,
+    # les opérations encore présentes dans le journal sont rejouées.
+    # Plusieurs processus peuvent écrire le même CSV: le journal est partagé, chaque écriture (attribution
+    # des ids comprise) et chaque flush se font sous le verrou du fichier, après lecture des opérations
+    # journalisées par les autres processus. Un flush renouvelle la génération du journal: les autres
+    # processus savent alors que le CSV a été réécrit et le rechargent.
+    # dedup_key: colonnes de la clé de doublon, indexées en mémoire (DuplicateIndex); on_duplicate: traitement par défaut.
+    def __init__(self, data_source: DataSource, flush_threshold=1000, flush_interval=30.0, instrumentation=None,
+                 dedup_key=None, on_duplicate='skip'):
         self.data_source = data_source
+        # Par défaut, celle de la source: événements et métriques de la source et du dépôt au même endroit.
+        self.instrumentation = data_source.instrumentation if instrumentation is None else instrumentation
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        file_path = getattr(data_source, 'file_path', None)
+        # Sans fichier pour le journal, les opérations ne seraient pas durables: flush à chaque écriture.
+        self.journal_path = f"{file_path}.journal" if file_path else None
+        self._df = None           # DataFrame de travail: la source + les opérations du journal
+        self._df_version = None   # data_version de la source au chargement de _df
+        self._frame_version = 0   # change quand les positions ou les noms de _df changent
+        self._id_index = {}       # id → position dans _df
+        self._pending_rows = {}   # créations pas encore concaténées à _df (id → ligne)
+        self._deleted = set()     # ids de _df supprimés, retirés du fichier au flush
+        self._next_id = 0
+        self._version = 0         # change à chaque opération et à chaque rechargement (voir data_version)
+        self._first_entry_at = None
+        self._name_index = None
+        self._name_index_version = None
+        self._summaries = {}      # tables de synthèse en mémoire (nom → SummaryTable)
+        self.dedup_key = normalize_duplicate_key(dedup_key) if dedup_key is not None else None
+        self.on_duplicate = check_duplicate_policy(on_duplicate) if self.dedup_key else 'allow'
+        self._duplicates = DuplicateIndex(self.dedup_key) if self.dedup_key else None
+        self._lock_depth = 0
+        self._entries = []        # opérations du journal pas encore écrites dans le CSV (tous processus confondus)
+        self._id_floor = 0        # plancher des ids laissé par le dernier flush (ids supprimés jamais réattribués)
+        self._journal_synced = False
+        self._journal_generation = None  # génération du journal lu (renouvelée à chaque flush)
+        self._journal_signature = None   # (inode, taille, mtime) du journal à sa dernière lecture
+        with self._locked():
+            self._sync_journal()
+        if self._entries:
+            self.instrumentation.info('csv.journal', f"{len(self._entries)} opérations du journal CSV seront rejouées.",
+                                      path=self.journal_path, operations=len(self._entries))
+        self._ensure_id_column()
 
-    def create_car(self, new_car_data):
-        df = self.data_source.load_data()
-        new_car_df = pd.DataFrame([new_car_data])
-        df = pd.concat([df, new_car_df], ignore_index=True)
-        self.data_source.save_data(df)
-        print("Nouvelle voiture ajoutée au CSV.")
-        if not df.empty:
-            return df.iloc[-1].to_dict()
-        return None
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Écrit les opérations en attente dans le CSV (et libère les ressources de la source, s'il y en a)."""
+        self.flush()
+        close = getattr(self.data_source, 'close', None)
+        if close is not None:
+            close()
+
+    def _ensure_id_column(self):
+        # Migration unique d'un CSV sans colonne 'id': les anciens index positionnels deviennent les ids.
+        with self._locked():
+            header = self.data_source.columns()
+            if not header or 'id' in header:
+                return
+            df = self.data_source.load_data()
+            df.insert(0, 'id', np.arange(len(df), dtype='int64'))
+            if self.data_source.save_data(df) is not False:
+                self.instrumentation.info('csv.ensure_id_column', "Colonne 'id' ajoutée au CSV (les ids reprennent les anciens index).")
+
+    @contextmanager
+    def _locked(self):
+        """Sérialise les écrivains du CSV et de son journal: threads puis processus (réentrant).
+
+        Verrou de la source (CsvDataSource.locked) s'il existe, sinon verrou consultatif sur le journal.
+        """
+        locked = getattr(self.data_source, 'locked', None)
+        if locked is not None:
+            with locked():
+                yield
+            return
+        self._lock_depth += 1
+        try:
+            if self._lock_depth == 1 and self.journal_path is not None:
+                with file_lock(self.journal_path):
+                    yield
+            else:
+                yield
+        finally:
+            self._lock_depth -= 1
+
+    # --- Journal --- #
+
+    def _journal_stat(self):
+        try:
+            stat = os.stat(self.journal_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _read_journal(self):
+        """Lit le journal: (génération, plancher des ids laissé par le dernier flush, opérations depuis ce flush)."""
+        generation, id_floor, entries = None, 0, []
+        if not os.path.exists(self.journal_path):
+            return generation, id_floor, entries
+        torn = False
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernière ligne interrompue par un arrêt brutal: l'opération n'a jamais été confirmée.
+                    torn = True
+                    continue
+                if entry['op'] == 'checkpoint':
+                    id_floor = max(id_floor, entry['next_id'])
+                    generation = entry.get('generation', generation)
+                else:
+                    entries.append(entry)
+        if torn:
+            self.instrumentation.warning('csv.journal', "Attention: Une entrée incomplète du journal CSV a été ignorée.")
+            self._write_journal(entries, id_floor, generation)
+        return generation, id_floor, entries
+
+    def _write_journal(self, entries, id_floor, generation=None):
+        """Remplace le journal (atomiquement: toujours soit l'ancien, soit le nouveau); retourne sa génération.
+
+        generation None: nouvelle génération, à utiliser quand le CSV vient d'être réécrit.
+        """
+        generation = generation or os.urandom(8).hex()
+
+        def write(temp_path):
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for entry in [{'op': 'checkpoint', 'next_id': id_floor, 'generation': generation}] + entries:
+                    f.write(json.dumps(entry, default=_json_value) + '\n')
+        atomic_replace(self.journal_path, write)
+        return generation
+
+    def _sync_journal(self):
+        """Reporte les opérations journalisées par les autres processus depuis la dernière lecture (sous _locked)."""
+        if self.journal_path is None:
+            return
+        generation, id_floor, entries = self._read_journal()
+        self._id_floor = max(self._id_floor, id_floor)
+        self._next_id = max(self._next_id, self._id_floor)
+        if not self._journal_synced or generation != self._journal_generation:
+            # Premier chargement, ou journal remplacé par le flush d'un autre processus: ce flush a écrit dans le
+            # CSV toutes les opérations connues jusque-là. Le CSV est rechargé et le nouveau journal y est rejoué.
+            self._entries = entries
+            self._df = None
+        else:
+            # Même génération: le journal n'a fait que s'allonger (les écritures se font sous le verrou).
+            new_entries = entries[len(self._entries):]
+            self._entries.extend(new_entries)
+            if self._df is not None:
+                for entry in new_entries:
+                    self._apply(entry)
+            if new_entries:
+                self._version += 1
+        # Délai de flush_interval compté depuis la lecture des opérations reportées (autres processus, redémarrage).
+        if not self._entries:
+            self._first_entry_at = None
+        elif self._first_entry_at is None:
+            self._first_entry_at = time.monotonic()
+        self._journal_generation = generation
+        self._journal_signature = self._journal_stat()
+        self._journal_synced = True
 
+    def _log(self, entries):
+        """Ajoute des opérations au journal puis les applique au DataFrame en mémoire (sous _locked)."""
+        if self.journal_path is not None:
+            try:
+                with self.instrumentation.timer('csv.journal.append'):
+                    if self._journal_signature is None:
+                        # Pas encore de journal: il commence par le point de reprise (plancher des ids, génération).
+                        self._journal_generation = self._write_journal(entries, self._id_floor, self._journal_generation)
+                        size = os.path.getsize(self.journal_path)
+                    else:
+                        with open(self.journal_path, 'a', encoding='utf-8') as f:
+                            size = f.write(''.join(json.dumps(entry, default=_json_value) + '\n' for entry in entries))
+                self._journal_signature = self._journal_stat()
+                self.instrumentation.count('csv.journal.bytes', size)
+            except (OSError, TypeError) as e:
+                self.instrumentation.error('csv.journal', f"Erreur lors de l'écriture du journal CSV: {e}")
+                return False
+        for entry in entries:
+            self._apply(entry)
+        self._version += 1
+        self._entries.extend(entries)
+        if self._first_entry_at is None:
+            self._first_entry_at = time.monotonic()
+        return True
+
+    def _indexes(self):
+        # Structures maintenues opération par opération: tables de synthèse et index des doublons.
+        indexes = list(self._summaries.values())
+        if self._duplicates is not None:
+            indexes.append(self._duplicates)
+        return indexes
+
+    def _apply(self, entry):
+        indexes = self._indexes()
+        if not indexes:
+            return self._apply_entry(entry)
+        # La voiture est retirée des index avant l'opération puis remise après (O(1)).
+        before = self._car(entry['id'])
+        self._apply_entry(entry)
+        after = self._car(entry['id'])
+        for index in indexes:
+            index.add(before, -1)
+            index.add(after, 1)
+
+    def _apply_entry(self, entry):
+        # Rejouer une opération déjà appliquée au fichier (flush interrompu avant la remise à zéro du journal) est sans effet.
+        car_id = entry['id']
+        if entry['op'] == 'create':
+            if car_id not in self._id_index and car_id not in self._pending_rows:
+                self._pending_rows[car_id] = self._with_id(car_id, entry['data'])
+            self._next_id = max(self._next_id, car_id + 1)
+        elif entry['op'] == 'update':
+            if car_id in self._pending_rows:
+                self._pending_rows[car_id].update(entry['data'])
+            elif self._position(car_id) is not None:
+                position = self._id_index[car_id]
+                for key, value in entry['data'].items():
+                    if key in self._df.columns:
+                        set_car_value(self._df, self._df.index[position], key, value)
+                if 'name' in entry['data']:
+                    self._frame_version += 1
+        elif entry['op'] == 'delete':
+            # Id absent du fichier (ligne déjà retirée par le flush interrompu): ne rien marquer, count() resterait faux.
+            if self._pending_rows.pop(car_id, None) is None and car_id in self._id_index:
+                self._deleted.add(car_id)
+
+    def _maybe_flush(self):
+        if not self._entries:
+            return
+        if (self.journal_path is None or len(self._entries) >= self.flush_threshold
+                or (self.flush_interval is not None and time.monotonic() - self._first_entry_at >= self.flush_interval)):
+            self.flush()
+
+    def flush(self):
+        """Réécrit le CSV avec les opérations du journal (voitures supprimées retirées) puis vide le journal."""
+        if not self._entries:
+            return True
+        # Rechargement, report des opérations des autres processus, écriture et remise à zéro du journal sous un
+        # même verrou: aucun autre écrivain ne peut journaliser une opération que ce flush effacerait.
+        with self.instrumentation.timer('csv.flush'), self._locked():
+            self._state()
+            if not self._entries:
+                return True  # Déjà écrites par le flush d'un autre processus.
+            df = self._without_deleted(self._materialized()).reset_index(drop=True)
+            if self.data_source.save_data(df) is False:
+                return False
+            applied = len(self._entries)
+            # Le CSV est écrit avant le journal: si l'arrêt survient entre les deux, rejouer le journal est sans effet.
+            self._id_floor = max(self._id_floor, self._next_id)
+            self._entries = []
+            self._first_entry_at = None
+            if self.journal_path is not None:
+                self._journal_generation = self._write_journal([], self._id_floor)
+                self._journal_signature = self._journal_stat()
+            self._set_frame(df, self.data_source.data_version())
+        self.instrumentation.count('csv.flush.operations', applied)
+        self.instrumentation.info('csv.flush', f"Journal CSV appliqué: {applied} opérations écrites dans le fichier.",
+                                  operations=applied, rows=len(df))
+        return True
+
+    # --- DataFrame de travail --- #
+
+    def _set_frame(self, df, version):
+        with self.instrumentation.timer('csv.id_index'):
+            self._build_frame(df, version)
+
+    def _build_frame(self, df, version):
+        ids = pd.to_numeric(df['id'], errors='coerce') if 'id' in df.columns else pd.Series(dtype='float64')
+        valid = ids.notna().to_numpy()
+        id_values = ids.to_numpy()[valid].astype('int64')
+        self._df = df
+        self._df_version = version
+        self._frame_version += 1
+        self._version += 1
+        self._id_index = dict(zip(id_values.tolist(), np.flatnonzero(valid).tolist()))
+        self._pending_rows = {}
+        self._deleted = set()
+        self._next_id = max(int(id_values.max()) + 1 if len(id_values) else 0, self._id_floor)
+
+    def _refresh_journal(self):
+        # Journal modifié par un autre processus depuis sa dernière lecture: ses opérations sont reportées.
+        if self.journal_path is not None and self._journal_stat() != self._journal_signature:
+            with self._locked():
+                self._sync_journal()
+
+    def _state(self):
+        self._refresh_journal()
+        # Le DataFrame n'est rechargé que si la source signale un changement externe; le journal y est alors rejoué.
+        version = self.data_source.data_version()
+        if self._df is None or version is None or version != self._df_version:
+            self._set_frame(self.data_source.load_data(), version)
+            for index in self._indexes():
+                index.build(self._df)
+            for entry in self._entries:
+                self._apply(entry)
+
+    def _materialized(self):
+        """Retourne le DataFrame de travail, les créations en attente y étant concaténées (une seule fois par lot)."""
+        self._state()
+        if self._pending_rows:
+            self.instrumentation.count('csv.materialize.rows', len(self._pending_rows))
+            start = len(self._df)
+            car_ids = list(self._pending_rows)
+            self._df = concat_car_rows(self._df, pd.DataFrame(list(self._pending_rows.values())))
+            self._id_index.update(zip(car_ids, range(start, start + len(car_ids))))
+            self._pending_rows = {}
+            self._frame_version += 1
+        return self._df
+
+    def _position(self, car_id):
+        # Position dans _df, None si l'id est inconnu, supprimé ou pas encore concaténé.
+        if car_id in self._deleted:
+            return None
+        return self._id_index.get(car_id)
+
+    def _without_deleted(self, df):
+        if not self._deleted or df.empty or 'id' not in df.columns:
+            return df
+        return df[~df['id'].isin(self._deleted)]
+
+    def _can_push_down(self):
+        # La source ne connaît pas les opérations encore dans le journal: filtrage à la lecture seulement s'il est vide.
+        return self.data_source.supports_filters and not self._entries
+
+    def _get_name_index(self, df):
+        # L'index est reconstruit uniquement si les noms ou les positions du DataFrame de travail ont changé.
+        if self._name_index is None or self._frame_version != self._name_index_version:
+            with self.instrumentation.timer('csv.name_index'):
+                self._name_index = NameTokenIndex(df['name'])
+            self._name_index_version = self._frame_version
+        return self._name_index
+
+    @staticmethod
+    def _with_id(car_id, car_data):
+        return {'id': car_id, **{key: value for key, value in car_data.items() if key != 'id'}}
+
+    def _update_data(self, updated_car_data):
+        columns = self._df.columns
+        data = {}
+        for key, value in updated_car_data.items():
+            if key == 'id':
+                self.instrumentation.warning('csv.update_data', "Attention: L'id d'une voiture CSV n'est pas modifiable.")
+            elif key in columns:
+                data[key] = value
+            else:
+                self.instrumentation.warning('csv.update_data', f"Attention: La colonne CSV '{key}' n'existe pas et n'a pas été mise à jour.")
+        return data
+
+    def _car(self, car_id):
+        if car_id in self._pending_rows:
+            # Toutes les colonnes, comme une ligne du fichier (ou de SQLite): None pour les champs non renseignés.
+            return {**dict.fromkeys(self._df.columns), **self._pending_rows[car_id]}
+        position = self._position(car_id)
+        if position is None:
+            return None
+        return self._df.iloc[position].to_dict()
+
+    # --- CarRepository --- #
+
+    @instrumented('create_car')
+    def create_car(self, new_car_data, on_duplicate=None):
+        return self.create_cars([new_car_data], on_duplicate)[0]
+
+    @instrumented('get_all_cars')
     def get_all_cars(self):
-        return self.data_source.load_data()
+        return self._without_deleted(self._materialized()).copy()
 
-    def get_car_by_id(self, index): # Pour CSV, l'ID est l'index
-        df = self.data_source.load_data()
-        if not df.empty and 0 <= index < len(df):
-            return df.iloc[index].to_dict()
-        return None
+    def iter_cars(self, chunk_size=1000, as_frames=True):
+        if self._entries:
+            df = self._without_deleted(self._materialized())
+            chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+        else:
+            # Journal vide: la source est à jour et peut être parcourue en flux.
+            chunks = self.data_source.iter_chunks(chunk_size)
+        for chunk in chunks:
+            if as_frames:
+                yield chunk
+            else:
+                yield from chunk.to_dict('records')
 
-    def update_car(self, index, updated_car_data): # Pour CSV, l'ID est l'index
-        df = self.data_source.load_data()
-        if not df.empty and 0 <= index < len(df):
-            for key, value in updated_car_data.items():
-                if key in df.columns:
-                    df.loc[index, key] = value
+    @instrumented('get_cars_page')
+    def get_cars_page(self, after_id=None, limit=20):
+        df = self._materialized()
+        if df.empty or 'id' not in df.columns:
+            return df, None
+        # Les ids croissent dans l'ordre du fichier (attribués à la création, conservés par le flush).
+        start = 0 if after_id is None else int(np.searchsorted(df['id'].to_numpy(), after_id, side='right'))
+        # Une fenêtre de limit + len(deleted) + 1 lignes contient toujours la page et la ligne suivante éventuelle.
+        window = self._without_deleted(df.iloc[start:start + limit + len(self._deleted) + 1])
+        page = window.iloc[:limit]
+        next_after_id = int(page['id'].iloc[-1]) if len(window) > limit > 0 else None
+        return page, next_after_id
+
+    @instrumented('count')
+    def count(self):
+        self._refresh_journal()
+        if not self._entries and (self._df is None or self.data_source.data_version() != self._df_version):
+            # Rien en attente et DataFrame non chargé (ou périmé): nombre de lignes lu par la source, sans
+            # chargement complet (en-tête de colonne CSV, métadonnées Parquet, DataFrame en cache).
+            return self.data_source.row_count()
+        self._state()
+        return len(self._id_index) - len(self._deleted) + len(self._pending_rows)
+
+    @instrumented('exists')
+    def exists(self, car_id):
+        self._state()
+        return car_id in self._pending_rows or self._position(car_id) is not None
+
+    def columns(self):
+        if self._entries:
+            return list(self._materialized().columns)
+        return self.data_source.columns()
+
+    def data_version(self):
+        # Un changement externe du fichier est détecté (et rechargé) par _state().
+        self._state()
+        return self._version
+
+    @instrumented('get_car_by_id')
+    def get_car_by_id(self, car_id):
+        self._state()
+        return self._car(car_id)
+
+    @instrumented('update_car')
+    def update_car(self, car_id, updated_car_data):
+        return self.update_cars([(car_id, updated_car_data)])[0]
+
+    @instrumented('delete_car')
+    def delete_car(self, car_id):
+        return self.delete_cars([car_id])[0]
+
+    @instrumented('create_cars')
+    def create_cars(self, cars_data, on_duplicate=None):
+        cars_data = list(cars_data)
+        if not cars_data:
+            return []
+        policy = self._duplicate_policy(on_duplicate)
+        # Sous le verrou: les ids sont attribués après report des créations des autres processus (pas de collision).
+        with self._locked():
+            self._state()
+            entries = []
+            car_ids = {}      # position → id de la voiture créée ou de la voiture existante (doublon)
+            duplicates = {}   # position → id de la voiture existante
+            batch_keys = {}   # clé → id créé plus tôt dans le lot (pas encore dans l'index)
+            next_id = self._next_id
+            for position, car_data in enumerate(cars_data):
+                data = {key: value for key, value in car_data.items() if key != 'id'}
+                if policy != 'allow':
+                    key = self._duplicates.key_of(data)
+                    existing = batch_keys.get(key, self._duplicates.first.get(key))
+                    if existing is not None:
+                        car_ids[position] = duplicates[position] = existing
+                        if policy == 'merge':
+                            entries.append({'op': 'update', 'id': existing, 'data': self._update_data(merge_data(data))})
+                        continue
+                    batch_keys[key] = next_id
+                car_ids[position] = next_id
+                entries.append({'op': 'create', 'id': next_id, 'data': data})
+                next_id += 1
+            if entries and not self._log(entries):
+                return [None] * len(cars_data)
+            results = [None if policy == 'report' and position in duplicates else self._car(car_ids[position])
+                       for position in range(len(cars_data))]
+        created = [car_ids[position] for position in car_ids if position not in duplicates]
+        if created:
+            self.instrumentation.info('csv.create_cars', "Nouvelle voiture ajoutée au CSV." if len(created) == 1 else f"{len(created)} nouvelles voitures ajoutées au CSV.",
+                                      ids=created)
+        if duplicates:
+            self._report_duplicates(policy, len(duplicates), duplicate_of=list(duplicates.values()))
+        self._maybe_flush()
+        return results
+
+    def _report_duplicates(self, policy, count, **fields):
+        self.instrumentation.count(f"csv.duplicates.{policy}", count)
+        self.duplicate_count += count
+        event = self.instrumentation.warning if policy == 'report' else self.instrumentation.info
+        event('csv.duplicates', f"{count} doublons CSV ({', '.join(self.dedup_key)}) {DUPLICATE_ACTIONS[policy]}.",
+              policy=policy, **fields)
+
+    @instrumented('update_cars')
+    def update_cars(self, updates):
+        items = _update_items(updates)
+        with self._locked():
+            self._state()
+            entries = []
+            for car_id, updated_car_data in items:
+                if not self.exists(car_id):
+                    self.instrumentation.warning('csv.update_cars', f"Aucune voiture d'ID CSV {car_id} pour la mise à jour.", id=car_id)
+                    continue
+                entries.append({'op': 'update', 'id': car_id, 'data': self._update_data(updated_car_data)})
+            if not entries or not self._log(entries):
+                return [None] * len(items)
+            updated_ids = {entry['id'] for entry in entries}
+            results = [self._car(car_id) if car_id in updated_ids else None for car_id, _ in items]
+        self.instrumentation.info('csv.update_cars', f"Voiture CSV d'ID {entries[0]['id']} mise à jour." if len(entries) == 1 else f"{len(updated_ids)} voitures CSV mises à jour.",
+                                  ids=sorted(updated_ids))
+        self._maybe_flush()
+        return results
+
+    @instrumented('delete_cars')
+    def delete_cars(self, car_ids):
+        car_ids = list(car_ids)
+        with self._locked():
+            self._state()
+            deleted = {}
+            for car_id in car_ids:
+                car = self._car(car_id)
+                if car is not None and car_id not in deleted:
+                    deleted[car_id] = car
+            if not deleted or not self._log([{'op': 'delete', 'id': car_id} for car_id in deleted]):
+                return [None] * len(car_ids)
+        self.instrumentation.info('csv.delete_cars', f"Voiture CSV d'ID {next(iter(deleted))} supprimée." if len(deleted) == 1 else f"{len(deleted)} voitures CSV supprimées.",
+                                  ids=list(deleted))
+        self._maybe_flush()
+        return [deleted.get(car_id) for car_id in car_ids]
+
+    @instrumented('query_cars')
+    def query_cars(self, predicates=None, order_by=None, limit=None, offset=0):
+        try:
+            predicates, order = normalize_query(predicates, order_by, limit, offset, self.columns())
+        except ValueError as e:
+            self.instrumentation.warning('csv.query_cars', str(e))
+            return pd.DataFrame()
+        if self._can_push_down() and not any(
+                column == 'name' and operator == 'contains' for column, operator, _ in predicates):
+            # Push-down: la source ne matérialise que les lignes retenues (la recherche par nom reste sur l'index de jetons).
+            df = self.data_source.load_data(filters=predicates)
+            predicates = []
+        else:
+            df = self._materialized()
+        if df.empty:
+            return df.copy()
+
+        # Tous les critères sont combinés en un seul masque booléen vectorisé (voitures supprimées exclues).
+        mask = np.ones(len(df), dtype=bool)
+        if self._deleted and 'id' in df.columns:
+            mask &= ~df['id'].isin(self._deleted).to_numpy()
+        try:
+            for column, operator, value in predicates:
+                if operator == 'contains' and column == 'name' and self._get_name_index(df).search(value) is not None:
+                    name_mask = np.zeros(len(df), dtype=bool)
+                    name_mask[self._get_name_index(df).search(value)] = True
+                    mask &= name_mask
                 else:
-                    print(f"Attention: La colonne CSV '{key}' n'existe pas et n'a pas été mise à jour.")
-            self.data_source.save_data(df)
-            print(f"Voiture à l'index CSV {index} mise à jour.")
-            return df.iloc[index].to_dict()
-        return None
+                    mask &= predicate_mask(df[column], operator, value)
+        except TypeError as e:
+            self.instrumentation.warning('csv.query_cars', f"Critère incompatible avec le type des données CSV: {e}")
+            return pd.DataFrame()
 
-    def delete_car(self, index): # Pour CSV, l'ID est l'index
-        df = self.data_source.load_data()
-        if not df.empty and 0 <= index < len(df):
-            car_deleted = df.iloc[index].to_dict()
-            df = df.drop(index).reset_index(drop=True)
-            self.data_source.save_data(df)
-            print(f"Voiture à l'index CSV {index} supprimée.")
-            return car_deleted
-        return None
+        result_df = df[mask]
+        # Un tri stable par clé, de la dernière à la première: valeurs manquantes en premier en ordre croissant,
+        # en dernier en ordre décroissant (comme NULL dans ORDER BY SQLite).
+        for column, descending in reversed(order):
+            result_df = result_df.sort_values(column, ascending=not descending,
+                                              na_position='last' if descending else 'first', kind='stable')
+        end = None if limit is None else offset + limit
+        return result_df.iloc[offset:end]
+
+    @instrumented('aggregate')
+    def aggregate(self, group_by=None, metrics=None, predicates=None, bands=None):
+        try:
+            group_by, metrics, predicates, bands = normalize_aggregate(group_by, metrics, predicates, bands, self.columns())
+        except ValueError as e:
+            self.instrumentation.warning('csv.aggregate', str(e))
+            return pd.DataFrame()
+        summary_name = find_summary(self.summaries(), group_by, metrics, predicates, bands)
+        if summary_name is not None:
+            self._state()
+            self.instrumentation.count('csv.aggregate.summary_hits')
+            return self._summaries[summary_name].to_frame(group_by, metrics)
+        if self._can_push_down() and self.data_source.supports_aggregate:
+            return self.data_source.aggregate(group_by, metrics, predicates, bands)
+        df = self.query_cars(predicates) if predicates else self._without_deleted(self._materialized())
+        if df.empty and predicates:
+            df = self._materialized().iloc[:0]
+        try:
+            return aggregate_frame(df, group_by, metrics, bands)
+        except TypeError as e:
+            self.instrumentation.warning('csv.aggregate', f"Agrégation incompatible avec le type des données CSV: {e}")
+            return pd.DataFrame()
 
+    def summaries(self):
+        return {name: list(summary.group_by) for name, summary in self._summaries.items()}
+
+    def create_summary(self, name, group_by):
+        """Crée une table de synthèse en mémoire, tenue à jour à chaque opération (reconstruite au rechargement du fichier)."""
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+        invalid = [column for column in group_by if column not in self.columns() or column == 'id']
+        if not group_by or invalid or len(set(group_by)) != len(group_by):
+            self.instrumentation.warning('csv.create_summary', f"Colonnes de regroupement CSV invalides pour la synthèse '{name}': {group_by}")
+            return False
+        self._state()
+        summary = SummaryTable(group_by)
+        summary.build(self._without_deleted(self._materialized()))
+        self._summaries[name] = summary
+        return True
+
+    def drop_summary(self, name):
+        return self._summaries.pop(name, None) is not None
+
+    @instrumented('find_duplicates')
+    def find_duplicates(self, key=None):
+        key = normalize_duplicate_key(key or self.dedup_key or DUPLICATE_KEY)
+        return duplicate_groups(self._without_deleted(self._materialized()), key)
+
+    def _pushdown_search(self, attribute, value):
+        """search_cars délégué à une source qui filtre à la lecture (Parquet, Feather)."""
+        if attribute not in self.data_source.columns():
+            self.instrumentation.warning('csv.pushdown_search', f"L'attribut CSV '{attribute}' n'existe pas.")
+            return pd.DataFrame()
+        if self.data_source.is_numeric_column(attribute):
+            try:
+                numeric_value = float(value)
+            except ValueError:
+                self.instrumentation.warning('csv.pushdown_search', f"La valeur '{value}' n'est pas compatible avec le type de l'attribut CSV '{attribute}'.")
+                return pd.DataFrame()
+            predicate = (attribute, '=', int(numeric_value) if numeric_value.is_integer() else numeric_value)
+        else:
+            predicate = (attribute, 'contains', str(value))
+        return self.data_source.load_data(filters=[predicate])
+
+    @instrumented('search_cars')
     def search_cars(self, attribute, value):
-        df = self.data_source.load_data()
+        if self._can_push_down() and attribute != 'name':
+            return self._pushdown_search(attribute, value)
+        df = self._materialized()
         if df.empty:
-            print("La source de données CSV est vide.")
+            self.instrumentation.warning('csv.search_cars', "La source de données CSV est vide.")
             return pd.DataFrame()
 
         if attribute not in df.columns:
-            print(f"L'attribut CSV '{attribute}' n'existe pas.")
+            self.instrumentation.warning('csv.search_cars', f"L'attribut CSV '{attribute}' n'existe pas.")
             return pd.DataFrame()
 
         try:
+            is_categorical = isinstance(df[attribute].dtype, pd.CategoricalDtype)
             if pd.api.types.is_numeric_dtype(df[attribute]):
                 value_to_search = type(df[attribute].dropna().iloc[0])(value) if not df[attribute].dropna().empty else value
-            elif pd.api.types.is_string_dtype(df[attribute]):
+            elif pd.api.types.is_string_dtype(df[attribute]) or is_categorical:
                 value_to_search = str(value)
             else:
                 value_to_search = value
 
-            if pd.api.types.is_string_dtype(df[attribute]):
+            if attribute == 'name':
+                positions = self._get_name_index(df).search(value_to_search)
+                if positions is not None:
+                    return self._without_deleted(df.iloc[positions])
+            if is_categorical:
+                # Le motif est évalué une fois par catégorie, puis les lignes sont filtrées sur leurs codes.
+                categories = df[attribute].cat.categories
+                matching = categories[categories.astype(str).str.contains(value_to_search, case=False, na=False)]
+                result_df = df[df[attribute].isin(matching)]
+            elif pd.api.types.is_string_dtype(df[attribute]):
                 result_df = df[df[attribute].astype(str).str.contains(value_to_search, case=False, na=False)]
             else:
                 result_df = df[df[attribute] == value_to_search]
-            return result_df
+            return self._without_deleted(result_df)
         except ValueError:
-            print(f"La valeur '{value}' n'est pas compatible avec le type de l'attribut CSV '{attribute}'.")
+            self.instrumentation.warning('csv.search_cars', f"La valeur '{value}' n'est pas compatible avec le type de l'attribut CSV '{attribute}'.")
             return pd.DataFrame()
         except Exception as e:
-            print(f"Une erreur est survenue lors de la recherche CSV: {e}")
+            self.instrumentation.error('csv.search_cars', f"Une erreur est survenue lors de la recherche CSV: {e}")
             return pd.DataFrame()
 
 
 # --- SQLite Implementation --- #
 
+CAR_COLUMNS = ['name', 'year', 'selling_price', 'km_driven', 'fuel', 'seller_type', 'transmission', 'owner']
+
+# SQLite limite le nombre de paramètres par requête: les listes d'IDs sont découpées en tranches.
+SQLITE_IN_CHUNK_SIZE = 500
+
+# Profils de performance SQLite: pragmas appliqués à chaque nouvelle connexion.
+# En journal_mode=WAL, les lectures ne bloquent jamais l'écriture et inversement: des lecteurs
+# d'autres processus continuent de lire le dernier état validé pendant qu'un écrivain valide
+# sa transaction. Un seul écrivain à la fois reste la règle; les écrivains concurrents attendent
+# jusqu'à `timeout` secondes. WAL exige que tous les processus soient sur la même machine
+# (pas de système de fichiers réseau).
+SQLITE_PROFILES = {
+    # Réglages par défaut de SQLite (journal rollback): les lecteurs attendent pendant les écritures.
+    'default': {},
+    # WAL + synchronous=NORMAL: durable après un crash applicatif, seule une coupure de courant
+    # peut perdre les dernières transactions validées (jamais de corruption).
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,     # en KiB lorsque négatif (~16 Mo)
+        'mmap_size': 67108864,    # 64 Mo
+        'temp_store': 'MEMORY',
+    },
+    # Traitements par lots reconstructibles: aucun fsync, durabilité non garantie.
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -64000,
+        'mmap_size': 268435456,   # 256 Mo
+        'temp_store': 'MEMORY',
+    },
+}
+
+SQLITE_TUNABLE_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')
+
+# Colonnes indexées par défaut pour search_cars (l'id est déjà la clé primaire).
+SQLITE_DEFAULT_INDEXED_COLUMNS = ('year', 'selling_price', 'km_driven', 'fuel', 'seller_type', 'transmission', 'owner')
+SQLITE_NUMERIC_COLUMNS = ('id', 'year', 'selling_price', 'km_driven')
+# Version du schéma commun (table cars, registre des synthèses, index plein texte), notée dans PRAGMA user_version:
+# une base déjà à cette version n'exécute plus ce DDL à l'ouverture. À incrémenter à chaque évolution du schéma.
+SQLITE_SCHEMA_VERSION = 1
+# Objets de l'index plein texte sur les noms (voir _create_name_fts_index), supprimés pendant un bulk_insert.
+SQLITE_FTS_OBJECTS = frozenset({'cars_fts', 'cars_fts_after_insert', 'cars_fts_after_delete', 'cars_fts_after_update'})
+# Résultats des lectures multi-lignes: DataFrame (pandas) ou liste de dicts (Python pur, sans importer pandas).
+RESULT_FORMATS = ('frame', 'records')
+
+# Agrégat SQLite median(x) (absent de SQLite): les valeurs d'un groupe sont conservées le temps du GROUP BY.
+class _SQLiteMedian:
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        self.values.sort()
+        middle = len(self.values) // 2
+        if len(self.values) % 2:
+            return float(self.values[middle])
+        return (self.values[middle - 1] + self.values[middle]) / 2
+
+
 # SQLiteDataManager (sera adapté pour devenir SQLiteCarRepository)
 # Il gère déjà sa propre connexion et la création de table (SRP pour la configuration DB)
 # Open/Closed Principle (OCP): On pourrait étendre avec d'autres types de DB sans modifier CarRepository.
 
 class SQLiteCarRepository(CarRepository):
-    def __init__(self, db_file_path=None):
+    # Une connexion par thread: les lectures concurrentes sont sûres (et non bloquantes en WAL).
+    supports_concurrent_reads = True
+    metrics_prefix = 'sqlite'
+
+    def __init__(self, db_file_path=None, profile='balanced', timeout=5.0,
+                 indexed_columns=SQLITE_DEFAULT_INDEXED_COLUMNS, auto_index_threshold=None,
+                 typed_schema=True, string_storage=None, instrumentation=None, dedup_key=None, on_duplicate='skip',
+                 result_format='frame'):
+        # profile: nom d'un profil de SQLITE_PROFILES ou dict de pragmas.
+        # indexed_columns: colonnes indexées à l'initialisation.
+        # auto_index_threshold: si défini, une colonne non indexée est indexée après ce nombre de recherches.
+        # dedup_key: colonnes de la clé de doublon, couvertes par un index composite; on_duplicate: traitement par défaut.
+        # result_format: 'records' pour des listes de dicts (commandes courtes, scripts), voir RESULT_FORMATS.
+        if isinstance(profile, str):
+            if profile not in SQLITE_PROFILES:
+                raise ValueError(f"Profil SQLite inconnu: '{profile}'. Profils disponibles: {', '.join(SQLITE_PROFILES)}")
+            profile = SQLITE_PROFILES[profile]
+        unknown_pragmas = set(profile) - set(SQLITE_TUNABLE_PRAGMAS)
+        if unknown_pragmas:
+            raise ValueError(f"Pragmas SQLite non supportés: {', '.join(sorted(unknown_pragmas))}")
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Format de résultat inconnu: '{result_format}'. Formats disponibles: {', '.join(RESULT_FORMATS)}")
+        self.result_format = result_format
+        self.pragmas = dict(profile)
+        self.timeout = timeout
+        invalid_columns = set(indexed_columns) - set(CAR_COLUMNS)
+        if invalid_columns:
+            raise ValueError(f"Colonnes non indexables: {', '.join(sorted(invalid_columns))}")
+        self.indexed_columns = tuple(indexed_columns)
+        self.auto_index_threshold = auto_index_threshold
+        # typed_schema: les DataFrames retournés suivent le schéma compact (voir apply_car_schema).
+        self.typed_schema = typed_schema
+        self.string_storage = string_storage
+        self.search_counts = Counter()
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+        if dedup_key is not None:
+            self.dedup_key = normalize_duplicate_key(dedup_key)
+            self.on_duplicate = check_duplicate_policy(on_duplicate)
         if db_file_path is None:
             self.db_file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'cars.db'))
         else:
             self.db_file_path = db_file_path
         os.makedirs(os.path.dirname(self.db_file_path), exist_ok=True)
+        # Une connexion persistante par thread (sqlite3 ne partage pas une connexion entre threads sans verrou).
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._version_conn = None
+        self._version_lock = threading.Lock()
         self._create_table_if_not_exists()
 
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_file_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False permet uniquement à close() de fermer les connexions des autres threads.
+            with self.instrumentation.timer('sqlite.connect'):
+                conn = sqlite3.connect(self.db_file_path, timeout=self.timeout, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.create_aggregate('median', 1, _SQLiteMedian)
+                self._apply_pragmas(conn)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
 
+    def _apply_pragmas(self, conn):
+        # journal_mode en premier: il ne peut pas être modifié à l'intérieur d'une transaction.
+        for pragma in SQLITE_TUNABLE_PRAGMAS:
+            if pragma in self.pragmas:
+                value = self.pragmas[pragma]
+                if not str(value).lstrip('-').isalnum():
+                    raise ValueError(f"Valeur invalide pour le pragma SQLite {pragma}: {value!r}")
+                conn.execute(f"PRAGMA {pragma} = {value}")
+
+    def close(self):
+        """Ferme toutes les connexions ouvertes par le dépôt."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        with self._version_lock:
+            if self._version_conn is not None:
+                connections.append(self._version_conn)
+                self._version_conn = None
+        for conn in connections:
+            conn.close()
+
+    def data_version(self):
+        # PRAGMA data_version change quand une *autre* connexion valide une transaction. Interrogé sur une
+        # connexion dédiée qui n'écrit jamais, il change donc à chaque écriture, de ce processus ou d'un autre.
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.db_file_path, timeout=self.timeout, check_same_thread=False)
+            try:
+                return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.Error as e:
+                self.instrumentation.error('sqlite.data_version', f"Erreur SQLite lors de la lecture de la version des données: {e}")
+                return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _fetch_rows(self, cursor, query, params=()):
+        # Exécution et lecture des lignes, mesurées séparément de la construction du DataFrame (_to_frame).
+        with self.instrumentation.timer('sqlite.query'):
+            cursor.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            return cursor.fetchall(), columns
+
+    def _to_frame(self, rows, columns):
+        with self.instrumentation.timer('sqlite.frame'):
+            df = pd.DataFrame.from_records(rows, columns=columns)
+            return apply_car_schema(df, self.string_storage) if self.typed_schema else df
+
+    def _to_result(self, rows, columns):
+        if self.result_format == 'records':
+            return [dict(zip(columns, row)) for row in rows]
+        return self._to_frame(rows, columns)
+
+    def _empty_result(self):
+        return [] if self.result_format == 'records' else pd.DataFrame()
+
+    def _fetch_car(self, cursor, car_id):
+        cursor.execute("SELECT * FROM cars WHERE id = ?", (car_id,))
+        car = cursor.fetchone()
+        return dict(car) if car else None
+
     def _create_table_if_not_exists(self):
         conn = self._get_connection()
         cursor = conn.cursor()
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= SQLITE_SCHEMA_VERSION:
+            # Schéma commun déjà créé (par ce processus ou un autre): lecture seule de sqlite_master, sans verrou d'écriture.
+            # Peuvent manquer les index propres à cette instance (indexed_columns, clé de doublon) et ceux
+            # qu'un bulk_insert interrompu n'a pas reconstruits (index secondaires, index plein texte et triggers).
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'table', 'trigger')")
+            existing = {row['name'] for row in cursor.fetchall()}
+            missing = [column for column in self.indexed_columns if f"idx_cars_{column}" not in existing]
+            for column in missing:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cars_{column} ON cars ({column})")
+            if self.dedup_key is not None and f"dedup_cars_{'_'.join(self.dedup_key)}" not in existing:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS dedup_cars_{'_'.join(self.dedup_key)} ON cars ({', '.join(self.dedup_key)})")
+            if SQLITE_FTS_OBJECTS <= existing:
+                self.fts_enabled = True
+            else:
+                # Triggers absents: le contenu de cars_fts peut être périmé, il est reconstruit.
+                self.fts_enabled = self._create_name_fts_index(cursor, rebuild=True)
+                if self.fts_enabled:
+                    self.instrumentation.warning('sqlite.schema', "Index plein texte SQLite incomplet (bulk_insert interrompu): reconstruit.")
+            conn.commit()
+            return
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS cars (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -190,17 +1933,105 @@ class SQLiteCarRepository(CarRepository):
                 owner TEXT
             )
         ''')
+        for column in self.indexed_columns:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cars_{column} ON cars ({column})")
+        # Registre des tables de synthèse (voir create_summary).
+        cursor.execute("CREATE TABLE IF NOT EXISTS cars_summaries (name TEXT PRIMARY KEY, group_by TEXT NOT NULL)")
+        if self.dedup_key is not None:
+            # Index non unique: le jeu de données contient déjà des doublons, qu'un index UNIQUE refuserait.
+            # Chaque recherche de doublon est une lecture de l'index, sans parcours de la table.
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS dedup_cars_{'_'.join(self.dedup_key)} ON cars ({', '.join(self.dedup_key)})")
+        self.fts_enabled = self._create_name_fts_index(cursor)
+        cursor.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
 
-    def create_car(self, new_car_data):
+    def _create_name_fts_index(self, cursor, rebuild=False):
+        """Crée l'index plein texte FTS5 sur les noms, synchronisé avec la table cars par des triggers.
+
+        La table est remplie à partir de cars à sa création, ou si rebuild est vrai.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cars_fts'")
+        already_exists = cursor.fetchone() is not None
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS cars_fts USING fts5("
+                "name, content='cars', content_rowid='id', tokenize='unicode61')"
+            )
+        except sqlite3.OperationalError:
+            # SQLite compilé sans FTS5: la recherche par nom reste en LIKE.
+            return False
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS cars_fts_after_insert AFTER INSERT ON cars BEGIN
+                INSERT INTO cars_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS cars_fts_after_delete AFTER DELETE ON cars BEGIN
+                INSERT INTO cars_fts(cars_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS cars_fts_after_update AFTER UPDATE OF name ON cars BEGIN
+                INSERT INTO cars_fts(cars_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO cars_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+        ''')
+        if rebuild or not already_exists:
+            # Indexation initiale des lignes déjà présentes.
+            cursor.execute("INSERT INTO cars_fts(cars_fts) VALUES ('rebuild')")
+        return True
+
+    def indexes(self):
+        """Retourne le nom des colonnes disposant d'un index secondaire."""
+        cursor = self._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'cars' AND name LIKE 'idx_cars_%'")
+        return sorted(row['name'][len('idx_cars_'):] for row in cursor.fetchall())
+
+    def create_index(self, column):
+        """Crée (si besoin) un index secondaire sur une colonne de la table cars."""
+        if column not in CAR_COLUMNS:
+            self.instrumentation.warning('sqlite.create_index', f"La colonne SQLite '{column}' ne peut pas être indexée.")
+            return False
+        conn = self._get_connection()
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_cars_{column} ON cars ({column})")
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.create_index', f"Erreur SQLite lors de la création de l'index sur '{column}': {e}")
+            return False
+
+    def drop_index(self, column):
+        """Supprime l'index secondaire d'une colonne s'il existe."""
+        if column not in CAR_COLUMNS:
+            return False
+        conn = self._get_connection()
+        try:
+            conn.execute(f"DROP INDEX IF EXISTS idx_cars_{column}")
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.drop_index', f"Erreur SQLite lors de la suppression de l'index sur '{column}': {e}")
+            return False
+
+    def _record_search(self, attribute):
+        # Indexation guidée par l'usage: une colonne fréquemment recherchée reçoit un index.
+        self.search_counts[attribute] += 1
+        if (self.auto_index_threshold is not None and attribute in CAR_COLUMNS
+                and self.search_counts[attribute] == self.auto_index_threshold
+                and attribute not in self.indexes()):
+            if self.create_index(attribute):
+                self.instrumentation.info('sqlite.auto_index', f"Index SQLite créé automatiquement sur '{attribute}'.")
+
+    @instrumented('create_car')
+    def create_car(self, new_car_data, on_duplicate=None):
+        if self._duplicate_policy(on_duplicate) != 'allow':
+            return self.create_cars([new_car_data], on_duplicate)[0]
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
             # S'assurer que toutes les clés attendues sont présentes, avec des valeurs par défaut si nécessaire
             # pour éviter les erreurs si new_car_data ne les contient pas toutes.
             # Ceci est un exemple, adaptez selon les colonnes NOT NULL et les valeurs par défaut souhaitées.
-            cols = ['name', 'year', 'selling_price', 'km_driven', 'fuel', 'seller_type', 'transmission', 'owner']
+            cols = CAR_COLUMNS
             car_data_for_db = {col: new_car_data.get(col) for col in cols}
             
             cursor.execute(f'''
@@ -209,62 +2040,120 @@ class SQLiteCarRepository(CarRepository):
             ''', car_data_for_db)
             conn.commit()
             car_id = cursor.lastrowid
-            print(f"Nouvelle voiture ajoutée à SQLite avec l'ID {car_id}.")
-            return self.get_car_by_id(car_id)
+            self.instrumentation.info('sqlite.create_car', f"Nouvelle voiture ajoutée à SQLite avec l'ID {car_id}.", id=car_id)
+            return self._fetch_car(cursor, car_id)
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la création de la voiture: {e}")
+            conn.rollback()
+            self.instrumentation.error('sqlite.create_car', f"Erreur SQLite lors de la création de la voiture: {e}")
             return None
-        finally:
-            conn.close()
 
+    @instrumented('get_all_cars')
     def get_all_cars(self):
         conn = self._get_connection()
         cursor = conn.cursor()
+        # Tuples bruts: le DataFrame est construit directement, sans liste intermédiaire de dicts.
+        cursor.row_factory = None
         try:
-            cursor.execute("SELECT * FROM cars")
-            cars = cursor.fetchall()
-            cars_list = [dict(row) for row in cars]
-            return pd.DataFrame(cars_list)
+            return self._to_result(*self._fetch_rows(cursor, "SELECT * FROM cars"))
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la récupération de toutes les voitures: {e}")
-            return pd.DataFrame()
+            self.instrumentation.error('sqlite.get_all_cars', f"Erreur SQLite lors de la récupération de toutes les voitures: {e}")
+            return self._empty_result()
+
+    def iter_cars(self, chunk_size=1000, as_frames=True):
+        cursor = self._get_connection().cursor()
+        if as_frames:
+            cursor.row_factory = None
+        try:
+            cursor.execute("SELECT * FROM cars ORDER BY id")
+            columns = [description[0] for description in cursor.description]
+            while True:
+                # fetchmany: au plus chunk_size lignes en mémoire à la fois.
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if as_frames:
+                    yield self._to_frame(rows, columns)
+                else:
+                    for row in rows:
+                        yield dict(row)
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.iter_cars', f"Erreur SQLite lors du parcours des voitures: {e}")
         finally:
-            conn.close()
+            cursor.close()
+
+    @instrumented('get_cars_page')
+    def get_cars_page(self, after_id=None, limit=20):
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        try:
+            # Pagination par clé: la recherche dans l'index de la clé primaire coûte O(log n + limit), quel que soit le numéro de page.
+            # Une ligne de plus que la page: s'il n'y en a pas, la dernière page n'annonce pas de page suivante vide.
+            rows, columns = self._fetch_rows(
+                cursor, "SELECT * FROM cars WHERE id > ? ORDER BY id LIMIT ?", (-1 if after_id is None else after_id, limit + 1))
+            next_after_id = rows[limit - 1][columns.index('id')] if len(rows) > limit > 0 else None
+            return self._to_result(rows[:limit], columns), next_after_id
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.get_cars_page', f"Erreur SQLite lors de la récupération d'une page de voitures: {e}")
+            return self._empty_result(), None
+
+    @instrumented('count')
+    def count(self):
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM cars")
+            return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.count', f"Erreur SQLite lors du comptage des voitures: {e}")
+            return 0
 
+    @instrumented('exists')
+    def exists(self, car_id):
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT 1 FROM cars WHERE id = ?", (car_id,))
+            return cursor.fetchone() is not None
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.exists', f"Erreur SQLite lors de la vérification de la voiture ID {car_id}: {e}")
+            return False
+
+    def columns(self):
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("PRAGMA table_info(cars)")
+            return [row['name'] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.columns', f"Erreur SQLite lors de la lecture du schéma: {e}")
+            return []
+
+    @instrumented('get_car_by_id')
     def get_car_by_id(self, car_id):
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("SELECT * FROM cars WHERE id = ?", (car_id,))
-            car = cursor.fetchone()
-            if car:
-                return dict(car)
-            return None
+            return self._fetch_car(cursor, car_id)
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la récupération de la voiture ID {car_id}: {e}")
+            self.instrumentation.error('sqlite.get_car_by_id', f"Erreur SQLite lors de la récupération de la voiture ID {car_id}: {e}")
             return None
-        finally:
-            conn.close()
 
+    @instrumented('update_car')
     def update_car(self, car_id, updated_car_data):
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
-            if self.get_car_by_id(car_id) is None:
-                print(f"Aucune voiture trouvée avec l'ID SQLite {car_id} pour la mise à jour.")
+            if self._fetch_car(cursor, car_id) is None:
+                self.instrumentation.warning('sqlite.update_car', f"Aucune voiture trouvée avec l'ID SQLite {car_id} pour la mise à jour.")
                 return None
 
             set_clause_parts = []
             values = []
-            valid_columns = ['name', 'year', 'selling_price', 'km_driven', 'fuel', 'seller_type', 'transmission', 'owner']
             for key, value in updated_car_data.items():
-                if key in valid_columns:
+                if key in CAR_COLUMNS:
                     set_clause_parts.append(f"{key} = ?")
                     values.append(value)
             
             if not set_clause_parts:
-                print("Aucune donnée SQLite valide fournie pour la mise à jour.") 
-                return self.get_car_by_id(car_id)
+                self.instrumentation.warning('sqlite.update_car', "Aucune donnée SQLite valide fournie pour la mise à jour.") 
+                return self._fetch_car(cursor, car_id)
 
             set_clause = ", ".join(set_clause_parts)
             query = f"UPDATE cars SET {set_clause} WHERE id = ?"
@@ -274,65 +2163,561 @@ class SQLiteCarRepository(CarRepository):
             conn.commit()
             
             if cursor.rowcount > 0:
-                print(f"Voiture ID SQLite {car_id} mise à jour.")
-            return self.get_car_by_id(car_id)
+                self.instrumentation.info('sqlite.update_car', f"Voiture ID SQLite {car_id} mise à jour.", id=car_id)
+            return self._fetch_car(cursor, car_id)
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la mise à jour de la voiture ID {car_id}: {e}")
+            conn.rollback()
+            self.instrumentation.error('sqlite.update_car', f"Erreur SQLite lors de la mise à jour de la voiture ID {car_id}: {e}")
             return None
-        finally:
-            conn.close()
 
+    @instrumented('delete_car')
     def delete_car(self, car_id):
         conn = self._get_connection()
         cursor = conn.cursor()
         try:
-            car_to_delete = self.get_car_by_id(car_id)
+            car_to_delete = self._fetch_car(cursor, car_id)
             if not car_to_delete:
-                print(f"Aucune voiture trouvée avec l'ID SQLite {car_id} pour la suppression.")
+                self.instrumentation.warning('sqlite.delete_car', f"Aucune voiture trouvée avec l'ID SQLite {car_id} pour la suppression.")
                 return None
 
             cursor.execute("DELETE FROM cars WHERE id = ?", (car_id,))
             conn.commit()
             if cursor.rowcount > 0:
-                print(f"Voiture ID SQLite {car_id} supprimée.")
+                self.instrumentation.info('sqlite.delete_car', f"Voiture ID SQLite {car_id} supprimée.", id=car_id)
                 return car_to_delete
             return None
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la suppression de la voiture ID {car_id}: {e}")
+            conn.rollback()
+            self.instrumentation.error('sqlite.delete_car', f"Erreur SQLite lors de la suppression de la voiture ID {car_id}: {e}")
             return None
-        finally:
-            conn.close()
 
+    def _build_search_query(self, attribute, value):
+        """Construit la requête de search_cars; lève ValueError si l'attribut ou la valeur est invalide."""
+        valid_columns = ['id'] + CAR_COLUMNS
+        if attribute not in valid_columns:
+            raise ValueError(f"L'attribut SQLite '{attribute}' n'est pas valide pour la recherche.")
+
+        if attribute in SQLITE_NUMERIC_COLUMNS:
+            try:
+                # L'égalité sur une colonne indexée est servie par l'index (pas de parcours complet).
+                return f"SELECT * FROM cars WHERE {attribute} = ?", (int(value),)
+            except ValueError:
+                raise ValueError(f"La valeur '{value}' doit être un nombre pour l'attribut SQLite '{attribute}'.")
+        if attribute == 'name' and self.fts_enabled:
+            tokens = tokenize_name(value)
+            if tokens:
+                # Recherche par jetons en préfixe ("swift dz" -> "swift"* "dz"*), classée par bm25.
+                match_query = ' '.join(f'"{token}"*' for token in tokens)
+                return ("SELECT cars.* FROM cars_fts JOIN cars ON cars.id = cars_fts.rowid "
+                        "WHERE cars_fts MATCH ? ORDER BY cars_fts.rank"), (match_query,)
+        # Une sous-chaîne '%…%' ne peut pas utiliser un index B-tree: parcours complet.
+        return f"SELECT * FROM cars WHERE {attribute} LIKE ?", (f"%{value}%",)
+
+    def _where_clause(self, predicates):
+        """Compile des critères normalisés en clause WHERE paramétrée; retourne (clause, paramètres)."""
+        clauses = []
+        params = []
+        for column, operator, value in predicates:
+            if operator == 'in':
+                clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            elif operator == 'between':
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                params.extend(value)
+            elif operator == 'contains':
+                tokens = tokenize_name(value) if column == 'name' and self.fts_enabled else []
+                if tokens:
+                    clauses.append("id IN (SELECT rowid FROM cars_fts WHERE cars_fts MATCH ?)")
+                    params.append(' '.join(f'"{token}"*' for token in tokens))
+                else:
+                    clauses.append(f"{column} LIKE ?")
+                    params.append(f"%{value}%")
+            else:
+                clauses.append(f"{column} {operator} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _build_query(self, predicates=None, order_by=None, limit=None, offset=0):
+        """Compile les critères de query_cars en une seule requête SQL paramétrée; lève ValueError si invalides."""
+        predicates, order = normalize_query(predicates, order_by, limit, offset, ['id'] + CAR_COLUMNS)
+        where, params = self._where_clause(predicates)
+        query = "SELECT * FROM cars" + where
+        if not order and (limit is not None or offset):
+            # Sans ORDER BY, l'ordre dépend du plan (index choisi): les pages seraient instables.
+            order = [('id', False)]
+        if order:
+            # L'id départage les ex æquo: ordre stable, identique au tri CSV par position.
+            if 'id' not in [column for column, _ in order]:
+                order.append(('id', False))
+            query += " ORDER BY " + ", ".join(f"{column} {'DESC' if descending else 'ASC'}" for column, descending in order)
+        if limit is not None or offset:
+            # SQLite exige LIMIT avant OFFSET; -1 signifie "sans limite".
+            query += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        return query, tuple(params)
+
+    def explain(self, attribute, value):
+        """Retourne le plan d'exécution (EXPLAIN QUERY PLAN) de search_cars(attribute, value)."""
+        try:
+            query, params = self._build_search_query(attribute, value)
+        except ValueError as e:
+            self.instrumentation.warning('sqlite.explain', str(e))
+            return []
+        return self._explain_plan(query, params)
+
+    def explain_query(self, predicates=None, order_by=None, limit=None, offset=0):
+        """Retourne le plan d'exécution de query_cars avec les mêmes arguments."""
+        try:
+            query, params = self._build_query(predicates, order_by, limit, offset)
+        except ValueError as e:
+            self.instrumentation.warning('sqlite.explain_query', str(e))
+            return []
+        return self._explain_plan(query, params)
+
+    def _explain_plan(self, query, params):
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+            return [row['detail'] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.explain_plan', f"Erreur SQLite lors de l'analyse du plan de requête: {e}")
+            return []
+
+    @instrumented('search_cars')
     def search_cars(self, attribute, value):
+        try:
+            query, params = self._build_search_query(attribute, value)
+        except ValueError as e:
+            self.instrumentation.warning('sqlite.search_cars', str(e))
+            return self._empty_result()
+        self._record_search(attribute)
         conn = self._get_connection()
         cursor = conn.cursor()
-        valid_columns = ['id', 'name', 'year', 'selling_price', 'km_driven', 'fuel', 'seller_type', 'transmission', 'owner']
-        if attribute not in valid_columns:
-            print(f"L'attribut SQLite '{attribute}' n'est pas valide pour la recherche.")
-            return pd.DataFrame()
+        cursor.row_factory = None
 
         try:
-            query = f"SELECT * FROM cars WHERE {attribute} LIKE ?"
-            search_value = f"%{value}%"
+            return self._to_result(*self._fetch_rows(cursor, query, params))
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.search_cars', f"Erreur SQLite lors de la recherche des voitures: {e}")
+            return self._empty_result()
 
-            if attribute in ['year', 'selling_price', 'km_driven', 'id']:
-                try:
-                    numeric_value = int(value)
-                    query = f"SELECT * FROM cars WHERE {attribute} = ?"
-                    search_value = numeric_value
-                except ValueError:
-                    print(f"La valeur '{value}' doit être un nombre pour l'attribut SQLite '{attribute}'.")
-                    return pd.DataFrame()
-            
-            cursor.execute(query, (search_value,))
-            cars = cursor.fetchall()
-            cars_list = [dict(row) for row in cars]
-            return pd.DataFrame(cars_list)
+    @instrumented('query_cars')
+    def query_cars(self, predicates=None, order_by=None, limit=None, offset=0):
+        try:
+            query, params = self._build_query(predicates, order_by, limit, offset)
+        except ValueError as e:
+            self.instrumentation.warning('sqlite.query_cars', str(e))
+            return self._empty_result()
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        try:
+            return self._to_result(*self._fetch_rows(cursor, query, params))
         except sqlite3.Error as e:
-            print(f"Erreur SQLite lors de la recherche des voitures: {e}")
-            return pd.DataFrame()
+            self.instrumentation.error('sqlite.query_cars', f"Erreur SQLite lors de la requête multi-critères: {e}")
+            return self._empty_result()
+
+    # --- Agrégations --- #
+
+    @staticmethod
+    def _aggregate_expression(column):
+        return AGGREGATE_VIRTUAL_COLUMNS[column][0] if column in AGGREGATE_VIRTUAL_COLUMNS else column
+
+    def _build_aggregate_query(self, group_by, metrics, predicates, bands):
+        """Compile une agrégation en une requête GROUP BY (arguments normalisés par normalize_aggregate)."""
+        select = []
+        for column in group_by:
+            if column in bands:
+                source, edges = bands[column]
+                expression = self._aggregate_expression(source)
+                # Plus grande borne inférieure ou égale à la valeur; NULL sous la première borne.
+                cases = ' '.join(f"WHEN {expression} >= {edge!r} THEN {edge!r}" for edge in reversed(edges))
+                select.append(f"CASE {cases} END")
+            else:
+                select.append(column)
+        for _, function, column in metrics:
+            sql_function = {'mean': 'AVG'}.get(function, function.upper())
+            select.append(f"{sql_function}({'*' if column == '*' else self._aggregate_expression(column)})")
+        where, params = self._where_clause(predicates)
+        query = f"SELECT {', '.join(select)} FROM cars{where}"
+        if group_by:
+            positions = ', '.join(str(position) for position in range(1, len(group_by) + 1))
+            query += f" GROUP BY {positions} ORDER BY {positions}"
+        return query, tuple(params)
+
+    def _build_summary_query(self, name, group_by, metrics):
+        select = list(group_by)
+        for _, function, column in metrics:
+            if column == '*':
+                select.append('n')
+            elif function == 'mean':
+                select.append(f"CAST(sum_{column} AS REAL) / NULLIF(n_{column}, 0)")
+            elif function == 'count':
+                select.append(f"n_{column}")
+            else:
+                # Somme d'aucune valeur: NULL, comme SUM.
+                select.append(f"CASE WHEN n_{column} > 0 THEN sum_{column} END")
+        order = ', '.join(group_by)
+        return f"SELECT {', '.join(select)} FROM cars_summary_{name} WHERE n > 0 ORDER BY {order}", ()
+
+    @instrumented('aggregate')
+    def aggregate(self, group_by=None, metrics=None, predicates=None, bands=None):
+        try:
+            group_by, metrics, predicates, bands = normalize_aggregate(group_by, metrics, predicates, bands, ['id'] + CAR_COLUMNS)
+            summary_name = find_summary(self.summaries(), group_by, metrics, predicates, bands)
+            if summary_name is not None:
+                self.instrumentation.count('sqlite.aggregate.summary_hits')
+                query, params = self._build_summary_query(summary_name, group_by, metrics)
+            else:
+                query, params = self._build_aggregate_query(group_by, metrics, predicates, bands)
+        except ValueError as e:
+            self.instrumentation.warning('sqlite.aggregate', str(e))
+            return self._empty_result()
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        try:
+            rows, _ = self._fetch_rows(cursor, query, params)
+            columns = list(group_by) + [name for name, _, _ in metrics]
+            if self.result_format == 'records':
+                return [dict(zip(columns, row)) for row in rows]
+            return pd.DataFrame.from_records(rows, columns=columns)
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.aggregate', f"Erreur SQLite lors de l'agrégation: {e}")
+            return self._empty_result()
+
+    def summaries(self):
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT name, group_by FROM cars_summaries")
+            return {row['name']: json.loads(row['group_by']) for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.summaries', f"Erreur SQLite lors de la lecture des tables de synthèse: {e}")
+            return {}
+
+    def create_summary(self, name, group_by):
+        """Crée (ou recrée) la table de synthèse cars_summary_<name>, tenue à jour par des triggers.
+
+        Une ligne par groupe: nombre de voitures, somme et nombre de valeurs non nulles de chaque SUMMARY_COLUMNS.
+        Chaque écriture sur cars corrige une ou deux lignes de la synthèse (O(1)).
+        """
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+        if (not str(name).isidentifier() or not group_by or len(set(group_by)) != len(group_by)
+                or any(column not in CAR_COLUMNS for column in group_by)):
+            self.instrumentation.warning('sqlite.create_summary', f"Synthèse SQLite '{name}' invalide: nom ou colonnes de regroupement {group_by}.")
+            return False
+        table = f"cars_summary_{name}"
+
+        def key(row):
+            return f"json_array({', '.join(f'{row}.{column}' for column in group_by)})"
+
+        def add(row):
+            columns = ', '.join(['group_key', *group_by, 'n'] + [f"sum_{c}, n_{c}" for c in SUMMARY_COLUMNS])
+            values = ', '.join([key(row), *(f"{row}.{column}" for column in group_by), '1']
+                               + [f"COALESCE({row}.{c}, 0), {row}.{c} IS NOT NULL" for c in SUMMARY_COLUMNS])
+            updates = ', '.join(['n = n + 1'] + [f"sum_{c} = sum_{c} + excluded.sum_{c}, n_{c} = n_{c} + excluded.n_{c}"
+                                                  for c in SUMMARY_COLUMNS])
+            return f"INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT(group_key) DO UPDATE SET {updates};"
+
+        def remove(row):
+            updates = ', '.join(['n = n - 1'] + [f"sum_{c} = sum_{c} - COALESCE({row}.{c}, 0), n_{c} = n_{c} - ({row}.{c} IS NOT NULL)"
+                                                  for c in SUMMARY_COLUMNS])
+            return (f"UPDATE {table} SET {updates} WHERE group_key = {key(row)}; "
+                    f"DELETE FROM {table} WHERE group_key = {key(row)} AND n <= 0;")
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            self._drop_summary_objects(cursor, name)
+            cursor.execute(f"CREATE TABLE {table} (group_key TEXT PRIMARY KEY, {', '.join(group_by)}, n INTEGER NOT NULL, "
+                           + ', '.join(f"sum_{c} NOT NULL DEFAULT 0, n_{c} INTEGER NOT NULL DEFAULT 0" for c in SUMMARY_COLUMNS) + ")")
+            # Remplissage initial en un seul GROUP BY.
+            cursor.execute(f"INSERT INTO {table} SELECT {key('cars')}, {', '.join(group_by)}, COUNT(*), "
+                           + ', '.join(f"COALESCE(SUM({c}), 0), COUNT({c})" for c in SUMMARY_COLUMNS)
+                           + f" FROM cars GROUP BY {', '.join(group_by)}")
+            watched = ', '.join(dict.fromkeys([*group_by, *SUMMARY_COLUMNS]))
+            cursor.execute(f"CREATE TRIGGER {table}_after_insert AFTER INSERT ON cars BEGIN {add('new')} END")
+            cursor.execute(f"CREATE TRIGGER {table}_after_delete AFTER DELETE ON cars BEGIN {remove('old')} END")
+            cursor.execute(f"CREATE TRIGGER {table}_after_update AFTER UPDATE OF {watched} ON cars "
+                           f"BEGIN {remove('old')} {add('new')} END")
+            cursor.execute("INSERT INTO cars_summaries (name, group_by) VALUES (?, ?)", (name, json.dumps(group_by)))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.create_summary', f"Erreur SQLite lors de la création de la synthèse '{name}': {e}")
+            return False
+
+    def _drop_summary_objects(self, cursor, name):
+        table = f"cars_summary_{name}"
+        for event in ('insert', 'delete', 'update'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_after_{event}")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("DELETE FROM cars_summaries WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def drop_summary(self, name):
+        if not str(name).isidentifier():
+            return False
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            dropped = self._drop_summary_objects(cursor, name)
+            conn.commit()
+            return dropped
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.drop_summary', f"Erreur SQLite lors de la suppression de la synthèse '{name}': {e}")
+            return False
+
+    def _fetch_cars_by_ids(self, cursor, car_ids):
+        """Retourne un dict {id: voiture} pour les IDs existants."""
+        cars = {}
+        unique_ids = list(dict.fromkeys(car_ids))
+        for start in range(0, len(unique_ids), SQLITE_IN_CHUNK_SIZE):
+            chunk = unique_ids[start:start + SQLITE_IN_CHUNK_SIZE]
+            placeholders = ', '.join('?' for _ in chunk)
+            cursor.execute(f"SELECT * FROM cars WHERE id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                cars[row['id']] = dict(row)
+        return cars
+
+    def _duplicate_condition(self):
+        # IS plutôt que =: deux valeurs NULL de la clé sont égales, comme dans DuplicateIndex.
+        return ' AND '.join(f"{column} IS ?" for column in self.dedup_key)
+
+    def _split_duplicates(self, cursor, valid_rows, policy):
+        """Sépare les voitures à créer des doublons: ceux de la base (recherche dans l'index) et ceux du lot.
+
+        Retourne (voitures à créer, {position: id existant}, {position: position de la première voiture du lot}).
+        Avec 'merge', les valeurs d'un doublon sont reportées sur la voiture existante ou sur la première du lot.
+        """
+        lookup = f"SELECT id FROM cars WHERE {self._duplicate_condition()} ORDER BY id LIMIT 1"
+        merge = f"UPDATE cars SET {', '.join(f'{column} = COALESCE(?, {column})' for column in CAR_COLUMNS)} WHERE id = ?"
+        to_create, existing, in_batch = [], {}, {}
+        seen = {}  # clé → (id existant, None) ou (None, position de la première voiture du lot)
+        for position, car in valid_rows:
+            key = tuple(_key_value(car[column]) for column in self.dedup_key)
+            if key not in seen:
+                row = cursor.execute(lookup, [car[column] for column in self.dedup_key]).fetchone()
+                seen[key] = (row[0], None) if row is not None else (None, len(to_create))
+                if row is None:
+                    to_create.append((position, car))
+                    continue
+            car_id, first = seen[key]
+            if car_id is not None:
+                existing[position] = car_id
+                if policy == 'merge':
+                    cursor.execute(merge, [car[column] for column in CAR_COLUMNS] + [car_id])
+            else:
+                in_batch[position] = to_create[first][0]
+                if policy == 'merge':
+                    to_create[first][1].update(merge_data(car))
+        return to_create, existing, in_batch
+
+    def _report_duplicates(self, policy, count, **fields):
+        self.instrumentation.count(f"sqlite.duplicates.{policy}", count)
+        self.duplicate_count += count
+        event = self.instrumentation.warning if policy == 'report' else self.instrumentation.info
+        event('sqlite.duplicates', f"{count} doublons SQLite ({', '.join(self.dedup_key)}) {DUPLICATE_ACTIONS[policy]}.",
+              policy=policy, **fields)
+
+    @instrumented('create_cars')
+    def create_cars(self, cars_data, on_duplicate=None):
+        cars_data = list(cars_data)
+        policy = self._duplicate_policy(on_duplicate)
+        results = [None] * len(cars_data)
+        valid_rows = []
+        for position, new_car_data in enumerate(cars_data):
+            if new_car_data.get('name') is None:
+                self.instrumentation.warning('sqlite.create_cars', f"Voiture en position {position} ignorée: le nom est obligatoire.")
+                continue
+            valid_rows.append((position, {col: new_car_data.get(col) for col in CAR_COLUMNS}))
+        if not valid_rows:
+            return results
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            # Une seule transaction (un seul fsync) pour tout le lot.
+            cursor.execute("BEGIN IMMEDIATE")
+            existing, in_batch = {}, {}
+            if policy != 'allow':
+                valid_rows, existing, in_batch = self._split_duplicates(cursor, valid_rows, policy)
+            created = {}
+            if valid_rows:
+                cursor.executemany(
+                    f"INSERT INTO cars ({', '.join(CAR_COLUMNS)}) VALUES (:{', :'.join(CAR_COLUMNS)})",
+                    [car for _, car in valid_rows],
+                )
+                # executemany ne renseigne pas lastrowid: sous le verrou d'écriture, les IDs AUTOINCREMENT
+                # attribués au lot sont consécutifs et se terminent à la valeur de sqlite_sequence.
+                cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cars'")
+                last_id = cursor.fetchone()[0]
+                first_id = last_id - len(valid_rows) + 1
+                created = self._fetch_cars_by_ids(cursor, list(range(first_id, last_id + 1)))
+            if policy != 'report':
+                created.update(self._fetch_cars_by_ids(cursor, list(existing.values())))
+            conn.commit()
+            car_ids = {position: first_id + offset for offset, (position, _) in enumerate(valid_rows)}
+            if policy != 'report':
+                car_ids.update(existing)
+                car_ids.update((position, car_ids[first]) for position, first in in_batch.items())
+            for position, car_id in car_ids.items():
+                results[position] = created.get(car_id)
+            if valid_rows:
+                self.instrumentation.info('sqlite.create_cars', f"{len(valid_rows)} nouvelles voitures ajoutées à SQLite.",
+                                          first_id=first_id, last_id=last_id)
+            if existing or in_batch:
+                self._report_duplicates(policy, len(existing) + len(in_batch),
+                                        duplicate_of=list(existing.values()) + [car_ids[first] for first in in_batch.values()])
+            return results
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.create_cars', f"Erreur SQLite lors de la création du lot de voitures: {e}")
+            return [None] * len(cars_data)
+
+    @instrumented('update_cars')
+    def update_cars(self, updates):
+        items = _update_items(updates)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            existing = self._fetch_cars_by_ids(cursor, [car_id for car_id, _ in items])
+            # Regroupement par ensemble de colonnes modifiées: un executemany par forme de requête.
+            batches = {}
+            for car_id, updated_car_data in items:
+                if car_id not in existing:
+                    self.instrumentation.warning('sqlite.update_cars', f"Aucune voiture trouvée avec l'ID SQLite {car_id} pour la mise à jour.")
+                    continue
+                columns = tuple(key for key in updated_car_data if key in CAR_COLUMNS)
+                if columns:
+                    values = [updated_car_data[key] for key in columns] + [car_id]
+                    batches.setdefault(columns, []).append(values)
+            for columns, rows in batches.items():
+                set_clause = ", ".join(f"{key} = ?" for key in columns)
+                cursor.executemany(f"UPDATE cars SET {set_clause} WHERE id = ?", rows)
+            updated = self._fetch_cars_by_ids(cursor, list(existing))
+            conn.commit()
+            self.instrumentation.info('sqlite.update_cars', f"{sum(len(rows) for rows in batches.values())} mises à jour SQLite appliquées.",
+                                      rows=sum(len(rows) for rows in batches.values()))
+            return [updated.get(car_id) for car_id, _ in items]
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.update_cars', f"Erreur SQLite lors de la mise à jour du lot de voitures: {e}")
+            return [None] * len(items)
+
+    def bulk_insert(self, chunks, defer_indexes=True, on_duplicate=None):
+        """Insère des tranches de lignes (tuples dans l'ordre de CAR_COLUMNS, déjà validées); retourne le nombre inséré.
+
+        Une transaction par tranche (un executemany, un seul commit). Avec defer_indexes, les index
+        secondaires et l'index plein texte sont supprimés pendant le chargement puis reconstruits en une
+        passe: bien moins coûteux que leur mise à jour ligne à ligne. Les lecteurs concurrents ne
+        disposent alors pas des index. Si le processus s'arrête avant la reconstruction, le prochain
+        SQLiteCarRepository recrée les index (et reconstruit l'index plein texte) à l'initialisation.
+        En cas d'erreur, la tranche en cours est annulée; les tranches déjà validées restent en base.
+
+        Avec un traitement des doublons autre que 'allow', l'index de la clé de doublon est conservé: les
+        doublons de la tranche sont regroupés en mémoire, puis chaque ligne n'est insérée que si sa clé est
+        absente de la base (INSERT ... WHERE NOT EXISTS, une lecture d'index par ligne).
+        """
+        policy = self._duplicate_policy(on_duplicate)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        indexed_columns = self.indexes() if defer_indexes else []
+        placeholders = ', '.join('?' for _ in CAR_COLUMNS)
+        insert = f"INSERT INTO cars ({', '.join(CAR_COLUMNS)}) VALUES ({placeholders})"
+        if policy != 'allow':
+            # Paramètres: les valeurs de la ligne puis celles de sa clé (mêmes paramètres pour la fusion).
+            key_positions = [CAR_COLUMNS.index(column) for column in self.dedup_key]
+            insert = (f"INSERT INTO cars ({', '.join(CAR_COLUMNS)}) SELECT {placeholders} "
+                      f"WHERE NOT EXISTS (SELECT 1 FROM cars WHERE {self._duplicate_condition()})")
+            merge = (f"UPDATE cars SET {', '.join(f'{column} = COALESCE(?, {column})' for column in CAR_COLUMNS)} "
+                     f"WHERE id = (SELECT id FROM cars WHERE {self._duplicate_condition()} ORDER BY id LIMIT 1)")
+        inserted = duplicates = 0
+        try:
+            if defer_indexes:
+                self._drop_secondary_indexes(cursor, indexed_columns)
+            for rows in chunks:
+                with self.instrumentation.timer('sqlite.bulk_insert.chunk'):
+                    cursor.execute("BEGIN IMMEDIATE")
+                    if policy == 'allow':
+                        cursor.executemany(insert, rows)
+                        chunk_inserted = len(rows)
+                    else:
+                        params = [tuple(row) + tuple(row[position] for position in key_positions)
+                                  for row in _collapse_duplicates(rows, key_positions, policy == 'merge')]
+                        if policy == 'merge':
+                            cursor.executemany(merge, params)
+                        cursor.executemany(insert, params)
+                        chunk_inserted = cursor.rowcount
+                    conn.commit()
+                inserted += chunk_inserted
+                duplicates += len(rows) - chunk_inserted
+                self.instrumentation.count('sqlite.bulk_insert.rows', chunk_inserted)
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.bulk_insert', f"Erreur SQLite lors de l'insertion en masse ({inserted} lignes déjà insérées): {e}",
+                                       rows=inserted)
         finally:
-            conn.close()
+            if defer_indexes:
+                with self.instrumentation.timer('sqlite.bulk_insert.reindex'):
+                    self._restore_secondary_indexes(cursor, indexed_columns)
+        if duplicates:
+            self._report_duplicates(policy, duplicates, rows=duplicates)
+        return inserted
+
+    def _drop_secondary_indexes(self, cursor, indexed_columns):
+        for column in indexed_columns:
+            cursor.execute(f"DROP INDEX IF EXISTS idx_cars_{column}")
+        if self.fts_enabled:
+            cursor.executescript('''
+                DROP TRIGGER IF EXISTS cars_fts_after_insert;
+                DROP TRIGGER IF EXISTS cars_fts_after_delete;
+                DROP TRIGGER IF EXISTS cars_fts_after_update;
+                DROP TABLE IF EXISTS cars_fts;
+            ''')
+        cursor.connection.commit()
+
+    def _restore_secondary_indexes(self, cursor, indexed_columns):
+        for column in indexed_columns:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cars_{column} ON cars ({column})")
+        # La table cars_fts n'existe plus: elle est recréée et remplie à partir de cars.
+        self.fts_enabled = self._create_name_fts_index(cursor)
+        cursor.connection.commit()
+
+    @instrumented('find_duplicates')
+    def find_duplicates(self, key=None):
+        key = ', '.join(normalize_duplicate_key(key or self.dedup_key or DUPLICATE_KEY))
+        # Fenêtre par clé (PARTITION BY regroupe les NULL, comme DuplicateIndex): plus petit id et taille du groupe.
+        query = (f"SELECT id, {', '.join(CAR_COLUMNS)}, duplicate_of FROM ("
+                 f"SELECT *, MIN(id) OVER key AS duplicate_of, COUNT(*) OVER key AS group_size FROM cars "
+                 f"WINDOW key AS (PARTITION BY {key})) WHERE group_size > 1 ORDER BY duplicate_of, id")
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = None
+        try:
+            return self._to_result(*self._fetch_rows(cursor, query))
+        except sqlite3.Error as e:
+            self.instrumentation.error('sqlite.find_duplicates', f"Erreur SQLite lors de la recherche des doublons: {e}")
+            return self._empty_result()
+
+    @instrumented('delete_cars')
+    def delete_cars(self, car_ids):
+        car_ids = list(car_ids)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            existing = self._fetch_cars_by_ids(cursor, car_ids)
+            cursor.executemany("DELETE FROM cars WHERE id = ?", [(car_id,) for car_id in existing])
+            conn.commit()
+            self.instrumentation.info('sqlite.delete_cars', f"{len(existing)} voitures SQLite supprimées.", ids=list(existing))
+            return [existing.get(car_id) for car_id in car_ids]
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.instrumentation.error('sqlite.delete_cars', f"Erreur SQLite lors de la suppression du lot de voitures: {e}")
+            return [None] * len(car_ids)
 
 # Exemple d'utilisation (Dependency Inversion Principle)
 # La logique de haut niveau dépend des abstractions (CarRepository), pas des implémentations concrètes.
@@ -350,7 +2735,7 @@ def main_app_logic(repository: CarRepository):
     created_car = repository.create_car(new_car)
     if created_car:
         print(f"Voiture créée: {created_car}")
-        car_id_to_test = created_car.get('id') if isinstance(repository, SQLiteCarRepository) else len(all_cars) # CSV index vs SQLite ID
+        car_id_to_test = created_car.get('id')
         if car_id_to_test is not None:
             print(f"\n--- Voiture par ID ({car_id_to_test}) ---")
             car = repository.get_car_by_id(car_id_to_test)
@@ -372,14 +2757,14 @@ def main_app_logic(repository: CarRepository):
 if __name__ == '__main__':
     # Utilisation avec CSV
     print("\n******** UTILISATION AVEC CSV ********")
-    csv_data_source = CsvDataSource()
-    csv_repo = CsvCarRepository(csv_data_source)
-    main_app_logic(csv_repo)
+    csv_data_source = CachedCsvDataSource()
+    with CsvCarRepository(csv_data_source) as csv_repo:
+        main_app_logic(csv_repo)
 
     # Utilisation avec SQLite
     print("\n******** UTILISATION AVEC SQLITE ********")
-    sqlite_repo = SQLiteCarRepository()
-    main_app_logic(sqlite_repo)
+    with SQLiteCarRepository() as sqlite_repo:
+        main_app_logic(sqlite_repo)
 
     # Nettoyage optionnel des fichiers de données de test
     # try:
@@ -0,0 +1,380 @@
+"""Service HTTP/JSON local exposant un CarRepository (CSV ou SQLite).
+
+    python src/http_server.py --source sqlite --port 8000
+
+Routes:
+    GET    /cars?after_id=&limit=           page de voitures (pagination par clé)
+    GET    /cars/count                      nombre de voitures
+    GET    /cars/search?attribute=&value=   recherche sur un attribut
+    POST   /cars/query                      {"predicates": [[colonne, opérateur, valeur]], "order_by", "limit", "offset"}
+    POST   /cars/aggregate                  {"group_by", "metrics": {nom: [fonction, colonne]}, "predicates", "bands"}
+    GET    /cars/<id>                       une voiture
+    POST   /cars                            création (corps JSON)
+    PATCH  /cars/<id>                       mise à jour partielle (corps JSON)
+    DELETE /cars/<id>                       suppression
+    GET    /metrics                         métriques du dépôt (--metrics) et du cache HTTP
+"""
+import argparse
+import json
+import re
+import secrets
+import select
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from data_manager import CachedCsvDataSource, CarRepository, CsvCarRepository, SQLiteCarRepository
+
+MAX_PAGE_SIZE = 1000
+# Intervalle de vérification d'une connexion persistante inactive (requête reçue, autre client en attente).
+KEEPALIVE_POLL_INTERVAL = 0.05
+CAR_PATH = re.compile(r'^/cars/(-?\d+)$')
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Valeur non sérialisable en JSON: {value!r}")
+
+
+def _records(df):
+    # Liste de dicts: dépôt SQLite en result_format='records', valeurs déjà au format JSON.
+    if isinstance(df, list):
+        return [_car(car) for car in df]
+    # NaN / pd.NA deviennent null: json.dumps écrirait NaN, qui n'est pas du JSON valide.
+    if df is None or df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _car(car):
+    if car is None:
+        return None
+    return {key: None if value is not None and not isinstance(value, str) and pd.isna(value) else value
+            for key, value in car.items()}
+
+
+# Single Responsibility Principle (SRP)
+# CarHttpService: accès au dépôt (verrous, cache LRU, version des données), indépendant du protocole HTTP.
+class CarHttpService:
+    def __init__(self, repository: CarRepository, cache_size=256):
+        self.repository = repository
+        self.cache_size = cache_size
+        # Le jeton d'instance distingue les ETags de deux exécutions du serveur (les compteurs repartent de zéro).
+        self.instance = secrets.token_hex(4)
+        self._write_lock = threading.Lock()
+        # CSV: DataFrame de travail partagé, les lectures sont sérialisées avec les écritures.
+        self._read_lock = nullcontext() if repository.supports_concurrent_reads else self._write_lock
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def etag(self, version):
+        return None if version is None else f'"{self.instance}-{version}"'
+
+    def read(self, cache_key, function):
+        """Exécute une lecture; retourne (contenu JSON encodé, version des données)."""
+        with self._read_lock:
+            version = self.repository.data_version()
+            if version is not None and self.cache_size:
+                with self._cache_lock:
+                    cached = self._cache.get(cache_key)
+                    if cached is not None and cached[0] == version:
+                        self._cache.move_to_end(cache_key)
+                        self.hits += 1
+                        return cached[1], version
+            with self._cache_lock:
+                self.misses += 1
+            body = json.dumps(function(), default=_json_value).encode('utf-8')
+        if version is not None and self.cache_size:
+            with self._cache_lock:
+                self._cache[cache_key] = (version, body)
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return body, version
+
+    def write(self, function):
+        with self._write_lock:
+            result = function()
+        # Toute écriture invalide le cache (les entrées portent aussi la version, pour les écritures externes).
+        with self._cache_lock:
+            self._cache.clear()
+        return json.dumps(result, default=_json_value).encode('utf-8')
+
+    def cache_stats(self):
+        with self._cache_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+
+class CarRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: connexions persistantes (keep-alive) tant que chaque réponse porte un Content-Length.
+    protocol_version = 'HTTP/1.1'
+    # Délai de lecture d'une requête, et d'inactivité maximale d'une connexion persistante.
+    timeout = 15
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def handle(self):
+        # Comme BaseHTTPRequestHandler.handle, mais le pool est borné: une connexion persistante inactive rend
+        # son thread dès qu'une autre connexion attend un thread, sans attendre la fin du délai d'inactivité.
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._wait_for_request():
+            self.handle_one_request()
+
+    def _wait_for_request(self):
+        """Attend la requête suivante de la connexion; False si elle doit être fermée (délai dépassé, pool saturé)."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self._buffered_input() or select.select([self.connection], [], [], KEEPALIVE_POLL_INTERVAL)[0]:
+                return True
+            if self.server.waiting_connections() or time.monotonic() >= deadline:
+                return False
+
+    def _buffered_input(self):
+        # Requête suivante déjà lue dans le tampon de rfile (pipelining): select ne la verrait pas.
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body=b'', etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+
+    def _send_error_json(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode('utf-8'))
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            data = json.loads(raw or b'{}')
+        except json.JSONDecodeError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Corps JSON invalide: {e}")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Le corps JSON doit être un objet.")
+        return data
+
+    def _handle(self, method):
+        try:
+            url = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if method == 'GET':
+                self._get(url.path, query, cache_key=self.path)
+            elif method == 'POST':
+                self._post(url.path)
+            elif method in ('PATCH', 'PUT'):
+                self._patch(url.path)
+            elif method == 'DELETE':
+                self._delete(url.path)
+        except HttpError as e:
+            self._send_error_json(e.status, e.message)
+        except (ValueError, TypeError) as e:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            self.service.repository.instrumentation.error('http.request', f"Erreur du service HTTP ({method} {self.path}): {e}",
+                                                          method=method, path=self.path)
+            self._send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, "Erreur interne du service.")
+
+    def _respond_read(self, cache_key, function, not_found=False):
+        body, version = self.service.read(cache_key, function)
+        if not_found and body == b'null':
+            raise HttpError(HTTPStatus.NOT_FOUND, "Voiture introuvable.")
+        etag = self.service.etag(version)
+        if etag is not None and etag in (self.headers.get('If-None-Match') or ''):
+            self._send(HTTPStatus.NOT_MODIFIED, etag=etag)
+        else:
+            self._send(HTTPStatus.OK, body, etag=etag)
+
+    def _get(self, path, query, cache_key):
+        repository = self.service.repository
+        if path == '/cars':
+            after_id = int(query['after_id']) if 'after_id' in query else None
+            limit = min(int(query.get('limit', 20)), MAX_PAGE_SIZE)
+
+            def page():
+                cars, next_after_id = repository.get_cars_page(after_id, limit)
+                return {'cars': _records(cars), 'next_after_id': next_after_id}
+            self._respond_read(cache_key, page)
+        elif path == '/cars/count':
+            self._respond_read(cache_key, lambda: {'count': repository.count()})
+        elif path == '/cars/search':
+            if 'attribute' not in query or 'value' not in query:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Paramètres requis: attribute et value.")
+            self._respond_read(cache_key, lambda: {'cars': _records(repository.search_cars(query['attribute'], query['value']))})
+        elif path == '/metrics':
+            # Jamais mis en cache ni conditionnel: les compteurs changent à chaque requête.
+            metrics = {'http_cache': self.service.cache_stats(), **repository.instrumentation.snapshot()}
+            self._send(HTTPStatus.OK, json.dumps(metrics, default=_json_value).encode('utf-8'))
+        elif CAR_PATH.match(path):
+            car_id = int(CAR_PATH.match(path).group(1))
+            self._respond_read(cache_key, lambda: _car(repository.get_car_by_id(car_id)), not_found=True)
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Route inconnue: {path}")
+
+    def _post(self, path):
+        repository = self.service.repository
+        data = self._read_json()
+        if path == '/cars/query':
+            # Lecture: les critères sont dans le corps, la clé de cache en est dérivée.
+            def query():
+                return {'cars': _records(repository.query_cars(
+                    [tuple(predicate) for predicate in data.get('predicates') or []],
+                    data.get('order_by'), data.get('limit'), data.get('offset', 0)))}
+            cache_key = ('query', json.dumps(data, sort_keys=True))
+            self._respond_read(cache_key, query)
+        elif path == '/cars/aggregate':
+            def aggregate():
+                metrics = data.get('metrics')
+                return {'groups': _records(repository.aggregate(
+                    data.get('group_by'),
+                    {name: tuple(metric) for name, metric in metrics.items()} if metrics else None,
+                    [tuple(predicate) for predicate in data.get('predicates') or []],
+                    data.get('bands')))}
+            cache_key = ('aggregate', json.dumps(data, sort_keys=True))
+            self._respond_read(cache_key, aggregate)
+        elif path == '/cars':
+            if 'name' not in data:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Le champ 'name' est requis.")
+            body = self.service.write(lambda: _car(repository.create_car(data)))
+            if body == b'null':
+                raise HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, "La création a échoué.")
+            self._send(HTTPStatus.CREATED, body)
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Route inconnue: {path}")
+
+    def _car_id(self, path):
+        match = CAR_PATH.match(path)
+        if match is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Route inconnue: {path}")
+        return int(match.group(1))
+
+    def _patch(self, path):
+        car_id = self._car_id(path)
+        data = self._read_json()
+        body = self.service.write(lambda: _car(self.service.repository.update_car(car_id, data)))
+        if body == b'null':
+            raise HttpError(HTTPStatus.NOT_FOUND, "Voiture introuvable.")
+        self._send(HTTPStatus.OK, body)
+
+    def _delete(self, path):
+        car_id = self._car_id(path)
+        body = self.service.write(lambda: _car(self.service.repository.delete_car(car_id)))
+        if body == b'null':
+            raise HttpError(HTTPStatus.NOT_FOUND, "Voiture introuvable.")
+        self._send(HTTPStatus.OK, body)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+# Un thread par connexion, mais puisés dans un pool borné: SQLite ouvre une connexion par thread,
+# un thread par client sans limite en ouvrirait autant que de clients.
+class CarHttpServer(ThreadingHTTPServer):
+    def __init__(self, address, service, workers=16, quiet=False):
+        super().__init__(address, CarRequestHandler)
+        self.service = service
+        self.quiet = quiet
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http')
+        self._waiting = 0   # connexions acceptées, pas encore prises en charge par un thread du pool
+        self._waiting_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._waiting_lock:
+            self._waiting += 1
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        with self._waiting_lock:
+            self._waiting -= 1
+        self.process_request_thread(request, client_address)
+
+    def waiting_connections(self):
+        return self._waiting
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', choices=['csv', 'sqlite'], default='sqlite')
+    parser.add_argument('--path', default=None, help="fichier CSV ou base SQLite (défaut: data/)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--cache-size', type=int, default=256)
+    parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--metrics', action='store_true', help="collecte les métriques des opérations (GET /metrics)")
+    args = parser.parse_args()
+
+    if args.source == 'csv':
+        repository = CsvCarRepository(CachedCsvDataSource(args.path))
+    else:
+        repository = SQLiteCarRepository(args.path)
+    if args.metrics:
+        repository.instrumentation.enable()
+    if args.quiet:
+        # Les messages des opérations (création, mise à jour…) ne sont plus affichés; les erreurs le restent.
+        repository.instrumentation.set_sink(repository.instrumentation.sink, min_level='error')
+    server = CarHttpServer((args.host, args.port), CarHttpService(repository, args.cache_size), args.workers, args.quiet)
+    print(f"Service voitures ({args.source}) sur http://{args.host}:{server.server_port}/cars")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        repository.close()
+        print("Service arrêté.")
+
+
+if __name__ == '__main__':
+    main()
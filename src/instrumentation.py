@@ -0,0 +1,307 @@
+"""Instrumentation des dépôts: événements structurés, compteurs, histogrammes de latence et capture de profils.
+
+Les métriques sont désactivées par défaut (coût quasi nul: un test de booléen par opération):
+
+    from instrumentation import default_instrumentation
+    default_instrumentation.enable()
+    ...
+    print(default_instrumentation.export_json())
+
+Les messages des dépôts sont des événements: le puits par défaut les affiche comme avant (print),
+`set_sink(None)` les fait taire et `set_sink(fonction)` les redirige (journal, file, tests).
+"""
+import functools
+import io
+import json
+import sys
+import threading
+import time
+from collections import Counter
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+# Bornes supérieures (ms) des tranches des histogrammes de latence; au-delà: '+inf'.
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def print_sink(event):
+    print(event['message'])
+
+
+def rows_in(result):
+    """Nombre de lignes d'un résultat de dépôt (DataFrame, voiture, liste de voitures, page)."""
+    if result is None:
+        return 0
+    # pandas n'est pas importé ici: s'il ne l'est pas encore ailleurs, le résultat ne peut pas être un DataFrame.
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(result, pd.DataFrame):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    if isinstance(result, tuple) and result:
+        # get_cars_page: (page, next_after_id), page en DataFrame ou en liste de dicts (result_format='records').
+        return rows_in(result[0])
+    if isinstance(result, list):
+        return sum(item is not None for item in result)
+    return 0
+
+
+class Histogram:
+    """Histogramme à tranches fixes: mémoire constante, quantiles approchés par la borne de la tranche."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        position = 0
+        while position < len(self.bounds) and value > self.bounds[position]:
+            position += 1
+        self.counts[position] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                # La borne de la tranche, sans dépasser le maximum observé.
+                return min(self.bounds[position], self.max) if position < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        labels = [f"<={bound:g}" for bound in self.bounds] + ['+inf']
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.50),
+            'p90': self.quantile(0.90),
+            'p99': self.quantile(0.99),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('instrumentation', 'name', 'begin')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.instrumentation.observe(f"{self.name}.ms", (time.perf_counter() - self.begin) * 1000)
+        if exc_type is not None:
+            self.instrumentation.count(f"{self.name}.errors")
+        return False
+
+
+class ProfileCapture:
+    """Résultat d'Instrumentation.profile(): statistiques cProfile et allocations tracemalloc."""
+
+    def __init__(self):
+        self.profile = None
+        self.elapsed = 0.0
+        self.memory_peak = None
+        self.memory_top = []
+
+    def stats(self, sort='cumulative', limit=25):
+        if self.profile is None:
+            return ''
+        import pstats
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def report(self, sort='cumulative', limit=25):
+        lines = [f"Durée: {self.elapsed * 1000:.1f} ms"]
+        if self.memory_peak is not None:
+            lines.append(f"Pic mémoire Python: {self.memory_peak / 1e6:.1f} Mo")
+            lines.extend(f"  {stat}" for stat in self.memory_top)
+        lines.append(self.stats(sort, limit))
+        return '\n'.join(lines)
+
+
+# Single Responsibility Principle (SRP)
+# Instrumentation: collecte des métriques et diffusion des événements, indépendante des sources de données.
+class Instrumentation:
+    def __init__(self, enabled=False, sink=print_sink, min_level='info'):
+        # enabled: collecte des compteurs et histogrammes. Les événements sont diffusés dans tous les cas.
+        self.enabled = enabled
+        self.sink = sink
+        self.min_level = LEVELS[min_level]
+        self._counters = Counter()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def set_sink(self, sink, min_level=None):
+        """Remplace le puits des événements (None: aucun événement n'est diffusé)."""
+        self.sink = sink
+        if min_level is not None:
+            self.min_level = LEVELS[min_level]
+
+    # --- Métriques --- #
+
+    def count(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += value
+
+    def observe(self, name, value):
+        if self.enabled:
+            with self._lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = Histogram()
+                histogram.observe(value)
+
+    def timer(self, name):
+        """Mesure la durée d'un bloc dans l'histogramme '<name>.ms' (erreurs: compteur '<name>.errors')."""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def snapshot(self):
+        """Copie cohérente des compteurs et des histogrammes."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())},
+            }
+
+    def export_json(self, path=None):
+        """Sérialise le snapshot en JSON; l'écrit dans `path` si fourni."""
+        output = json.dumps({'timestamp': time.time(), **self.snapshot()}, indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        return output
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # --- Événements --- #
+
+    def event(self, level, name, message, **fields):
+        if self.enabled:
+            self.count(f"events.{level}")
+        if self.sink is None or LEVELS[level] < self.min_level:
+            return
+        self.sink({'time': time.time(), 'level': level, 'event': name, 'message': message, **fields})
+
+    def info(self, name, message, **fields):
+        self.event('info', name, message, **fields)
+
+    def warning(self, name, message, **fields):
+        self.event('warning', name, message, **fields)
+
+    def error(self, name, message, **fields):
+        self.event('error', name, message, **fields)
+
+    # --- Profilage --- #
+
+    def profile(self, cpu=True, memory=True, top=10):
+        """Contexte de capture: profil cProfile et/ou allocations tracemalloc du bloc.
+
+            with instrumentation.profile() as capture:
+                repository.search_cars('name', 'swift')
+            print(capture.report())
+        """
+        return _ProfileContext(cpu, memory, top)
+
+
+class _ProfileContext:
+    def __init__(self, cpu, memory, top):
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.capture = ProfileCapture()
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        # Modules de profilage importés à la demande: ils ralentiraient le démarrage de chaque commande.
+        import cProfile
+        import tracemalloc
+        if self.memory:
+            # tracemalloc déjà actif (autre outil): on le réutilise sans l'arrêter en sortie.
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+        if self.cpu:
+            self.capture.profile = cProfile.Profile()
+            self.capture.profile.enable()
+        self._begin = time.perf_counter()
+        return self.capture
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        import tracemalloc
+        self.capture.elapsed = time.perf_counter() - self._begin
+        if self.cpu:
+            self.capture.profile.disable()
+        if self.memory:
+            self.capture.memory_peak = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot()
+            self.capture.memory_top = after.compare_to(self._before, 'lineno')[:self.top]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        return False
+
+
+def instrumented(name):
+    """Décorateur de méthode de dépôt: durée ('<prefix>.<name>.ms'), appels et lignes touchées.
+
+    Le préfixe est l'attribut `metrics_prefix` de l'instance ('csv', 'sqlite'…).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if not instrumentation.enabled:
+                return method(self, *args, **kwargs)
+            metric = f"{self.metrics_prefix}.{name}"
+            with instrumentation.timer(metric):
+                result = method(self, *args, **kwargs)
+            instrumentation.count(f"{metric}.calls")
+            instrumentation.count(f"{metric}.rows", rows_in(result))
+            return result
+        return wrapper
+    return decorator
+
+
+# Instance partagée par défaut par toutes les sources et tous les dépôts (remplaçable par instance).
+default_instrumentation = Instrumentation()
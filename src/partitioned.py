@@ -0,0 +1,338 @@
+"""Source CSV partitionnée: un fichier par valeur d'une colonne, lus, filtrés et agrégés en parallèle par un pool de processus.
+
+    source = PartitionedCsvDataSource('data/partitions', partition_column='fuel')
+    source.save_data(CsvDataSource().load_data())            # répartition initiale du CSV
+    repository = CsvCarRepository(source)
+    repository.search_cars('transmission', 'Manual')         # une tâche par partition
+    repository.aggregate('owner', predicates=[('fuel', 'in', ['Diesel', 'CNG'])])  # deux partitions lues
+
+    python src/partitioned.py data/car_dataset.csv data/partitions --column fuel
+"""
+import argparse
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from data_manager import (AGGREGATE_VIRTUAL_COLUMNS, CsvDataSource, DataSource, aggregate_frame,
+                          apply_car_schema, atomic_replace, file_lock, predicate_mask)
+
+PARTITION_EXTENSION = '.csv'
+# Nom de la partition des voitures sans valeur pour la colonne de partition.
+NULL_PARTITION = '__null__'
+# Fonctions dont les résultats partiels (un par partition) se combinent; la médiane exige toutes les valeurs d'un groupe.
+PARTIAL_FUNCTIONS = ('count', 'sum', 'min', 'max', 'mean')
+
+
+def partition_file_name(column, value):
+    """Nom du fichier d'une partition: '<colonne>=<valeur encodée>.csv'."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return f"{column}={NULL_PARTITION}{PARTITION_EXTENSION}"
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f"{column}={quote(str(value), safe='')}{PARTITION_EXTENSION}"
+
+
+# --- Tâches exécutées dans les processus du pool --- #
+# Fonctions de module (sérialisables par pickle); seuls les lignes retenues ou les agrégats partiels reviennent.
+
+# Partitions gardées en mémoire par le processus qui en a la charge: {chemin: (signature, DataFrame)}.
+_PARTITION_CACHE = {}
+
+
+def _partition_frame(path, typed_schema, string_storage):
+    """DataFrame d'une partition, relu seulement si le fichier a changé depuis la dernière lecture."""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size, typed_schema, string_storage)
+    cached = _PARTITION_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    source = CsvDataSource(path, typed_schema, string_storage)
+    # Lecture directe (et non load_data): une erreur doit remonter au processus principal, pas devenir un DataFrame vide.
+    df = source._read_csv()
+    _PARTITION_CACHE[path] = (signature, df)
+    return df
+
+
+def _forget_partition(path):
+    _PARTITION_CACHE.pop(path, None)
+
+
+def _read_partition(path, typed_schema, string_storage, predicates, columns):
+    """Lignes d'une partition retenues par les critères (colonnes utiles seulement si columns est fourni)."""
+    df = _partition_frame(path, typed_schema, string_storage)
+    if predicates:
+        mask = np.ones(len(df), dtype=bool)
+        for column, operator, value in predicates:
+            mask &= predicate_mask(df[column], operator, value)
+        df = df[mask]
+    if columns is not None:
+        df = df[[column for column in df.columns if column in columns]]
+    return df
+
+
+def _aggregate_partition(path, typed_schema, string_storage, predicates, columns, group_by, metrics, bands):
+    return aggregate_frame(_read_partition(path, typed_schema, string_storage, predicates, columns), group_by, metrics, bands)
+
+
+def _write_partition(path, df):
+    atomic_replace(path, lambda temp_path: df.to_csv(temp_path, index=False))
+
+
+def _count_partition(path, typed_schema, string_storage):
+    return len(_partition_frame(path, typed_schema, string_storage))
+
+
+# --- Agrégats partiels --- #
+
+def _partial_metrics(metrics):
+    # Moyenne = somme / nombre: deux agrégats partiels qui se combinent par addition.
+    partial = []
+    for name, function, column in metrics:
+        if function == 'mean':
+            partial.extend([(f"{name}__sum", 'sum', column), (f"{name}__count", 'count', column)])
+        else:
+            partial.append((name, function, column))
+    return partial
+
+
+def _combine_partials(partials, group_by, metrics):
+    """Combine les agrégats partiels des partitions (mêmes groupes possibles dans plusieurs partitions)."""
+    # Colonnes partielles renommées '__<nom>': une métrique nommée comme une colonne dérivée (price_per_km)
+    # serait sinon recalculée par aggregate_frame à partir de colonnes absentes des agrégats partiels.
+    df = pd.concat(partials, ignore_index=True)
+    df = df.rename(columns={name: f"__{name}" for name, _, _ in _partial_metrics(metrics)})
+    combined = []
+    for name, function, column in metrics:
+        if function == 'mean':
+            combined.extend([(f"{name}__sum", 'sum', f"__{name}__sum"), (f"{name}__count", 'sum', f"__{name}__count")])
+        else:
+            combined.append((name, 'sum' if function == 'count' else function, f"__{name}"))
+    result = aggregate_frame(df, group_by, combined, {})
+    for name, function, _ in metrics:
+        if function == 'mean':
+            result[name] = result[f"{name}__sum"] / result[f"{name}__count"].replace(0, np.nan)
+    return result[list(group_by) + [name for name, _, _ in metrics]]
+
+
+def _needed_columns(group_by, metrics, predicates, bands):
+    # Colonnes utiles à une agrégation; None (toutes) si une colonne dérivée est en jeu.
+    columns = {'id'}
+    columns.update(bands[column][0] if column in bands else column for column in group_by)
+    columns.update(column for _, _, column in metrics if column != '*')
+    columns.update(column for column, _, _ in predicates)
+    return None if columns & set(AGGREGATE_VIRTUAL_COLUMNS) else columns
+
+
+# Open/Closed Principle (OCP)
+# PartitionedCsvDataSource: se branche sur CsvCarRepository comme les autres sources (Liskov); le filtrage
+# (supports_filters) et l'agrégation (supports_aggregate) sont répartis sur les partitions, en parallèle.
+class PartitionedCsvDataSource(DataSource):
+    supports_filters = True
+    supports_aggregate = True
+
+    # Chaque partition est confiée à un même processus (choisi par hachage de son nom), qui la garde en mémoire
+    # et ne la relit que si le fichier change: une requête est un filtrage en mémoire, réparti sur `workers`
+    # processus. Un critère sur la colonne de partition écarte les partitions qui ne peuvent pas le satisfaire;
+    # seules les lignes retenues (ou les agrégats partiels) sont renvoyées au processus principal.
+    def __init__(self, directory=None, partition_column='fuel', workers=None, typed_schema=True, string_storage=None,
+                 instrumentation=None):
+        if directory is None:
+            self.directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'partitions'))
+        else:
+            self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        # Chemin de référence du dépôt CSV (journal '<dossier>.journal').
+        self.file_path = self.directory
+        self.partition_column = partition_column
+        self.workers = workers or os.cpu_count() or 1
+        self.typed_schema = typed_schema
+        self.string_storage = string_storage
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+        self._executors = []
+        self._executors_lock = threading.Lock()
+
+    def close(self):
+        """Arrête les processus (et libère les partitions qu'ils gardent en mémoire); relancés au besoin."""
+        with self._executors_lock:
+            executors, self._executors = self._executors, []
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _executor_for(self, path):
+        # Un processus par exécuteur: une partition est toujours traitée (et gardée en mémoire) par le même.
+        with self._executors_lock:
+            if not self._executors:
+                self._executors = [ProcessPoolExecutor(max_workers=1) for _ in range(self.workers)]
+            return self._executors[zlib.crc32(os.path.basename(path).encode('utf-8')) % len(self._executors)]
+
+    def _map(self, function, tasks):
+        """Exécute les tâches (le chemin de la partition en premier argument) en parallèle; résultats dans l'ordre."""
+        futures = [self._executor_for(task[0]).submit(function, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+    # --- Partitions --- #
+
+    def partitions(self):
+        """Retourne {valeur de partition (texte, None pour les valeurs manquantes): chemin}, triées par nom de fichier."""
+        prefix = f"{self.partition_column}="
+        partitions = {}
+        try:
+            file_names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return partitions
+        for file_name in file_names:
+            if file_name.startswith(prefix) and file_name.endswith(PARTITION_EXTENSION):
+                value = unquote(file_name[len(prefix):-len(PARTITION_EXTENSION)])
+                partitions[None if value == NULL_PARTITION else value] = os.path.join(self.directory, file_name)
+        return partitions
+
+    def _prune(self, predicates):
+        """Chemins des partitions dont la valeur satisfait les critères portant sur la colonne de partition."""
+        partitions = self.partitions()
+        conditions = [(operator, value) for column, operator, value in predicates or () if column == self.partition_column]
+        if not conditions or not partitions:
+            return list(partitions.values())
+        values = pd.Series(list(partitions), dtype=object)
+        numbers = pd.to_numeric(values, errors='coerce')
+        if numbers.notna().sum() == values.notna().sum():
+            # Colonne de partition numérique (année…): les noms de fichiers sont comparés comme des nombres.
+            values = numbers
+        mask = np.ones(len(values), dtype=bool)
+        try:
+            for operator, value in conditions:
+                mask &= predicate_mask(values, operator, value)
+        except TypeError:
+            # Critère incomparable avec les valeurs de partition: aucune partition n'est écartée, chaque ligne sera filtrée.
+            return list(partitions.values())
+        paths = [path for path, keep in zip(partitions.values(), mask) if keep]
+        self.instrumentation.count('partitioned.pruned', len(partitions) - len(paths))
+        return paths
+
+    def _reader_options(self):
+        return (self.typed_schema, self.string_storage)
+
+    # --- DataSource --- #
+
+    def load_data(self, columns=None, filters=None):
+        paths = self._prune(filters)
+        try:
+            with self.instrumentation.timer('partitioned.load'):
+                frames = self._map(_read_partition, [(path, *self._reader_options(), filters, columns) for path in paths])
+        except Exception as e:
+            self.instrumentation.error('partitioned.load_data', f"Erreur lors du chargement des partitions CSV: {e}")
+            return pd.DataFrame()
+        self.instrumentation.count('partitioned.partitions.read', len(paths))
+        non_empty = [frame for frame in frames if not frame.empty]
+        if not non_empty:
+            return frames[0] if frames else pd.DataFrame(columns=columns or self.columns())
+        df = pd.concat(non_empty, ignore_index=True)
+        if 'id' in df.columns:
+            # Ordre des ids, comme dans un CSV unique (get_cars_page s'appuie dessus).
+            df = df.sort_values('id', kind='stable', ignore_index=True)
+        # Les catégories diffèrent d'une partition à l'autre: la concaténation les a converties en objets.
+        return apply_car_schema(df, self.string_storage) if self.typed_schema else df
+
+    def save_data(self, df):
+        """Réécrit les partitions (une par valeur de la colonne de partition) et supprime celles devenues vides.
+
+        Chaque fichier est remplacé atomiquement; l'ensemble ne l'est pas: un lecteur concurrent peut voir
+        des partitions de deux versions successives.
+        """
+        try:
+            with file_lock(self.directory), self.instrumentation.timer('partitioned.write'):
+                parts = {os.path.join(self.directory, partition_file_name(self.partition_column, value)): part
+                         for value, part in df.groupby(self.partition_column, dropna=False, observed=True, sort=False)}
+                self._map(_write_partition, list(parts.items()))
+                for path in self.partitions().values():
+                    if path not in parts:
+                        os.remove(path)
+                        self._executor_for(path).submit(_forget_partition, path)
+            self.instrumentation.info('partitioned.save_data', f"Données CSV sauvegardées dans {len(parts)} partitions.",
+                                      path=self.directory, rows=len(df), partitions=len(parts))
+            return True
+        except Exception as e:
+            self.instrumentation.error('partitioned.save_data', f"Erreur lors de la sauvegarde des partitions CSV: {e}")
+            return False
+
+    def iter_chunks(self, chunk_size):
+        # Partition par partition: une seule tranche en mémoire.
+        for path in self.partitions().values():
+            yield from CsvDataSource(path, *self._reader_options(), instrumentation=self.instrumentation).iter_chunks(chunk_size)
+
+    def row_count(self):
+        return sum(self._map(_count_partition, [(path, *self._reader_options()) for path in self.partitions().values()]))
+
+    def columns(self):
+        for path in self.partitions().values():
+            return CsvDataSource(path).read_header()
+        return []
+
+    def is_numeric_column(self, column):
+        for path in self.partitions().values():
+            return pd.api.types.is_numeric_dtype(pd.read_csv(path, usecols=[column], nrows=1000)[column])
+        return False
+
+    def data_version(self):
+        # Signature (nom, mtime, taille) de chaque partition: toute réécriture, tout ajout ou suppression la change.
+        signature = []
+        for path in self.partitions().values():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            signature.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def aggregate(self, group_by, metrics, predicates, bands):
+        """Agrégation répartie: agrégats partiels par partition combinés ici, ou lignes filtrées si la médiane est demandée."""
+        paths = self._prune(predicates)
+        columns = _needed_columns(group_by, metrics, predicates, bands)
+        options = (*self._reader_options(), predicates, columns)
+        try:
+            with self.instrumentation.timer('partitioned.aggregate'):
+                if not paths:
+                    return aggregate_frame(pd.DataFrame(columns=sorted(columns or self.columns())), group_by, metrics, bands)
+                if all(function in PARTIAL_FUNCTIONS for _, function, _ in metrics):
+                    partials = self._map(_aggregate_partition, [(path, *options, group_by, _partial_metrics(metrics), bands)
+                                                                for path in paths])
+                    return _combine_partials(partials, group_by, metrics)
+                frames = self._map(_read_partition, [(path, *options) for path in paths])
+                return aggregate_frame(pd.concat(frames, ignore_index=True), group_by, metrics, bands)
+        except Exception as e:
+            self.instrumentation.error('partitioned.aggregate', f"Erreur lors de l'agrégation des partitions CSV: {e}")
+            return pd.DataFrame()
+
+
+def partition_csv(csv_path, directory, partition_column='fuel', workers=None):
+    """Répartit un CSV de voitures en partitions et retourne la source partitionnée."""
+    source = PartitionedCsvDataSource(directory, partition_column, workers)
+    source.save_data(CsvDataSource(csv_path, typed_schema=False).load_data())
+    return source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Répartit le CSV des voitures en un fichier par valeur d'une colonne.")
+    parser.add_argument('csv_path')
+    parser.add_argument('directory')
+    parser.add_argument('--column', default='fuel', help="colonne de partition (ex.: fuel, year)")
+    args = parser.parse_args()
+    with partition_csv(args.csv_path, args.directory, args.column) as source:
+        print(f"{source.row_count()} voitures réparties en {len(source.partitions())} partitions dans {source.directory}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from data_manager import CsvDataSource
+
+# --- Génération de jeux de données synthétiques --- #
+# Les lignes sont tirées avec remise dans car_dataset.csv (la distribution jointe nom/année/carburant/…
+# est conservée), puis le prix et le kilométrage sont légèrement bruités pour éviter les doublons exacts.
+
+
+def generate_cars(rows, seed=0, source_df=None):
+    """Retourne un DataFrame de `rows` voitures suivant les distributions du jeu de données réel."""
+    if source_df is None:
+        source_df = CsvDataSource(typed_schema=False).load_data()
+    if source_df.empty:
+        raise ValueError("Le jeu de données source est vide: impossible d'en tirer des distributions.")
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, len(source_df), size=rows)
+    df = source_df.iloc[positions].reset_index(drop=True)
+    if 'selling_price' in df.columns:
+        noise = rng.normal(1.0, 0.05, size=rows)
+        df['selling_price'] = (df['selling_price'] * noise).round(-3).clip(lower=1000).astype('int64')
+    if 'km_driven' in df.columns:
+        noise = rng.normal(1.0, 0.10, size=rows)
+        df['km_driven'] = (df['km_driven'] * noise).round().clip(lower=0).astype('int64')
+    return df
+
+
+def write_synthetic_csv(file_path, rows, seed=0, source_df=None):
+    """Écrit un CSV synthétique de `rows` voitures et retourne son chemin."""
+    generate_cars(rows, seed=seed, source_df=source_df).to_csv(file_path, index=False)
+    return file_path
+
+
+if __name__ == '__main__':
+    import sys
+
+    # Usage: python synthetic_data.py <nombre_de_lignes> <chemin_csv> [graine]
+    arguments = sys.argv[1:]
+    if len(arguments) < 2:
+        print("Usage: python synthetic_data.py <nombre_de_lignes> <chemin_csv> [graine]")
+        sys.exit(1)
+    write_synthetic_csv(arguments[1], int(arguments[0]), seed=int(arguments[2]) if len(arguments) > 2 else 0)
+    print(f"{arguments[0]} voitures synthétiques écrites dans {arguments[1]}.")
@@ -0,0 +1,116 @@
+"""Agrégations (aggregate) et tables de synthèse (create_summary): mêmes groupes en CSV et en SQLite."""
+import pandas as pd
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from instrumentation import Instrumentation
+
+CARS = [
+    {'name': 'Maruti 800 AC', 'year': 2007, 'selling_price': 60000, 'km_driven': 70000, 'fuel': 'Petrol', 'transmission': 'Manual'},
+    {'name': 'Hyundai Verna 1.6 SX', 'year': 2012, 'selling_price': 600000, 'km_driven': 100000, 'fuel': 'Diesel', 'transmission': 'Manual'},
+    {'name': 'Kia Seltos HTX', 'year': 2020, 'selling_price': 1350000, 'km_driven': 12000, 'fuel': 'Diesel', 'transmission': 'Automatic'},
+    {'name': 'Tata Nexon EV', 'year': 2021, 'selling_price': 1400000, 'km_driven': 8000, 'fuel': 'Electric', 'transmission': 'Automatic'},
+    {'name': 'Maruti Wagon R CNG', 'year': 2015, 'selling_price': 300000, 'km_driven': 0, 'fuel': 'CNG', 'transmission': 'Manual'},
+    {'name': 'Honda City', 'year': 2017, 'selling_price': None, 'km_driven': 40000, 'fuel': 'Petrol', 'transmission': 'Manual'},
+    {'name': 'Toyota Innova', 'year': 2010, 'selling_price': 500000, 'km_driven': 150000, 'fuel': 'Diesel', 'transmission': 'Manual'},
+    {'name': 'Renault Kwid', 'year': None, 'selling_price': 250000, 'km_driven': 25000, 'fuel': None, 'transmission': 'Manual'},
+]
+
+
+@pytest.fixture
+def csv_repository(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    repository = CsvCarRepository(CachedCsvDataSource(str(path)))
+    repository.create_cars([dict(car) for car in CARS])
+    repository.flush()
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'))
+    repository.create_cars([dict(car) for car in CARS])
+    yield repository
+    repository.close()
+
+
+@pytest.fixture(params=['csv', 'sqlite'])
+def repository(request, csv_repository, sqlite_repository):
+    repository = csv_repository if request.param == 'csv' else sqlite_repository
+    repository.instrumentation = Instrumentation(enabled=True, sink=None)
+    return repository
+
+
+def _same(left, right):
+    assert len(right) > 0
+    # Groupe NULL: NaN côté pandas, None côté SQLite.
+    left, right = (df.reset_index(drop=True).astype(object).where(df.notna(), None) for df in (left, right))
+    pd.testing.assert_frame_equal(left, right, check_dtype=False)
+
+
+@pytest.mark.parametrize('group_by, metrics, predicates, bands', [
+    ('fuel', {'n': ('count', '*'), 'prix': ('count', 'selling_price')}, None, None),
+    (['transmission', 'fuel'], {'moyenne': ('mean', 'selling_price'), 'total': ('sum', 'km_driven')}, None, None),
+    ('fuel', {'min': ('min', 'year'), 'max': ('max', 'year')}, [('transmission', '=', 'Manual')], None),
+    ('transmission', {'mediane': ('median', 'selling_price'), 'km': ('median', 'km_driven')}, None, None),
+    ('selling_price_band', {'n': ('count', '*'), 'km': ('mean', 'km_driven')}, None, {'selling_price': [100000, 500000, 1000000]}),
+    ('year_band', {'n': ('count', '*')}, [('km_driven', '<', 100000)], {'year': [2010, 2015, 2020]}),
+    (None, {'n': ('count', '*'), 'moyenne': ('mean', 'price_per_km'), 'max': ('max', 'price_per_km')}, None, None),
+])
+def test_csv_and_sqlite_agree(csv_repository, sqlite_repository, group_by, metrics, predicates, bands):
+    _same(csv_repository.aggregate(group_by, metrics, predicates, bands),
+          sqlite_repository.aggregate(group_by, metrics, predicates, bands))
+
+
+def test_null_group_comes_first(repository):
+    groups = repository.aggregate('fuel', {'n': ('count', '*')})
+    assert pd.isna(groups['fuel'].iloc[0])
+    assert groups['fuel'].iloc[1:].tolist() == ['CNG', 'Diesel', 'Electric', 'Petrol']
+    assert groups['n'].tolist() == [1, 1, 3, 1, 2]
+
+
+def test_invalid_arguments_return_empty(repository):
+    assert len(repository.aggregate('couleur')) == 0
+    assert len(repository.aggregate('fuel', {'n': ('mode', 'year')})) == 0
+
+
+def _id(repository, name):
+    # Les identifiants attribués diffèrent d'un dépôt à l'autre (premier id CSV: 0, SQLite: 1).
+    return int(repository.search_cars('name', name)['id'].iloc[0])
+
+
+SUMMARY_METRICS = {'n': ('count', '*'), 'prix': ('sum', 'selling_price'), 'km': ('mean', 'km_driven'), 'annees': ('count', 'year')}
+
+
+def _check_summary(repository, group_by):
+    counters = repository.instrumentation.snapshot()['counters']
+    hits = sum(value for name, value in counters.items() if name.endswith('summary_hits'))
+    served = repository.aggregate(group_by, SUMMARY_METRICS)
+    assert sum(value for name, value in repository.instrumentation.snapshot()['counters'].items()
+               if name.endswith('summary_hits')) == hits + 1
+    # Un critère vrai pour toutes les lignes écarte la synthèse: même agrégat recalculé sur les lignes.
+    recomputed = repository.aggregate(group_by, SUMMARY_METRICS, [('id', '>=', 0)])
+    _same(served, recomputed)
+
+
+@pytest.mark.parametrize('group_by', ['fuel', ['fuel', 'transmission']])
+def test_summary_follows_writes(repository, group_by):
+    assert repository.create_summary('par_groupe', group_by)
+    assert repository.summaries() == {'par_groupe': [group_by] if isinstance(group_by, str) else group_by}
+    _check_summary(repository, group_by)
+    created = repository.create_car({'name': 'Tata Tigor EV', 'year': 2022, 'selling_price': 1200000, 'km_driven': 5000,
+                                     'fuel': 'Electric', 'transmission': 'Automatic'})
+    _check_summary(repository, group_by)
+    # Changement de groupe, valeur cumulée rendue nulle, groupe NULL vidé.
+    repository.update_car(created['id'], {'fuel': 'Petrol', 'selling_price': None})
+    repository.update_car(_id(repository, 'Renault Kwid'), {'fuel': 'CNG', 'year': 2019})
+    _check_summary(repository, group_by)
+    repository.delete_car(_id(repository, 'Tata Nexon EV'))
+    repository.delete_cars([_id(repository, 'Hyundai Verna 1.6 SX'), _id(repository, 'Maruti Wagon R CNG')])
+    _check_summary(repository, group_by)
+    groups = repository.aggregate(group_by, {'n': ('count', '*')})
+    assert 'Electric' not in groups['fuel'].tolist() and not groups['fuel'].isna().any()
+    assert repository.drop_summary('par_groupe')
+    assert repository.summaries() == {}
@@ -0,0 +1,47 @@
+"""Mode non interactif de app.py: stdout ne contient que les résultats."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _run(*args, stdin=''):
+    return subprocess.run([sys.executable, 'app.py', *args], input=stdin, text=True, cwd=SRC_DIR,
+                          capture_output=True, check=True)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    # Sans colonne id: le dépôt CSV la crée (et sauvegarde le fichier) à sa construction.
+    path = tmp_path / 'cars.csv'
+    path.write_text("name,year,selling_price,km_driven\nMaruti 800 AC,2007,60000,70000\nHyundai Verna,2012,600000,100000\n")
+    return str(path)
+
+
+def test_construction_messages_go_to_stderr(csv_path):
+    result = _run('list', '--source', 'csv', '--path', csv_path)
+    cars = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [car['id'] for car in cars] == [0, 1]
+    assert "sauvegardées" in result.stderr
+
+
+def test_journal_replay_messages_go_to_stderr(csv_path):
+    _run('list', '--source', 'csv', '--path', csv_path)
+    # Création journalisée mais pas écrite dans le CSV (dépôt jamais fermé): rejouée par la commande suivante.
+    repository = CsvCarRepository(CachedCsvDataSource(csv_path), flush_threshold=1000)
+    repository.create_car({'name': 'Tata Nano', 'year': 2015})
+    result = _run('get', '2', '--source', 'csv', '--path', csv_path)
+    assert [json.loads(line)['name'] for line in result.stdout.splitlines()] == ['Tata Nano']
+    assert "journal" in result.stderr
+
+
+def test_quiet_keeps_stderr_free_of_info(csv_path):
+    result = _run('list', '--source', 'csv', '--path', csv_path, '--quiet')
+    assert len(result.stdout.splitlines()) == 2
+    assert result.stderr == ''
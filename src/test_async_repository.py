@@ -0,0 +1,37 @@
+"""Adaptateur asynchrone (ExecutorAsyncCarRepository) sur les deux formats de résultat SQLite."""
+import asyncio
+
+import pytest
+
+from async_repository import ExecutorAsyncCarRepository
+from data_manager import SQLiteCarRepository
+
+NAMES = [f"Voiture {i}" for i in range(5)]
+
+
+@pytest.fixture(params=['frame', 'records'])
+def repository(request, tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format=request.param)
+    repository.create_cars([{'name': name, 'year': 2015 + i} for i, name in enumerate(NAMES)])
+    yield ExecutorAsyncCarRepository(repository, max_workers=2)
+    repository.close()
+
+
+async def _collect(repository, **kwargs):
+    return [chunk async for chunk in repository.iter_cars(**kwargs)]
+
+
+def test_iter_cars_yields_every_car(repository):
+    cars = asyncio.run(_collect(repository, chunk_size=2, as_frames=False))
+    assert [car['name'] for car in cars] == NAMES
+
+
+def test_iter_cars_yields_pages(repository):
+    pages = asyncio.run(_collect(repository, chunk_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+
+def test_iter_cars_on_empty_repository(tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format='records')
+    assert asyncio.run(_collect(ExecutorAsyncCarRepository(repository))) == []
+    repository.close()
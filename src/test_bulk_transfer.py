@@ -0,0 +1,135 @@
+"""Import/export en masse (bulk_transfer.py): validation des lignes, tranches, formats d'export."""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from bulk_transfer import coerce_cars_chunk, export_cars, import_csv
+from data_manager import DUPLICATE_KEY, CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from instrumentation import Instrumentation
+
+CSV_CONTENT = (
+    "name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n"
+    "Maruti 800 AC,2007,60000,70000,Petrol,Individual,Manual,First Owner\n"
+    "Hyundai Verna 1.6 SX,2012,600000,100000,Diesel,Individual,Manual,First Owner\n"
+    " ,2015,100000,1000,Petrol,Individual,Manual,First Owner\n"
+    "Kia Seltos HTX,deux mille,1350000,12000,Diesel,Dealer,Automatic,First Owner\n"
+    "Tata Nano,1850,50000,30000,Petrol,Individual,Manual,Second Owner\n"
+    "Honda City,2017.5,700000,40000,Petrol,Dealer,Manual,First Owner\n"
+    "Renault Kwid,2019,,25000,Petrol,Dealer,Manual,\n"
+    "Maruti 800 AC,2007,60000,70000,Petrol,Individual,Manual,First Owner\n"
+)
+# Rejetées: nom vide, année illisible, année hors bornes, année non entière.
+VALID_NAMES = ['Maruti 800 AC', 'Hyundai Verna 1.6 SX', 'Renault Kwid', 'Maruti 800 AC']
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'import.csv'
+    path.write_text(CSV_CONTENT)
+    return str(path)
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'))
+    yield repository
+    repository.close()
+
+
+def test_coerce_cars_chunk_rejects_invalid_rows(csv_path):
+    rows, rejected = coerce_cars_chunk(pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=['']))
+    assert rejected == 4
+    assert [row[0] for row in rows] == VALID_NAMES
+    # Valeurs manquantes -> None, entiers -> int Python (liés tels quels par sqlite3).
+    assert rows[2] == ('Renault Kwid', 2019, None, 25000, 'Petrol', 'Dealer', 'Manual', None)
+    assert all(type(value) is int for value in rows[0][1:4])
+
+
+@pytest.mark.parametrize('chunk_size', [2, 1000])
+def test_import_csv_into_sqlite(csv_path, sqlite_repository, chunk_size):
+    stats = import_csv(csv_path, sqlite_repository, chunk_size=chunk_size)
+    assert (stats['rows_read'], stats['rows_imported'], stats['rows_rejected'], stats['rows_duplicate'], stats['rows_failed']) == (8, 4, 4, 0, 0)
+    assert sqlite_repository.get_all_cars()['name'].tolist() == VALID_NAMES
+    assert sqlite_repository.fts_enabled
+    assert 'year' in sqlite_repository.indexes()
+
+
+def test_import_csv_skips_duplicates(csv_path, tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'dedup.db'), dedup_key=DUPLICATE_KEY)
+    stats = import_csv(csv_path, repository, on_duplicate='skip')
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (3, 1, 0)
+    # Un second import du même fichier n'ajoute rien: toutes les lignes valides sont des doublons.
+    stats = import_csv(csv_path, repository, on_duplicate='skip')
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (0, 4, 0)
+    assert repository.count() == 3
+    repository.close()
+
+
+def test_aborted_bulk_insert_is_not_counted_as_duplicates(csv_path, tmp_path):
+    db_path = str(tmp_path / 'locked.db')
+    repository = SQLiteCarRepository(db_path, timeout=0.1)
+    # Un autre écrivain garde le verrou d'écriture: la tranche est annulée.
+    other = sqlite3.connect(db_path)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        stats = import_csv(csv_path, repository, defer_indexes=False)
+    finally:
+        other.rollback()
+        other.close()
+    assert (stats['rows_imported'], stats['rows_rejected'], stats['rows_duplicate'], stats['rows_failed']) == (0, 4, 0, 4)
+    assert repository.count() == 0
+    repository.close()
+
+
+def test_import_csv_into_csv_repository(csv_path, tmp_path):
+    target = tmp_path / 'cars.csv'
+    target.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    repository = CsvCarRepository(CachedCsvDataSource(str(target)))
+    stats = import_csv(csv_path, repository, chunk_size=3)
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (4, 0, 0)
+    assert repository.get_all_cars()['name'].tolist() == VALID_NAMES
+    repository.close()
+
+
+def test_import_csv_into_csv_repository_counts_duplicates(csv_path, tmp_path):
+    target = tmp_path / 'cars.csv'
+    target.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    repository = CsvCarRepository(CachedCsvDataSource(str(target)), dedup_key=DUPLICATE_KEY)
+    stats = import_csv(csv_path, repository, chunk_size=3, on_duplicate='report')
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (3, 1, 0)
+    stats = import_csv(csv_path, repository, on_duplicate='merge')
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (0, 4, 0)
+    repository.close()
+
+
+def test_unjournaled_batch_is_not_counted_as_duplicates(csv_path, tmp_path, monkeypatch):
+    target = tmp_path / 'cars.csv'
+    target.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    repository = CsvCarRepository(CachedCsvDataSource(str(target)), instrumentation=Instrumentation(sink=None))
+
+    def fail(*args, **kwargs):
+        raise OSError("disque plein")
+    # Journal impossible à écrire: chaque lot est refusé en entier (create_cars retourne None).
+    monkeypatch.setattr(repository, '_write_journal', fail)
+    stats = import_csv(csv_path, repository, chunk_size=3)
+    assert (stats['rows_imported'], stats['rows_duplicate'], stats['rows_failed']) == (0, 0, 4)
+    assert repository.count() == 0
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_export_round_trip(csv_path, sqlite_repository, tmp_path, fmt):
+    if fmt == 'parquet':
+        pytest.importorskip('pyarrow')
+    import_csv(csv_path, sqlite_repository)
+    dest_path = str(tmp_path / 'export' / f"cars.{fmt}")
+    assert export_cars(sqlite_repository, dest_path, chunk_size=3)['rows_exported'] == 4
+    exported = pd.read_csv(dest_path) if fmt == 'csv' else pd.read_parquet(dest_path)
+    assert exported['id'].tolist() == [1, 2, 3, 4]
+    assert exported['name'].tolist() == VALID_NAMES
+    assert exported['selling_price'].isna().tolist() == [False, False, True, False]
+
+
+def test_export_rejects_unknown_format(sqlite_repository, tmp_path):
+    with pytest.raises(ValueError):
+        export_cars(sqlite_repository, str(tmp_path / 'cars.json'))
@@ -0,0 +1,31 @@
+"""Sources Parquet / Feather: événements d'instrumentation à la place des messages sur stdout."""
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from columnar_sources import COLUMNAR_FORMATS, convert_csv
+from instrumentation import Instrumentation
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.mark.parametrize('fmt', sorted(COLUMNAR_FORMATS))
+def test_save_and_load_errors_are_events(tmp_path, capsys, events, fmt):
+    source = COLUMNAR_FORMATS[fmt](str(tmp_path / f"cars.{fmt}"), instrumentation=Instrumentation(sink=events.append))
+    assert source.load_data().empty
+    assert source.save_data(pd.DataFrame({'name': ['Maruti 800 AC'], 'year': [2007]}))
+    assert [(event['event'], event['level']) for event in events] == [(f"{fmt}.load_data", 'error'), (f"{fmt}.save_data", 'info')]
+    assert events[1]['rows'] == 1
+    assert capsys.readouterr().out == ''
+
+
+def test_convert_csv_reports_rows(tmp_path, capsys):
+    csv_path = tmp_path / 'cars.csv'
+    csv_path.write_text("name,year\nMaruti 800 AC,2007\nHyundai Verna,2012\n")
+    destination = convert_csv(str(csv_path), str(tmp_path / 'cars.parquet'))
+    assert len(destination.load_data()) == 2
+    assert "2 voitures converties" in capsys.readouterr().out
@@ -0,0 +1,93 @@
+"""Cache de CachedCsvDataSource: succès tant que le fichier est inchangé, invalidation sur mtime/taille."""
+import os
+
+import pytest
+
+from data_manager import CachedCsvDataSource
+from instrumentation import Instrumentation
+
+HEADER = "id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n"
+ROWS = (
+    "0,Maruti 800 AC,2007,60000,70000,Petrol,Individual,Manual,First Owner\n"
+    "1,Hyundai Verna 1.6 SX,2012,600000,100000,Diesel,Individual,Manual,First Owner\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text(HEADER + ROWS)
+    return path
+
+
+@pytest.fixture
+def source(csv_path):
+    return CachedCsvDataSource(str(csv_path), instrumentation=Instrumentation(enabled=True, sink=None))
+
+
+def _stats(source):
+    return source.cache_stats()['hits'], source.cache_stats()['misses']
+
+
+def test_unchanged_file_is_read_once(source):
+    assert len(source.load_data()) == 2
+    assert source.row_count() == 2
+    source.load_data()
+    assert _stats(source) == (2, 1)
+    assert source.cache_stats()['hit_rate'] == pytest.approx(2 / 3)
+    counters = source.instrumentation.snapshot()['counters']
+    assert (counters['csv.cache.hits'], counters['csv.cache.misses'], counters['csv.read.rows']) == (2, 1, 2)
+
+
+def test_loaded_frame_is_a_copy(source):
+    df = source.load_data()
+    df.loc[0, 'name'] = 'Modifiée'
+    assert source.load_data().loc[0, 'name'] == 'Maruti 800 AC'
+
+
+def test_size_change_invalidates(source, csv_path):
+    version = source.data_version()
+    source.load_data()
+    with open(csv_path, 'a') as f:
+        f.write("2,Tata Nano,2015,100000,30000,Petrol,Individual,Manual,Second Owner\n")
+    assert source.load_data()['name'].tolist()[-1] == 'Tata Nano'
+    assert _stats(source) == (0, 2)
+    assert source.data_version() != version
+
+
+def test_mtime_change_with_same_size_invalidates(source, csv_path):
+    source.load_data()
+    stat = os.stat(csv_path)
+    csv_path.write_text(HEADER + ROWS.replace('Maruti', 'Suzuki'))
+    # Même taille: seule la date de modification (forcée dans le futur) distingue les deux versions.
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert os.stat(csv_path).st_size == stat.st_size
+    assert source.load_data().loc[0, 'name'] == 'Suzuki 800 AC'
+    assert _stats(source) == (0, 2)
+
+
+def test_missing_file_is_not_cached(tmp_path):
+    source = CachedCsvDataSource(str(tmp_path / 'absent.csv'))
+    assert source.load_data().empty
+    (tmp_path / 'absent.csv').write_text(HEADER + ROWS)
+    assert len(source.load_data()) == 2
+    assert _stats(source) == (0, 2)
+
+
+def test_save_data_writes_through(source):
+    df = source.load_data()
+    source.save_data(df.iloc[:1])
+    # Le cache reflète l'écriture sans relire le fichier.
+    assert len(source.load_data()) == 1
+    assert _stats(source) == (1, 1)
+    source.invalidate()
+    assert len(source.load_data()) == 1
+    assert _stats(source) == (1, 2)
+
+
+def test_cold_iter_chunks_does_not_fill_the_cache(source):
+    assert [len(chunk) for chunk in source.iter_chunks(1)] == [1, 1]
+    assert _stats(source) == (0, 0)
+    source.load_data()
+    assert [len(chunk) for chunk in source.iter_chunks(1)] == [1, 1]
+    assert _stats(source) == (1, 1)
@@ -0,0 +1,56 @@
+"""Plusieurs processus écrivant le même CSV (journal partagé, verrou du fichier)."""
+import multiprocessing
+
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, CsvDataSource
+
+WORKERS = 4
+CARS_PER_WORKER = 20
+
+
+def _write_cars(csv_path, worker, flush_threshold):
+    with CsvCarRepository(CachedCsvDataSource(csv_path), flush_threshold=flush_threshold) as repository:
+        for i in range(CARS_PER_WORKER):
+            car = repository.create_car({'name': f"Worker {worker}-{i}", 'year': 2020})
+            if i % 5 == 0:
+                repository.update_car(car['id'], {'km_driven': i})
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text("id,name,year,selling_price,km_driven\n0,Maruti 800 AC,2007,60000,70000\n1,Hyundai Verna,2012,600000,100000\n")
+    return str(path)
+
+
+@pytest.mark.parametrize('flush_threshold', [1000, 3, 1])
+def test_concurrent_writers_keep_every_row(csv_path, flush_threshold):
+    processes = [multiprocessing.Process(target=_write_cars, args=(csv_path, worker, flush_threshold))
+                 for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    df = CsvCarRepository(CsvDataSource(csv_path)).get_all_cars()
+    created = df[df['name'].str.startswith('Worker')]
+    assert len(df) == 2 + WORKERS * CARS_PER_WORKER
+    assert df['id'].is_unique
+    assert created['km_driven'].notna().sum() == WORKERS * (CARS_PER_WORKER // 5)
+
+
+def test_writes_of_another_repository_are_visible_before_flush(csv_path):
+    first = CsvCarRepository(CachedCsvDataSource(csv_path))
+    second = CsvCarRepository(CachedCsvDataSource(csv_path))
+    created = first.create_car({'name': 'Tata Nano', 'year': 2015})
+    # Le second dépôt reporte l'opération journalisée et attribue l'id suivant.
+    assert second.get_car_by_id(created['id'])['name'] == 'Tata Nano'
+    assert second.create_car({'name': 'Renault Kwid', 'year': 2019})['id'] == created['id'] + 1
+    # Le flush du second écrit aussi l'opération du premier; le premier recharge le CSV sans la perdre.
+    second.flush()
+    first.delete_car(0)
+    first.close()
+    names = CsvCarRepository(CsvDataSource(csv_path)).get_all_cars()['name'].tolist()
+    assert names == ['Hyundai Verna', 'Tata Nano', 'Renault Kwid']
@@ -0,0 +1,96 @@
+"""Journal d'écriture du dépôt CSV: report au démarrage, flush interrompu, lignes retournées."""
+import shutil
+
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, CsvDataSource
+
+CSV_CONTENT = (
+    "id,name,year,selling_price,km_driven,fuel\n"
+    "0,Maruti 800 AC,2007,60000,70000,Petrol\n"
+    "1,Hyundai Verna 1.6 SX,2012,600000,100000,Diesel\n"
+    "2,Kia Seltos HTX,2020,1350000,12000,Diesel\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text(CSV_CONTENT)
+    return str(path)
+
+
+def _open(csv_path):
+    return CsvCarRepository(CachedCsvDataSource(csv_path), flush_threshold=1000)
+
+
+def _write_operations(repository):
+    created = repository.create_car({'name': 'Tata Nano', 'year': 2015})
+    repository.update_car(1, {'km_driven': 110000})
+    repository.update_car(created['id'], {'selling_price': 150000})
+    repository.delete_car(0)
+    repository.delete_car(repository.create_car({'name': 'Renault Kwid'})['id'])
+    return created['id']
+
+
+def _snapshot(repository):
+    cars = repository.get_all_cars()
+    pages, after_id = [], None
+    while True:
+        page, after_id = repository.get_cars_page(after_id, limit=2)
+        pages.extend(page['id'].tolist())
+        if after_id is None:
+            break
+    return repository.count(), cars['id'].tolist(), pages, cars.set_index('id')['km_driven'].to_dict()
+
+
+def test_journal_is_replayed_after_restart(csv_path):
+    repository = _open(csv_path)
+    created_id = _write_operations(repository)
+    expected = _snapshot(repository)
+    # Pas de flush: les opérations ne sont que dans le journal.
+    reopened = _open(csv_path)
+    assert _snapshot(reopened) == expected
+    assert reopened.get_car_by_id(created_id)['selling_price'] == 150000
+
+
+def test_replay_after_interrupted_flush_is_idempotent(csv_path):
+    repository = _open(csv_path)
+    _write_operations(repository)
+    journal = repository.journal_path
+    shutil.copy(journal, f"{journal}.crash")
+    repository.flush()
+    expected = _snapshot(_open(csv_path))
+    # Crash simulé entre save_data et la remise à zéro du journal: le CSV contient déjà les opérations.
+    shutil.copy(f"{journal}.crash", journal)
+    reopened = _open(csv_path)
+    count, ids, pages, _ = snapshot = _snapshot(reopened)
+    assert snapshot == expected
+    assert count == len(ids) == len(pages)
+    reopened.flush()
+    assert CsvCarRepository(CsvDataSource(csv_path)).get_all_cars()['id'].tolist() == ids
+
+
+def test_created_car_has_every_column(csv_path):
+    repository = _open(csv_path)
+    created = repository.create_car({'name': 'Tata Nano'})
+    assert created == {'id': 3, 'name': 'Tata Nano', 'year': None, 'selling_price': None, 'km_driven': None, 'fuel': None}
+    assert set(repository.create_cars([{'name': 'A'}, {'name': 'B', 'year': 2019}])[1]) == set(created)
+
+
+def test_count_without_loading_the_file(csv_path):
+    source = CachedCsvDataSource(csv_path)
+    repository = CsvCarRepository(source, flush_threshold=1000)
+    # Rien en attente: nombre de lignes de la source, sans charger le DataFrame de travail.
+    assert repository.count() == 3
+    assert repository._df is None
+    repository.create_car({'name': 'Tata Nano'})
+    repository.delete_car(0)
+    assert repository.count() == 3
+    # Opérations d'un autre dépôt (journal partagé) prises en compte.
+    other = _open(csv_path)
+    assert other.count() == 3
+    other.delete_car(1)
+    assert repository.count() == 2
+    repository.flush()
+    assert _open(csv_path).count() == 2
@@ -0,0 +1,118 @@
+"""Doublons à la création (dedup_key, on_duplicate) et find_duplicates, sur les dépôts CSV et SQLite."""
+import pytest
+
+from data_manager import DUPLICATE_KEY, CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from instrumentation import Instrumentation
+
+MARUTI = {'name': 'Maruti 800 AC', 'year': 2007, 'selling_price': 60000, 'km_driven': 70000, 'fuel': 'Petrol', 'owner': 'First Owner'}
+VERNA = {'name': 'Hyundai Verna 1.6 SX', 'year': 2012, 'selling_price': 600000, 'km_driven': 100000, 'fuel': 'Diesel'}
+
+
+@pytest.fixture(params=['csv', 'sqlite'])
+def make_repository(request, tmp_path):
+    repositories = []
+
+    def make(**kwargs):
+        if request.param == 'csv':
+            path = tmp_path / 'cars.csv'
+            path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+            repository = CsvCarRepository(CachedCsvDataSource(str(path)), **kwargs)
+        else:
+            repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format='records', **kwargs)
+        repositories.append(repository)
+        return repository
+
+    yield make
+    for repository in repositories:
+        repository.close()
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def repository(make_repository, events):
+    repository = make_repository(dedup_key=DUPLICATE_KEY)
+    repository.instrumentation = Instrumentation(sink=events.append)
+    repository.create_cars([MARUTI, VERNA], on_duplicate='allow')
+    return repository
+
+
+def _ids(cars):
+    return [car['id'] for car in (cars if isinstance(cars, list) else cars.to_dict('records'))]
+
+
+def test_allow_creates_the_duplicate(repository):
+    created = repository.create_car(dict(MARUTI), on_duplicate='allow')
+    maruti_ids = sorted(_ids(repository.search_cars('name', 'Maruti')))
+    assert repository.count() == 3
+    assert len(maruti_ids) == 2 and maruti_ids[1] == created['id']
+    duplicates = repository.find_duplicates()
+    duplicates = duplicates if isinstance(duplicates, list) else duplicates.to_dict('records')
+    assert [(car['id'], car['duplicate_of']) for car in duplicates] == [(maruti_ids[0], maruti_ids[0]), (maruti_ids[1], maruti_ids[0])]
+
+
+def test_skip_returns_the_existing_car(repository):
+    existing = repository.search_cars('name', 'Maruti')
+    result = repository.create_car({**MARUTI, 'fuel': 'CNG'})  # politique par défaut du dépôt: 'skip'
+    assert result['id'] == _ids(existing)[0]
+    assert result['fuel'] == 'Petrol'
+    assert repository.count() == 2
+
+
+def test_merge_copies_non_null_values(repository):
+    result = repository.create_car({**MARUTI, 'fuel': 'CNG', 'owner': None, 'transmission': 'Manual'}, on_duplicate='merge')
+    assert repository.count() == 2
+    car = repository.get_car_by_id(result['id'])
+    assert (car['fuel'], car['owner'], car['transmission']) == ('CNG', 'First Owner', 'Manual')
+
+
+def test_report_refuses_and_signals(repository, events):
+    assert repository.create_car(dict(VERNA), on_duplicate='report') is None
+    assert repository.count() == 2
+    assert [(event['level'], event['policy']) for event in events if event['event'].endswith('.duplicates')] == [('warning', 'report')]
+
+
+def test_duplicates_inside_one_batch(repository):
+    new_car = {'name': 'Tata Nano', 'year': 2015, 'selling_price': 100000, 'km_driven': 30000}
+    results = repository.create_cars([new_car, dict(new_car), dict(MARUTI)], on_duplicate='skip')
+    assert results[0]['id'] == results[1]['id']
+    assert repository.count() == 3
+
+
+def test_missing_key_values_are_equal(repository):
+    first = repository.create_car({'name': 'Renault Kwid'})
+    assert repository.create_car({'name': 'Renault Kwid', 'fuel': 'Petrol'})['id'] == first['id']
+    assert repository.count() == 3
+
+
+def test_deleted_car_no_longer_blocks_creation(repository):
+    maruti_id = _ids(repository.search_cars('name', 'Maruti'))[0]
+    repository.delete_car(maruti_id)
+    assert repository.create_car(dict(MARUTI))['id'] != maruti_id
+    assert repository.count() == 2
+
+
+def test_policies_require_a_key(make_repository):
+    repository = make_repository()
+    assert repository.create_car(dict(MARUTI)) is not None
+    with pytest.raises(ValueError):
+        repository.create_car(dict(MARUTI), on_duplicate='skip')
+    with pytest.raises(ValueError):
+        make_repository(dedup_key=DUPLICATE_KEY, on_duplicate='ignore')
+
+
+def test_only_duplicates_after_journal_replay(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text("id,name,year,selling_price,km_driven\n0,Maruti 800 AC,2007,60000,70000\n")
+    writer = CsvCarRepository(CachedCsvDataSource(str(path)), flush_threshold=1000)
+    writer.create_car({'name': 'Tata Nano', 'year': 2015})
+    # Le second dépôt rejoue la création journalisée: aucune opération propre, mais un journal non vide.
+    repository = CsvCarRepository(CachedCsvDataSource(str(path)), dedup_key=['name', 'year'], flush_threshold=1000)
+    assert repository.create_car({'name': 'Tata Nano', 'year': 2015})['id'] == 1
+    assert repository.create_car({'name': 'Maruti 800 AC', 'year': 2007}, on_duplicate='report') is None
+    assert repository.count() == 2
+    repository.close()
+    writer.close()
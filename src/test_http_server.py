@@ -0,0 +1,125 @@
+"""Service HTTP/JSON (http_server.py) sur un port local: routes, ETag, cache."""
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from http_server import CarHttpServer, CarHttpService, CarRequestHandler
+
+CARS = [
+    {'name': 'Maruti 800 AC', 'year': 2007, 'selling_price': 60000, 'km_driven': 70000, 'fuel': 'Petrol'},
+    {'name': 'Hyundai Verna 1.6 SX', 'year': 2012, 'selling_price': 600000, 'km_driven': 100000, 'fuel': 'Diesel'},
+    {'name': 'Tata Nano', 'year': 2015, 'selling_price': None, 'km_driven': 30000, 'fuel': 'Petrol'},
+]
+
+
+def _make_repository(kind, tmp_path):
+    if kind == 'csv':
+        path = tmp_path / 'cars.csv'
+        path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+        repository = CsvCarRepository(CachedCsvDataSource(str(path)))
+    else:
+        repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format=kind)
+    repository.create_cars([dict(car) for car in CARS])
+    return repository
+
+
+@pytest.fixture(params=['csv', 'frame', 'records'])
+def server(request, tmp_path):
+    repository = _make_repository(request.param, tmp_path)
+    server = CarHttpServer(('127.0.0.1', 0), CarHttpService(repository), workers=4, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    repository.close()
+
+
+class Client:
+    def __init__(self, server):
+        self.connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+
+    def request(self, method, path, body=None, headers=None):
+        payload = None if body is None else json.dumps(body)
+        self.connection.request(method, path, payload, headers or {})
+        response = self.connection.getresponse()
+        data = response.read()
+        return response.status, response.getheader('ETag'), json.loads(data) if data else None
+
+
+@pytest.fixture
+def client(server):
+    client = Client(server)
+    yield client
+    client.connection.close()
+
+
+def test_list_and_search_routes(client):
+    status, _, page = client.request('GET', '/cars?limit=2')
+    assert status == 200
+    assert [car['name'] for car in page['cars']] == ['Maruti 800 AC', 'Hyundai Verna 1.6 SX']
+    status, _, rest = client.request('GET', f"/cars?after_id={page['next_after_id']}")
+    assert [car['selling_price'] for car in rest['cars']] == [None]
+    status, _, found = client.request('GET', '/cars/search?attribute=fuel&value=Petrol')
+    assert status == 200 and len(found['cars']) == 2
+    status, _, queried = client.request('POST', '/cars/query', {'predicates': [['year', '>=', 2012]], 'order_by': ['-year']})
+    assert [car['year'] for car in queried['cars']] == [2015, 2012]
+    status, _, groups = client.request('POST', '/cars/aggregate', {'group_by': 'fuel', 'metrics': {'n': ['count', '*']}})
+    assert {group['fuel']: group['n'] for group in groups['groups']} == {'Diesel': 1, 'Petrol': 2}
+
+
+def test_get_car_and_not_found(client):
+    _, _, page = client.request('GET', '/cars?limit=1')
+    car_id = page['cars'][0]['id']
+    status, _, car = client.request('GET', f"/cars/{car_id}")
+    assert status == 200 and car['name'] == 'Maruti 800 AC'
+    assert client.request('GET', '/cars/999')[0] == 404
+    assert client.request('DELETE', '/cars/999')[0] == 404
+    assert client.request('GET', '/voitures')[0] == 404
+    assert client.request('POST', '/cars', {'year': 2020})[0] == 400
+
+
+def test_etag_not_modified(client):
+    status, etag, body = client.request('GET', '/cars/count')
+    assert status == 200 and body == {'count': 3} and etag
+    status, same_etag, body = client.request('GET', '/cars/count', headers={'If-None-Match': etag})
+    assert (status, same_etag, body) == (304, etag, None)
+
+
+def test_write_invalidates_cache(server, client):
+    _, etag, _ = client.request('GET', '/cars/count')
+    client.request('GET', '/cars/count')
+    assert server.service.cache_stats()['hits'] == 1
+    status, _, created = client.request('POST', '/cars', {'name': 'Renault Kwid', 'year': 2019})
+    assert status == 201
+    status, new_etag, body = client.request('GET', '/cars/count', headers={'If-None-Match': etag})
+    assert (status, body) == (200, {'count': 4}) and new_etag != etag
+    status, _, updated = client.request('PATCH', f"/cars/{created['id']}", {'km_driven': 1000})
+    assert status == 200 and updated['km_driven'] == 1000
+    assert client.request('GET', f"/cars/{created['id']}")[2]['km_driven'] == 1000
+
+
+def test_idle_keepalive_connections_do_not_block_the_pool(tmp_path):
+    repository = _make_repository('records', tmp_path)
+    server = CarHttpServer(('127.0.0.1', 0), CarHttpService(repository), workers=2, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    idle = [Client(server) for _ in range(2)]
+    try:
+        for client in idle:
+            assert client.request('GET', '/cars/count')[0] == 200
+        # Les deux threads du pool sont retenus par des connexions inactives: la troisième est servie sans attendre leur délai.
+        begin = time.monotonic()
+        other = Client(server)
+        assert other.request('GET', '/cars/count')[0] == 200
+        assert time.monotonic() - begin < CarRequestHandler.timeout / 3
+        other.connection.close()
+    finally:
+        for client in idle:
+            client.connection.close()
+        server.shutdown()
+        server.server_close()
+        repository.close()
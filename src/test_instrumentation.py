@@ -0,0 +1,115 @@
+"""Instrumentation (instrumentation.py): compteurs et histogrammes des dépôts, puits d'événements, profils."""
+import json
+
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from instrumentation import Histogram, Instrumentation, default_instrumentation, rows_in
+
+
+@pytest.fixture(params=['csv', 'sqlite', 'records'])
+def repository(request, tmp_path):
+    instrumentation = Instrumentation(enabled=True, sink=None)
+    if request.param == 'csv':
+        path = tmp_path / 'cars.csv'
+        path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+        repository = CsvCarRepository(CachedCsvDataSource(str(path), instrumentation=instrumentation), instrumentation=instrumentation)
+    else:
+        repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), instrumentation=instrumentation,
+                                         result_format='records' if request.param == 'records' else 'frame')
+    repository.create_cars([{'name': 'Maruti 800 AC', 'year': 2007}, {'name': 'Hyundai Verna 1.6 SX', 'year': 2012},
+                            {'name': 'Maruti Swift VXI', 'year': 2012}])
+    instrumentation.reset()
+    yield repository
+    repository.close()
+
+
+def test_repository_calls_rows_and_latency(repository):
+    prefix = repository.metrics_prefix
+    repository.search_cars('name', 'maruti')
+    repository.search_cars('year', 2012)
+    repository.get_cars_page(None, 2)
+    repository.get_car_by_id(12345)
+    snapshot = repository.instrumentation.snapshot()
+    counters = snapshot['counters']
+    assert (counters[f"{prefix}.search_cars.calls"], counters[f"{prefix}.search_cars.rows"]) == (2, 4)
+    # Page en DataFrame ou en liste de dicts: les lignes de la page sont comptées dans les deux cas.
+    assert (counters[f"{prefix}.get_cars_page.calls"], counters[f"{prefix}.get_cars_page.rows"]) == (1, 2)
+    assert counters[f"{prefix}.get_car_by_id.rows"] == 0
+    latency = snapshot['histograms'][f"{prefix}.search_cars.ms"]
+    assert latency['count'] == 2 and 0 <= latency['min'] <= latency['p50'] <= latency['max']
+
+
+def test_disabled_instrumentation_collects_nothing(repository):
+    repository.instrumentation.disable()
+    repository.search_cars('name', 'maruti')
+    repository.search_cars('couleur', 'rouge')
+    assert repository.instrumentation.snapshot() == {'counters': {}, 'histograms': {}}
+
+
+def test_events_reach_the_sink_above_min_level():
+    events = []
+    instrumentation = Instrumentation(sink=events.append, min_level='warning')
+    instrumentation.info('test.info', "ignoré")
+    instrumentation.warning('test.warning', "retenu", column='couleur')
+    instrumentation.error('test.error', "retenu aussi")
+    assert [(event['level'], event['event']) for event in events] == [('warning', 'test.warning'), ('error', 'test.error')]
+    assert events[0]['column'] == 'couleur' and events[0]['message'] == "retenu"
+    # Les événements sont comptés par niveau quand les métriques sont actives, même filtrés.
+    instrumentation.enable()
+    instrumentation.info('test.info', "ignoré")
+    instrumentation.set_sink(None)
+    instrumentation.error('test.error', "muet")
+    assert len(events) == 2
+    assert instrumentation.snapshot()['counters'] == {'events.info': 1, 'events.error': 1}
+
+
+def test_default_sink_prints_until_silenced(tmp_path, capsys):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'))
+    sink, min_level = default_instrumentation.sink, default_instrumentation.min_level
+    try:
+        repository.search_cars('couleur', 'rouge')
+        assert "couleur" in capsys.readouterr().out
+        default_instrumentation.set_sink(None)
+        repository.search_cars('couleur', 'rouge')
+        repository.create_car({'name': 'Tata Nano'})
+        assert capsys.readouterr().out == ''
+    finally:
+        default_instrumentation.sink, default_instrumentation.min_level = sink, min_level
+        repository.close()
+
+
+def test_timer_counts_errors():
+    instrumentation = Instrumentation(enabled=True, sink=None)
+    with pytest.raises(ZeroDivisionError):
+        with instrumentation.timer('calcul'):
+            1 / 0
+    snapshot = instrumentation.snapshot()
+    assert snapshot['counters'] == {'calcul.errors': 1}
+    assert snapshot['histograms']['calcul.ms']['count'] == 1
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(bounds=(1, 10, 100))
+    for value in [0.5] * 50 + [5] * 40 + [50] * 9 + [500]:
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert (snapshot['p50'], snapshot['p90'], snapshot['p99']) == (1, 10, 100)
+    assert snapshot['buckets'] == {'<=1': 50, '<=10': 40, '<=100': 9, '+inf': 1}
+    assert histogram.quantile(1.0) == 500
+
+
+def test_rows_in():
+    assert [rows_in(result) for result in (None, {'id': 1}, [{'id': 1}, None], ([{'id': 1}, {'id': 2}], 2), 'texte')] == [0, 1, 1, 2, 0]
+
+
+def test_export_json_and_profile(tmp_path):
+    instrumentation = Instrumentation(enabled=True, sink=None)
+    instrumentation.count('appels', 3)
+    path = tmp_path / 'metrics.json'
+    instrumentation.export_json(str(path))
+    assert json.loads(path.read_text())['counters'] == {'appels': 3}
+    with instrumentation.profile(top=3) as capture:
+        sorted(range(10000), key=lambda value: -value)
+    assert capture.elapsed > 0 and capture.memory_peak is not None
+    assert 'sorted' in capture.report()
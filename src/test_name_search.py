@@ -0,0 +1,69 @@
+"""Recherche par nom: index FTS5 (SQLite) et index inversé NameTokenIndex (CSV) trouvent les mêmes voitures."""
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, NameTokenIndex, SQLiteCarRepository
+
+NAMES = [
+    'Maruti Swift Dzire VDI', 'Maruti Swift VXI', 'Škoda Octavia 1.8 TSI', 'Hyundai Verna 1.6 SX',
+    'Hyundai i20 Sportz', 'Mahindra XUV500 W8 2WD', 'Maruti 800 AC', 'Honda City 1.5 V MT',
+]
+QUERIES = ['swift', 'SWIFT dz', 'skoda', 'Škoda', '1.6', 'maru sw', 'i2', 'W8 2wd', ' City ', 'zzz', '-']
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    csv_repository = CsvCarRepository(CachedCsvDataSource(str(path)))
+    sqlite_repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format='records')
+    assert sqlite_repository.fts_enabled
+    for repository in (csv_repository, sqlite_repository):
+        repository.create_cars([{'name': name, 'year': 2010 + position} for position, name in enumerate(NAMES)])
+    yield csv_repository, sqlite_repository
+    csv_repository.close()
+    sqlite_repository.close()
+
+
+def _records(cars):
+    return cars if isinstance(cars, list) else cars.to_dict('records')
+
+
+def _names(cars):
+    return sorted(car['name'] for car in _records(cars))
+
+
+def _assert_same_search(repositories, query):
+    csv_repository, sqlite_repository = repositories
+    assert _names(csv_repository.search_cars('name', query)) == _names(sqlite_repository.search_cars('name', query))
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_parity(repositories, query):
+    _assert_same_search(repositories, query)
+
+
+def test_prefix_tokens_accents_and_case():
+    index = NameTokenIndex(NAMES + [None])
+    assert [NAMES[position] for position in index.search('maru SW')] == ['Maruti Swift VXI', 'Maruti Swift Dzire VDI']
+    assert index.search('skoda') == [2]
+    assert index.search('zzz') == []
+    # Aucun jeton: l'appelant revient à la recherche par sous-chaîne.
+    assert index.search('  -  ') is None
+
+
+def test_contains_predicate_parity(repositories):
+    csv_repository, sqlite_repository = repositories
+    predicates = [('name', 'contains', 'maruti'), ('year', '>=', 2001)]
+    assert _names(csv_repository.query_cars(predicates)) == _names(sqlite_repository.query_cars(predicates)) == [
+        'Maruti 800 AC', 'Maruti Swift Dzire VDI', 'Maruti Swift VXI']
+
+
+def test_index_follows_writes(repositories):
+    for repository in repositories:
+        swift_ids = [car['id'] for car in _records(repository.search_cars('name', 'swift'))]
+        repository.update_car(swift_ids[0], {'name': 'Maruti Baleno Alpha'})
+        repository.delete_car(swift_ids[1])
+        repository.create_car({'name': 'Maruti Swift ZXI Plus', 'year': 2020})
+    for query in ['swift', 'baleno', 'dzire', 'vxi', 'maruti']:
+        _assert_same_search(repositories, query)
+    assert _names(repositories[1].search_cars('name', 'swift')) == ['Maruti Swift ZXI Plus']
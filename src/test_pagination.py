@@ -0,0 +1,83 @@
+"""Pagination par clé (get_cars_page) et parcours en flux (iter_cars), y compris quand des voitures sont supprimées entre deux pages."""
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+
+
+@pytest.fixture(params=['csv', 'frame', 'records'])
+def repository(request, tmp_path):
+    if request.param == 'csv':
+        path = tmp_path / 'cars.csv'
+        path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+        repository = CsvCarRepository(CachedCsvDataSource(str(path)), flush_threshold=1000)
+    else:
+        repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format=request.param)
+    repository.create_cars([{'name': f"Voiture {number}", 'year': 2000 + number} for number in range(10)])
+    yield repository
+    repository.close()
+
+
+def _names(cars):
+    return [car['name'] for car in (cars if isinstance(cars, list) else cars.to_dict('records'))]
+
+
+def _first_id(page):
+    return int((page[0] if isinstance(page, list) else page.iloc[0])['id'])
+
+
+def _all_pages(repository, limit):
+    pages = []
+    after_id = None
+    while True:
+        page, after_id = repository.get_cars_page(after_id, limit)
+        pages.append(_names(page))
+        if after_id is None:
+            return pages
+
+
+@pytest.mark.parametrize('limit, sizes', [(3, [3, 3, 3, 1]), (5, [5, 5]), (10, [10]), (20, [10])])
+def test_pages_cover_every_car_once(repository, limit, sizes):
+    pages = _all_pages(repository, limit)
+    # La dernière page pleine n'annonce pas de page suivante vide.
+    assert [len(page) for page in pages] == sizes
+    assert sum(pages, []) == [f"Voiture {number}" for number in range(10)]
+
+
+def test_deletes_between_pages(repository):
+    first, after_id = repository.get_cars_page(None, 3)
+    ids = [car['id'] for car in (first if isinstance(first, list) else first.to_dict('records'))]
+    # Suppressions avant et juste après la clé de reprise: la page suivante n'en est pas décalée.
+    repository.delete_cars([ids[0], after_id + 1, after_id + 2])
+    second, after_id = repository.get_cars_page(after_id, 3)
+    assert _names(second) == ['Voiture 5', 'Voiture 6', 'Voiture 7']
+    repository.delete_car(after_id)
+    third, after_id = repository.get_cars_page(after_id, 3)
+    assert (_names(third), after_id) == (['Voiture 8', 'Voiture 9'], None)
+
+
+def test_deleted_cars_do_not_shorten_pages(repository):
+    first_id = _first_id(repository.get_cars_page(None, 1)[0])
+    repository.delete_cars([first_id + offset for offset in range(0, 8, 2)])
+    assert _all_pages(repository, 2) == [['Voiture 1', 'Voiture 3'], ['Voiture 5', 'Voiture 7'], ['Voiture 8', 'Voiture 9']]
+
+
+def test_creation_after_the_last_page(repository):
+    _, after_id = repository.get_cars_page(None, 10)
+    assert after_id is None
+    _, last_id = repository.get_cars_page(None, 9)
+    repository.create_car({'name': 'Voiture 10', 'year': 2010})
+    assert _names(repository.get_cars_page(last_id, 5)[0]) == ['Voiture 9', 'Voiture 10']
+
+
+def test_empty_limit(repository):
+    page, after_id = repository.get_cars_page(None, 0)
+    assert (len(page), after_id) == (0, None)
+
+
+@pytest.mark.parametrize('as_frames', [True, False])
+def test_iter_cars_skips_deleted(repository, as_frames):
+    first_id = _first_id(repository.get_cars_page(None, 1)[0])
+    repository.delete_car(first_id + 4)
+    items = list(repository.iter_cars(chunk_size=4, as_frames=as_frames))
+    names = sum((list(chunk['name']) for chunk in items), []) if as_frames else [car['name'] for car in items]
+    assert names == [f"Voiture {number}" for number in range(10) if number != 4]
@@ -0,0 +1,122 @@
+"""Source CSV partitionnée (partitioned.py): mêmes résultats qu'un CSV unique, partitions écartées, pool de processus."""
+import pandas as pd
+import pytest
+
+from data_manager import CsvCarRepository, CsvDataSource
+from instrumentation import Instrumentation
+from partitioned import PartitionedCsvDataSource
+
+CSV_CONTENT = (
+    "id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n"
+    "0,Maruti 800 AC,2007,60000,70000,Petrol,Individual,Manual,First Owner\n"
+    "1,Hyundai Verna 1.6 SX,2012,600000,100000,Diesel,Individual,Manual,First Owner\n"
+    "2,Kia Seltos HTX,2020,1350000,12000,Diesel,Dealer,Automatic,First Owner\n"
+    "3,Tata Nexon EV,2021,1400000,8000,Electric,Dealer,Automatic,First Owner\n"
+    "4,Maruti Wagon R CNG,2015,300000,0,CNG,Individual,Manual,Second Owner\n"
+    "5,Honda City,2017,,40000,Petrol,Dealer,Manual,First Owner\n"
+    "6,Toyota Innova,2010,500000,150000,Diesel,Individual,Manual,Third Owner\n"
+    "7,Renault Kwid,,250000,25000,Petrol,Dealer,Manual,First Owner\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text(CSV_CONTENT)
+    return str(path)
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def source(csv_path, tmp_path, events):
+    source = PartitionedCsvDataSource(str(tmp_path / 'partitions'), partition_column='fuel', workers=2,
+                                      instrumentation=Instrumentation(enabled=True, sink=events.append))
+    source.save_data(CsvDataSource(csv_path, typed_schema=False).load_data())
+    yield source
+    source.close()
+
+
+@pytest.fixture
+def repositories(csv_path, source):
+    # Dépôt sur le CSV unique (référence) et dépôt sur les partitions du même contenu.
+    return CsvCarRepository(CsvDataSource(csv_path)), CsvCarRepository(source)
+
+
+def _same(left, right):
+    # Deux résultats vides (erreur signalée puis DataFrame vide) ne prouveraient rien.
+    assert len(right) > 0
+    pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('metrics', [
+    {'price_per_km': ('max', 'price_per_km')},
+    {'year': ('mean', 'selling_price'), 'n': ('count', '*')},
+])
+def test_metric_named_like_a_column(repositories, metrics):
+    single, partitioned = repositories
+    _same(partitioned.aggregate('fuel', metrics), single.aggregate('fuel', metrics))
+
+
+def test_one_file_per_partition(source):
+    assert sorted(source.partitions()) == ['CNG', 'Diesel', 'Electric', 'Petrol']
+    assert source.row_count() == 8
+
+
+@pytest.mark.parametrize('predicates, expected_ids, pruned', [
+    ([('fuel', 'in', ['Diesel', 'CNG'])], [1, 2, 4, 6], 2),
+    ([('fuel', '=', 'Electric'), ('year', '>', 2000)], [3], 3),
+    ([('fuel', '!=', 'Petrol'), ('km_driven', '<', 50000)], [2, 3, 4], 1),
+    ([('year', '>=', 2015)], [2, 3, 4, 5], 0),
+])
+def test_partition_predicates_prune_files(source, predicates, expected_ids, pruned):
+    df = source.load_data(filters=predicates)
+    assert df['id'].tolist() == expected_ids
+    assert source.instrumentation.snapshot()['counters'].get('partitioned.pruned', 0) == pruned
+
+
+def test_search_and_query_match_single_file(repositories):
+    single, partitioned = repositories
+    for attribute, value in [('transmission', 'Manual'), ('name', 'maruti'), ('year', '2012')]:
+        _same(partitioned.search_cars(attribute, value), single.search_cars(attribute, value))
+    arguments = ([('fuel', 'in', ['Diesel', 'Petrol']), ('selling_price', 'between', (100000, 700000))], ['-year'], 3, 0)
+    _same(partitioned.query_cars(*arguments), single.query_cars(*arguments))
+
+
+def test_search_runs_in_the_process_pool(source, repositories):
+    _, partitioned = repositories
+    partitioned.search_cars('transmission', 'Automatic')
+    assert len(source._executors) == source.workers == 2
+    # Partition modifiée hors du dépôt: le processus qui la garde en mémoire la relit.
+    path = source.partitions()['Electric']
+    with open(path, 'a') as f:
+        f.write("8,Tata Tigor EV,2022,1200000,5000,Electric,Dealer,Automatic,First Owner\n")
+    assert source.load_data(filters=[('fuel', '=', 'Electric')])['name'].tolist() == ['Tata Nexon EV', 'Tata Tigor EV']
+
+
+@pytest.mark.parametrize('group_by, metrics, predicates, bands', [
+    ('fuel', {'n': ('count', '*'), 'prix': ('count', 'selling_price')}, None, None),
+    (['fuel', 'transmission'], {'moyenne': ('mean', 'selling_price'), 'total': ('sum', 'km_driven')}, None, None),
+    ('owner', {'min': ('min', 'year'), 'max': ('max', 'year')}, [('fuel', 'in', ['Diesel', 'CNG'])], None),
+    ('fuel', {'mediane': ('median', 'selling_price')}, None, None),
+    ('selling_price_band', {'n': ('count', '*'), 'km': ('mean', 'km_driven')}, None, {'selling_price': [0, 500000, 1000000]}),
+    (None, {'n': ('count', '*'), 'moyenne': ('mean', 'price_per_km')}, [('year', '>', 2010)], None),
+])
+def test_aggregate_matches_single_file(repositories, group_by, metrics, predicates, bands):
+    # Agrégats partiels combinés (count, sum, min, max, mean) ou lignes filtrées (median): même résultat qu'un CSV unique.
+    single, partitioned = repositories
+    _same(partitioned.aggregate(group_by, metrics, predicates, bands), single.aggregate(group_by, metrics, predicates, bands))
+
+
+def test_flush_rewrites_partitions(source, repositories):
+    _, partitioned = repositories
+    partitioned.create_car({'name': 'Maruti Alto LPG', 'year': 2011, 'fuel': 'LPG'})
+    partitioned.delete_car(3)
+    partitioned.flush()
+    assert sorted(source.partitions()) == ['CNG', 'Diesel', 'LPG', 'Petrol']
+    assert source.row_count() == 8
+    assert CsvCarRepository(source).get_car_by_id(8)['name'] == 'Maruti Alto LPG'
@@ -0,0 +1,74 @@
+"""query_cars: critères combinés, intervalles, tri multi-colonnes et pagination, identiques en CSV et en SQLite."""
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository
+from instrumentation import Instrumentation
+
+CARS = [
+    {'name': 'Maruti 800 AC', 'year': 2007, 'selling_price': 60000, 'km_driven': 70000, 'fuel': 'Petrol'},
+    {'name': 'Hyundai Verna 1.6 SX', 'year': 2012, 'selling_price': 600000, 'km_driven': 100000, 'fuel': 'Diesel'},
+    {'name': 'Kia Seltos HTX', 'year': 2020, 'selling_price': 1350000, 'km_driven': 12000, 'fuel': 'Diesel'},
+    {'name': 'Tata Nexon EV', 'year': 2021, 'selling_price': 1400000, 'km_driven': 8000, 'fuel': 'Electric'},
+    {'name': 'Maruti Wagon R CNG', 'year': 2015, 'selling_price': 300000, 'km_driven': 0, 'fuel': 'CNG'},
+    {'name': 'Honda City', 'year': 2017, 'selling_price': None, 'km_driven': 40000, 'fuel': 'Petrol'},
+    {'name': 'Toyota Innova', 'year': 2012, 'selling_price': 500000, 'km_driven': 150000, 'fuel': 'Diesel'},
+    {'name': 'Renault Kwid', 'year': None, 'selling_price': 250000, 'km_driven': 25000, 'fuel': None},
+]
+
+
+@pytest.fixture
+def repositories(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text("id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n")
+    csv_repository = CsvCarRepository(CachedCsvDataSource(str(path)))
+    sqlite_repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), result_format='records')
+    for repository in (csv_repository, sqlite_repository):
+        repository.create_cars([dict(car) for car in CARS])
+        repository.instrumentation = Instrumentation(sink=None)
+    yield csv_repository, sqlite_repository
+    csv_repository.close()
+    sqlite_repository.close()
+
+
+def _names(cars):
+    return [car['name'] for car in (cars if isinstance(cars, list) else cars.to_dict('records'))]
+
+
+@pytest.mark.parametrize('arguments, expected', [
+    (([('year', '>=', 2015)], ['-year']), ['Tata Nexon EV', 'Kia Seltos HTX', 'Honda City', 'Maruti Wagon R CNG']),
+    (([('selling_price', 'between', (250000, 600000))], ['selling_price']),
+     ['Renault Kwid', 'Maruti Wagon R CNG', 'Toyota Innova', 'Hyundai Verna 1.6 SX']),
+    (([('fuel', 'in', ['Diesel', 'CNG']), ('km_driven', '<', 100000)], ['fuel', 'km_driven']),
+     ['Maruti Wagon R CNG', 'Kia Seltos HTX']),
+    # Ex æquo départagés par l'id; valeur manquante en premier en ordre croissant, en dernier en décroissant.
+    ((None, ['year', '-km_driven'], 4), ['Renault Kwid', 'Maruti 800 AC', 'Toyota Innova', 'Hyundai Verna 1.6 SX']),
+    ((None, ['-selling_price'], 3, 5), ['Renault Kwid', 'Maruti 800 AC', 'Honda City']),
+    (([('name', 'contains', 'maruti'), ('year', '<=', 2015)], ['-year']), ['Maruti Wagon R CNG', 'Maruti 800 AC']),
+    # Une valeur manquante ne satisfait aucun critère, même '!='.
+    (([('fuel', '!=', 'Diesel'), ('selling_price', '>', 0)], ['id']), ['Maruti 800 AC', 'Tata Nexon EV', 'Maruti Wagon R CNG']),
+    (([('year', '<', 2015)], None, 2, 1), ['Hyundai Verna 1.6 SX', 'Toyota Innova']),
+])
+def test_query_parity(repositories, arguments, expected):
+    csv_repository, sqlite_repository = repositories
+    assert _names(csv_repository.query_cars(*arguments)) == expected
+    assert _names(sqlite_repository.query_cars(*arguments)) == expected
+
+
+def test_offset_pages_cover_every_car_once(repositories):
+    for repository in repositories:
+        pages = [_names(repository.query_cars([('km_driven', '>=', 0)], None, 3, offset)) for offset in (0, 3, 6)]
+        assert [len(page) for page in pages] == [3, 3, 2]
+        assert sorted(sum(pages, [])) == sorted(car['name'] for car in CARS)
+
+
+@pytest.mark.parametrize('arguments', [
+    ([('couleur', '=', 'rouge')],),
+    ([('year', 'like', 2012)],),
+    ([('fuel', 'in', 'Diesel')],),
+    ([('year', 'between', 2012)],),
+    (None, ['-couleur']),
+    (None, None, -1),
+])
+def test_invalid_arguments_return_nothing(repositories, arguments):
+    for repository in repositories:
+        assert len(repository.query_cars(*arguments)) == 0
@@ -0,0 +1,68 @@
+"""Chargement en masse SQLite (bulk_insert): index différés et reprise après une interruption."""
+import multiprocessing
+import os
+
+import pytest
+
+from data_manager import CAR_COLUMNS, SQLITE_DEFAULT_INDEXED_COLUMNS, SQLiteCarRepository
+
+ROWS = [
+    ('Maruti 800 AC', 2007, 60000, 70000, 'Petrol', 'Individual', 'Manual', 'First Owner'),
+    ('Hyundai Verna 1.6 SX', 2012, 600000, 100000, 'Diesel', 'Individual', 'Manual', 'First Owner'),
+    ('Kia Seltos HTX', 2020, 1350000, 12000, 'Diesel', 'Dealer', 'Automatic', 'First Owner'),
+]
+
+
+def _interrupted_bulk_insert(db_path):
+    def chunks():
+        yield ROWS
+        # Arrêt brutal du processus entre deux tranches: index et index plein texte pas encore reconstruits.
+        os._exit(1)
+    SQLiteCarRepository(db_path).bulk_insert(chunks())
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'cars.db')
+
+
+def test_bulk_insert_restores_indexes(db_path):
+    repository = SQLiteCarRepository(db_path)
+    assert repository.bulk_insert([ROWS[:2], ROWS[2:]]) == 3
+    assert repository.indexes() == sorted(SQLITE_DEFAULT_INDEXED_COLUMNS)
+    assert repository.fts_enabled
+    assert repository.search_cars('name', 'verna')['name'].tolist() == ['Hyundai Verna 1.6 SX']
+    repository.close()
+
+
+def test_reopening_after_interrupted_bulk_insert_rebuilds_indexes(db_path):
+    SQLiteCarRepository(db_path).close()
+    process = multiprocessing.Process(target=_interrupted_bulk_insert, args=(db_path,))
+    process.start()
+    process.join()
+    assert process.exitcode == 1
+
+    repository = SQLiteCarRepository(db_path)
+    assert repository.count() == len(ROWS)
+    assert repository.indexes() == sorted(SQLITE_DEFAULT_INDEXED_COLUMNS)
+    assert repository.fts_enabled
+    assert any('cars_fts' in step for step in repository.explain('name', 'seltos'))
+    # Les lignes chargées avant l'interruption sont dans l'index plein texte reconstruit.
+    assert repository.search_cars('name', 'seltos')['name'].tolist() == ['Kia Seltos HTX']
+    repository.create_car(dict(zip(CAR_COLUMNS, ('Kia Sonet', 2021, 900000, 5000, 'Petrol', 'Dealer', 'Manual', 'First Owner'))))
+    assert sorted(repository.search_cars('name', 'kia')['name']) == ['Kia Seltos HTX', 'Kia Sonet']
+    repository.close()
+
+
+def test_missing_fts_trigger_rebuilds_name_index(db_path):
+    repository = SQLiteCarRepository(db_path)
+    repository.bulk_insert([ROWS])
+    connection = repository._get_connection()
+    connection.execute("DROP TRIGGER cars_fts_after_insert")
+    connection.commit()
+    # Insertion sans trigger: absente de cars_fts jusqu'à la reconstruction.
+    repository.create_car({'name': 'Kia Sonet'})
+    repository.close()
+    reopened = SQLiteCarRepository(db_path)
+    assert sorted(reopened.search_cars('name', 'kia')['name']) == ['Kia Seltos HTX', 'Kia Sonet']
+    reopened.close()
@@ -0,0 +1,69 @@
+"""Index secondaires SQLite: plans d'exécution (explain, explain_query), création/suppression, indexation automatique."""
+import pytest
+
+from data_manager import SQLITE_DEFAULT_INDEXED_COLUMNS, SQLiteCarRepository
+from instrumentation import Instrumentation
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteCarRepository(str(tmp_path / 'cars.db'), instrumentation=Instrumentation(sink=None))
+    repository.create_cars([
+        {'name': 'Maruti 800 AC', 'year': 2007, 'selling_price': 60000, 'km_driven': 70000, 'fuel': 'Petrol'},
+        {'name': 'Hyundai Verna 1.6 SX', 'year': 2012, 'selling_price': 600000, 'km_driven': 100000, 'fuel': 'Diesel'},
+    ])
+    yield repository
+    repository.close()
+
+
+def _uses(plan, index):
+    return any(f"USING INDEX {index}" in step or f"USING COVERING INDEX {index}" in step for step in plan)
+
+
+def test_default_indexes(repository):
+    assert repository.indexes() == sorted(SQLITE_DEFAULT_INDEXED_COLUMNS)
+
+
+@pytest.mark.parametrize('attribute, value', [('year', 2012), ('selling_price', '600000'), ('km_driven', 70000)])
+def test_numeric_search_uses_its_index(repository, attribute, value):
+    assert _uses(repository.explain(attribute, value), f"idx_cars_{attribute}")
+
+
+def test_search_by_id_uses_the_primary_key(repository):
+    assert repository.explain('id', 1) == ['SEARCH cars USING INTEGER PRIMARY KEY (rowid=?)']
+
+
+def test_query_predicates_and_order_use_indexes(repository):
+    assert _uses(repository.explain_query([('selling_price', 'between', (100000, 700000))]), 'idx_cars_selling_price')
+    assert _uses(repository.explain_query([('fuel', '=', 'Diesel')], ['year']), 'idx_cars_fuel')
+    # Tri seul avec une limite: parcours dans l'ordre de l'index, sans tri temporaire.
+    plan = repository.explain_query(None, ['year'], 5)
+    assert _uses(plan, 'idx_cars_year') and not any('TEMP B-TREE' in step for step in plan)
+
+
+def test_dropped_index_falls_back_to_a_scan(repository):
+    assert repository.drop_index('year')
+    assert 'year' not in repository.indexes()
+    assert repository.explain('year', 2012) == ['SCAN cars']
+    assert repository.create_index('year')
+    assert _uses(repository.explain('year', 2012), 'idx_cars_year')
+    assert not repository.create_index('couleur')
+
+
+def test_invalid_search_has_no_plan(repository):
+    assert repository.explain('couleur', 'rouge') == []
+    assert repository.explain('year', 'deux mille') == []
+
+
+def test_auto_index_after_threshold(tmp_path):
+    events = []
+    repository = SQLiteCarRepository(str(tmp_path / 'auto.db'), indexed_columns=(), auto_index_threshold=2,
+                                     instrumentation=Instrumentation(sink=events.append))
+    assert repository.indexes() == [] and repository.explain('year', 2012) == ['SCAN cars']
+    repository.search_cars('year', 2012)
+    assert repository.indexes() == []
+    repository.search_cars('year', 2015)
+    assert repository.indexes() == ['year']
+    assert _uses(repository.explain('year', 2012), 'idx_cars_year')
+    assert [event['level'] for event in events if 'index' in event['event']] == ['info']
+    repository.close()
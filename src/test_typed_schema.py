@@ -0,0 +1,72 @@
+"""Schéma compact (catégories, entiers réduits ou nullables) et filtres de query_cars / aggregate."""
+import pandas as pd
+import pytest
+
+from data_manager import CachedCsvDataSource, CsvCarRepository, SQLiteCarRepository, predicate_mask
+
+CSV_CONTENT = (
+    "id,name,year,selling_price,km_driven,fuel,seller_type,transmission,owner\n"
+    "0,Maruti 800 AC,2007,60000,70000,Petrol,Individual,Manual,First Owner\n"
+    "1,Hyundai Verna 1.6 SX,2012,600000,100000,Diesel,Individual,Manual,First Owner\n"
+    "2,Kia Seltos HTX,2020,1350000,12000,Diesel,Dealer,Automatic,First Owner\n"
+    "3,Tata Nexon EV,2021,1400000,8000,Electric,Dealer,Automatic,First Owner\n"
+)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    path = tmp_path / 'cars.csv'
+    path.write_text(CSV_CONTENT)
+    repository = CsvCarRepository(CachedCsvDataSource(str(path)))
+    # Une voiture sans année ni prix: les colonnes d'entiers passent en Int16 / Int32 (nullables).
+    repository.create_car({'name': 'Voiture sans année'})
+    return repository
+
+
+def _ids(df):
+    return sorted(df['id'].tolist())
+
+
+def test_missing_integer_makes_columns_nullable(repository):
+    dtypes = repository.get_all_cars().dtypes
+    assert dtypes['year'] == 'Int16'
+    assert dtypes['selling_price'] == 'Int32'
+
+
+@pytest.mark.parametrize('predicate, expected', [
+    (('year', '>', 2019), [2, 3]),
+    (('year', '<=', 2012), [0, 1]),
+    (('year', '=', 2020), [2]),
+    (('year', '!=', 2020), [0, 1, 3]),
+    (('year', 'between', (2010, 2020)), [1, 2]),
+    (('year', 'in', [2007, 2021]), [0, 3]),
+    (('selling_price', '>=', 1000000), [2, 3]),
+    (('year', 'contains', 'na'), []),
+])
+def test_predicates_ignore_missing_integers(repository, predicate, expected):
+    assert _ids(repository.query_cars([predicate])) == expected
+
+
+def test_filters_survive_flush_and_reload(repository, tmp_path):
+    repository.flush()
+    reloaded = CsvCarRepository(CachedCsvDataSource(str(tmp_path / 'cars.csv')))
+    assert _ids(reloaded.query_cars([('year', '>', 2019)])) == [2, 3]
+    counts = reloaded.aggregate('fuel', {'n': ('count', '*')}, predicates=[('year', '>', 2019)])
+    assert counts.to_dict('records') == [{'fuel': 'Diesel', 'n': 1}, {'fuel': 'Electric', 'n': 1}]
+
+
+def test_csv_and_sqlite_agree_on_missing_values(repository, tmp_path):
+    sqlite_repository = SQLiteCarRepository(str(tmp_path / 'cars.db'))
+    cars = repository.get_all_cars().drop(columns='id')
+    sqlite_repository.create_cars(cars.astype(object).where(cars.notna(), None).to_dict('records'))
+    for predicate in [('year', '>', 2019), ('year', '!=', 2020), ('selling_price', 'between', (0, 700000))]:
+        # Ids SQLite à partir de 1, ids CSV à partir de 0.
+        assert [car_id - 1 for car_id in _ids(sqlite_repository.query_cars([predicate]))] == _ids(repository.query_cars([predicate]))
+    sqlite_repository.close()
+
+
+def test_predicate_mask_returns_plain_booleans():
+    series = pd.Series([2019, None, 2021], dtype='Int16')
+    mask = predicate_mask(series, '>', 2020)
+    assert mask.dtype == bool
+    assert mask.tolist() == [False, False, True]